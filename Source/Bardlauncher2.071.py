@@ -1,46 +1,3561 @@
 import os
+import argparse
 import json
-import shutil
+import logging
+import logging.handlers
+import math
+import ctypes
+import ctypes.util
+import csv
+import difflib
+import hashlib
+import hmac
+import queue
+import select
+import socket
+import struct
+import sys
+import tempfile
+import threading
 import time
+import zlib
 import tkinter as tk
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox, scrolledtext, ttk, Menu, simpledialog
-from PIL import Image, ImageTk
-from win32com.client import Dispatch
 from idlelib.tooltip import Hovertip
-from tkhtmlview import HTMLLabel
-from ttkthemes import ThemedTk
-import markdown
-import psutil  # for checking if a process is running
 from datetime import datetime
 
+# Heavy dependencies are imported when first needed rather than here, so the
+# window (or the command line) comes up without waiting for them: the GUI ones
+# by load_gui_modules, the Readme tab's by build_readme_tab, psutil (for checking
+# if a process is running) by load_psutil and win32com by load_com_dispatch
+Image = ImageTk = HTMLLabel = ThemedTk = markdown = None
+psutil = None
+Dispatch = None
+
+APP_VERSION = "2.07.2"
 CONFIG_FILE = "bard_launcher_config.json"
+SETTINGS_VERSION = 2
+SETTINGS_SAVE_DELAY = 0.5  # Saves within this many seconds of each other are written once
+README_FILE = "Readme.txt"
+README_CACHE_FILE = "bard_launcher_readme_cache.json"
+STARTUP_BENCH_FILE = "bard_launcher_startup_bench.jsonl"
+STARTUP_TARGET_MS = 300
+BENCH_FILE = "bard_launcher_bench.jsonl"
+BENCH_SIZES = (10, 100, 1000)
+BACKUP_KEEP = 20  # Per bard
+BACKUP_MAX_AGE_DAYS = 180
+FFXIV_CONFIG_FILE = os.path.join(os.path.expanduser('~'), "Documents", "My Games", "FINAL FANTASY XIV - A Realm Reborn", "FFXIV.cfg")
+SHORTCUT_INDEX_FILE = "bard_launcher_shortcut_index.json"
+# Replace with the actual path to XIVLauncher.exe on your system
+XIVLAUNCHER_PATH = os.path.expanduser(r"~\AppData\Local\XIVLauncher\XIVLauncher.exe")
+LAUNCHER_PROCESS_NAME = "XIVLauncher.exe"
+GAME_PROCESS_NAMES = ("ffxiv_dx11.exe", "ffxiv.exe")
+PROCESS_REFRESH_SECONDS = 2.0
+LAUNCH_TIMEOUT_SECONDS = 180  # A launch with no XIVLauncher process after this long counts as exited
+ADMISSION_DEFAULTS = {"enabled": False, "max_loading": 2, "max_cpu_percent": 80, "min_available_mb": 2048, "max_disk_mb_per_s": 150}
+ADMISSION_POLL_SECONDS = 1.0
+ADMISSION_LOG_SECONDS = 10  # Repeat an unchanged wait reason this often
+MONITOR_DEFAULTS = {"interval": 2.0, "cpu_alert_percent": 90, "rss_alert_mb": 4096, "io_alert_mb_per_s": 200}
+MONITOR_HISTORY = 300  # Samples kept per bard
+MONITOR_SPARK_SAMPLES = 12
+MONITOR_OVERHEAD_TARGET = 1.0  # Percent of one core, with 20 clients
+PLACEMENT_DEFAULTS = {"enabled": False, "reserved_cores": 2, "lead_bard": "", "priority": "normal"}
+PRIORITY_LEVELS = ("low", "below_normal", "normal", "above_normal", "high")
+PRIORITY_CLASSES = {"low": "IDLE_PRIORITY_CLASS", "below_normal": "BELOW_NORMAL_PRIORITY_CLASS", "normal": "NORMAL_PRIORITY_CLASS", "above_normal": "ABOVE_NORMAL_PRIORITY_CLASS", "high": "HIGH_PRIORITY_CLASS"}
+PRIORITY_NICE = {"low": 19, "below_normal": 10, "normal": 0, "above_normal": -5, "high": -10}
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+PRESTAGE_WORKERS = 8
+CONFIG_BASE_NAME = "default.cfg"
+CONFIG_DELTA_SUFFIX = ".delta.json"
+ACCOUNTS_CHUNK_CHARS = 64 * 1024
+THUMBNAIL_CACHE_DIR = "bard_launcher_thumbnails"
+THUMBNAIL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+THUMBNAIL_MEMORY_ITEMS = 256
+WATCH_DEBOUNCE_SECONDS = 0.3
+WATCH_INCREMENTAL_LIMIT = 50  # More changed files than this and the shortcut folder is scanned again
+STATUS_LOG_FILE = "bard_launcher.log"
+STATUS_LOG_CAPACITY = 5000
+STATUS_MAX_LINES = 1000
+STATUS_FLUSH_MS = 100
+STATUS_LEVELS = ("ALL", "INFO", "WARNING", "ERROR")
+JOURNAL_FILE = "bard_launcher_journal.jsonl"
+CLIENTS_FILE = "bard_launcher_clients.json"
+AGENT_HOST = "127.0.0.1"
+AGENT_PORT = 47810
+AGENT_TIMEOUT = 10  # Seconds to wait for an agent's reply
+AGENT_PROTOCOL_VERSION = 2
+ORCHESTRATE_GAP_SECONDS = 5  # Between launches on different PCs
+TIMELINE_DIR = "bard_launcher_timelines"
+TIMELINE_HISTORY = 50
+# Timeline marks in the order they happen, and the phases measured between them
+TIMELINE_MARKS = ("start", "config_swapped", "shortcut_started", "launcher_seen", "game_seen", "ready")
+TIMELINE_PHASES = (
+    ("Config swap", "start", "config_swapped"),
+    ("Shortcut start", "config_swapped", "shortcut_started"),
+    ("XIVLauncher startup", "shortcut_started", "launcher_seen"),
+    ("Login to game client", "launcher_seen", "game_seen"),
+    ("Game client ready", "game_seen", "ready"),
+    ("Total", "start", "ready")
+)
+WATCH_POLL_SECONDS = 1.0
+
+LogRecord = namedtuple("LogRecord", "timestamp level bard message")
+BardRecord = namedtuple("BardRecord", "name shortcut_path icon_path state usage", defaults=("stopped", ""))
+AccountRecord = namedtuple("AccountRecord", "user_name use_otp use_steam")
+LaunchPlan = namedtuple("LaunchPlan", "name bards delays lightamp problems stamp")
+StagedBard = namedtuple("StagedBard", "bard_name shortcut_path config_path config_data valid problems")
+
+def load_gui_modules():
+    global Image, ImageTk, ThemedTk
+    from PIL import Image, ImageTk
+    from ttkthemes import ThemedTk
+
+def load_psutil():
+    global psutil
+    if psutil is None:
+        import psutil
+    return psutil
+
+def load_com_dispatch():
+    # win32com is only needed as a fallback for shortcuts the native reader
+    # can't handle; returns None where it isn't installed
+    global Dispatch
+    if Dispatch is None:
+        try:
+            from win32com.client import Dispatch
+        except ImportError:
+            return None
+    return Dispatch
+
+def render_readme(readme_path=README_FILE, cache_path=README_CACHE_FILE):
+    # The rendered HTML is kept on disk and reused until the readme's mtime or
+    # size changes, so markdown is only imported when the readme was edited
+    try:
+        stat_result = os.stat(readme_path)
+    except FileNotFoundError:
+        return f"<h2>{readme_path} file not found in the current directory.</h2>"
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached.get("mtime") == stat_result.st_mtime and cached.get("size") == stat_result.st_size:
+            return cached["html"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    global markdown
+    import markdown
+    with open(readme_path, "r") as file:
+        html = markdown.markdown(file.read())
+    try:
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"mtime": stat_result.st_mtime, "size": stat_result.st_size, "html": html}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return html
+
+def read_config_file(path=CONFIG_FILE):
+    if os.path.isfile(path):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            return {}
+        return migrate_settings(data) if isinstance(data, dict) else {}
+    return {}
+
+def migrate_settings(data):
+    # Brings settings saved by older versions up to SETTINGS_VERSION. Files
+    # without a "version" are version 1, from before launch profiles.
+    data = dict(data)
+    if data.get("version", 1) < 2:
+        data.setdefault("profiles", {})
+        data.setdefault("active_profile", "")
+    data["version"] = max(data.get("version", 1), SETTINGS_VERSION)
+    return data
+
+class SettingsStore:
+    # bard_launcher_config.json. save() only schedules the write, so a burst of
+    # saves (Start, then Move Default Config, then Save) is written once, and
+    # every write goes to a temporary file that then replaces the old one.
+    # on_error(error) runs on the timer thread when a write fails.
+    def __init__(self, path=CONFIG_FILE, delay=SETTINGS_SAVE_DELAY, on_error=None):
+        self.path = path
+        self.delay = delay
+        self.on_error = on_error
+        self.pending = None
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        return read_config_file(self.path)
+
+    def save(self, data):
+        with self.lock:
+            self.pending = dict(data, version=SETTINGS_VERSION)
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        # Writes a pending save now; also called on exit
+        with self.lock:
+            data, self.pending = self.pending, None
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if data is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            if self.on_error is None:
+                raise
+            self.on_error(e)
+
+def init_com_thread():
+    try:
+        import pythoncom  # COM must be initialised on every thread that uses win32com
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+# Native reader and writer for the MS-SHLLINK (.lnk) format. Only the fields the
+# launcher uses are supported: target path, arguments, working directory and icon
+# location. Shortcuts written here carry a LinkInfo block but no item ID list,
+# which the shell resolves the same way.
+LNK_HEADER = struct.Struct("<I16sIIQQQIiIHHII")
+LNK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+LNK_HAS_TARGET_ID_LIST = 0x1
+LNK_HAS_LINK_INFO = 0x2
+LNK_HAS_NAME = 0x4
+LNK_HAS_RELATIVE_PATH = 0x8
+LNK_HAS_WORKING_DIR = 0x10
+LNK_HAS_ARGUMENTS = 0x20
+LNK_HAS_ICON_LOCATION = 0x40
+LNK_IS_UNICODE = 0x80
+LNK_HAS_EXP_STRING = 0x200
+LNK_ENVIRONMENT_BLOCK = 0xA0000001
+LNK_ANSI_ENCODING = "mbcs" if os.name == "nt" else "cp1252"
+SW_SHOWNORMAL = 1
+DRIVE_FIXED = 3
+
+class LnkError(ValueError):
+    pass
+
+def _lnk_cstring(data, offset, unicode=False):
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le", "replace")
+    end = data.find(b"\0", offset)
+    if end < 0:
+        end = len(data)
+    return data[offset:end].decode(LNK_ANSI_ENCODING, "replace")
+
+def _lnk_link_info_target(link_info):
+    size, header_size, flags, volume_offset, base_offset, network_offset, suffix_offset = struct.unpack_from("<7I", link_info)
+    unicode_offsets = struct.unpack_from("<2I", link_info, 28) if header_size >= 0x24 else (0, 0)
+    if unicode_offsets[1]:
+        suffix = _lnk_cstring(link_info, unicode_offsets[1], True)
+    else:
+        suffix = _lnk_cstring(link_info, suffix_offset) if suffix_offset else ""
+    if flags & 0x1:
+        base = _lnk_cstring(link_info, unicode_offsets[0], True) if unicode_offsets[0] else _lnk_cstring(link_info, base_offset)
+        return base + suffix
+    if flags & 0x2:
+        net_name_offset, = struct.unpack_from("<I", link_info, network_offset + 8)
+        net_name_offset_unicode = 0
+        if net_name_offset > 0x14:
+            net_name_offset_unicode, = struct.unpack_from("<I", link_info, network_offset + 20)
+        if net_name_offset_unicode:
+            net_name = _lnk_cstring(link_info, network_offset + net_name_offset_unicode, True)
+        else:
+            net_name = _lnk_cstring(link_info, network_offset + net_name_offset)
+        return f"{net_name}\\{suffix}" if suffix else net_name
+    return ""
+
+def _lnk_id_list_target(id_list):
+    # Best effort walk of the shell item IDs: a drive item followed by file
+    # entry items, using the long name from the 0xBEEF0004 extension block when
+    # there is one. Anything else (network places, known folders) gives up.
+    parts = []
+    offset = 0
+    while offset + 2 <= len(id_list):
+        item_size, = struct.unpack_from("<H", id_list, offset)
+        if item_size == 0:
+            break
+        item = id_list[offset:offset + item_size]
+        offset += item_size
+        item_type = item[2]
+        if item_type == 0x1F:
+            continue
+        if item_type & 0x70 == 0x20:
+            parts.append(_lnk_cstring(item, 3, False).rstrip("\\"))
+        elif item_type & 0x70 == 0x30:
+            unicode = bool(item_type & 0x04)
+            name = _lnk_cstring(item, 14, unicode)
+            name_end = 14 + (len(name.encode("utf-16-le")) + 2 if unicode else len(name.encode(LNK_ANSI_ENCODING, "replace")) + 1)
+            name_end += name_end % 2
+            if name_end + 8 <= len(item):
+                ext_size, ext_version, signature = struct.unpack_from("<HHI", item, name_end)
+                if signature == 0xBEEF0004 and ext_version >= 3:
+                    long_offset = name_end + 18 + (18 if ext_version >= 7 else 0) + 2 + (4 if ext_version >= 9 else 0) + (4 if ext_version >= 8 else 0)
+                    name = _lnk_cstring(item, long_offset, True) or name
+            parts.append(name)
+        else:
+            return ""
+    if not parts or not parts[0].endswith(":"):
+        return ""
+    return "\\".join(parts) if len(parts) > 1 else parts[0] + "\\"
+
+def parse_lnk(data):
+    if len(data) < LNK_HEADER.size:
+        raise LnkError("File is too short to be a shortcut")
+    header = LNK_HEADER.unpack_from(data)
+    header_size, clsid, flags, icon_index = header[0], header[1], header[2], header[8]
+    if header_size != LNK_HEADER.size or clsid != LNK_CLSID:
+        raise LnkError("Not a shell link file")
+    unicode = bool(flags & LNK_IS_UNICODE)
+    offset = LNK_HEADER.size
+    try:
+        id_list = b""
+        if flags & LNK_HAS_TARGET_ID_LIST:
+            id_list_size, = struct.unpack_from("<H", data, offset)
+            id_list = data[offset + 2:offset + 2 + id_list_size]
+            offset += 2 + id_list_size
+
+        target = ""
+        if flags & LNK_HAS_LINK_INFO:
+            link_info_size, = struct.unpack_from("<I", data, offset)
+            target = _lnk_link_info_target(data[offset:offset + link_info_size])
+            offset += link_info_size
+
+        strings = {}
+        for flag, key in ((LNK_HAS_NAME, "name"), (LNK_HAS_RELATIVE_PATH, "relative_path"), (LNK_HAS_WORKING_DIR, "working_dir"), (LNK_HAS_ARGUMENTS, "arguments"), (LNK_HAS_ICON_LOCATION, "icon_location")):
+            if flags & flag:
+                count, = struct.unpack_from("<H", data, offset)
+                offset += 2
+                length = count * 2 if unicode else count
+                raw = data[offset:offset + length]
+                strings[key] = raw.decode("utf-16-le", "replace") if unicode else raw.decode(LNK_ANSI_ENCODING, "replace")
+                offset += length
+
+        # ExtraData: only the environment variable block matters, for targets
+        # stored as %VAR%\... without a resolvable LinkInfo path
+        while offset + 8 <= len(data):
+            block_size, signature = struct.unpack_from("<II", data, offset)
+            if block_size < 8:
+                break
+            if signature == LNK_ENVIRONMENT_BLOCK and not target and flags & LNK_HAS_EXP_STRING:
+                target = os.path.expandvars(_lnk_cstring(data, offset + 268, True) or _lnk_cstring(data, offset + 8))
+            offset += block_size
+        if not target and id_list:
+            target = _lnk_id_list_target(id_list)
+    except (struct.error, IndexError) as e:
+        raise LnkError(f"Truncated shortcut: {e}")
+
+    if not target:
+        raise LnkError("Shortcut has no target path the native reader understands")
+    return {
+        "target": target,
+        "arguments": strings.get("arguments", ""),
+        "working_dir": strings.get("working_dir", ""),
+        "icon_location": f"{strings.get('icon_location', '')},{icon_index}"
+    }
+
+def _lnk_string_data(value):
+    encoded = value.encode("utf-16-le")
+    return struct.pack("<H", len(encoded) // 2) + encoded
+
+def split_icon_location(icon_location):
+    # "path,index" as used by WScript.Shell; a bare path means index 0
+    head, sep, tail = icon_location.rpartition(",")
+    if sep and tail.strip().lstrip("-").isdigit():
+        return head, int(tail)
+    return icon_location, 0
+
+def build_lnk(target, arguments="", working_dir="", icon_location=""):
+    icon_path, icon_index = split_icon_location(icon_location)
+
+    flags = LNK_HAS_LINK_INFO | LNK_IS_UNICODE
+    string_data = b""
+    for flag, value in ((LNK_HAS_WORKING_DIR, working_dir), (LNK_HAS_ARGUMENTS, arguments), (LNK_HAS_ICON_LOCATION, icon_path)):
+        if value:
+            flags |= flag
+            string_data += _lnk_string_data(value)
+
+    volume_id = struct.pack("<4I", 0x11, DRIVE_FIXED, 0, 0x10) + b"\0"
+    base_ansi = target.encode(LNK_ANSI_ENCODING, "replace") + b"\0"
+    base_unicode = target.encode("utf-16-le") + b"\0\0"
+    header_size = 0x24
+    base_offset = header_size + len(volume_id)
+    suffix_offset = base_offset + len(base_ansi)
+    base_offset_unicode = suffix_offset + 1
+    suffix_offset_unicode = base_offset_unicode + len(base_unicode)
+    body = volume_id + base_ansi + b"\0" + base_unicode + b"\0\0"
+    link_info = struct.pack("<9I", header_size + len(body), header_size, 0x1, header_size, base_offset, 0, suffix_offset, base_offset_unicode, suffix_offset_unicode) + body
+
+    header = LNK_HEADER.pack(LNK_HEADER.size, LNK_CLSID, flags, 0, 0, 0, 0, 0, icon_index, SW_SHOWNORMAL, 0, 0, 0, 0)
+    return header + link_info + string_data + b"\0\0\0\0"
+
+def read_lnk(shortcut_path):
+    with open(shortcut_path, 'rb') as f:
+        return parse_lnk(f.read())
+
+def write_lnk(shortcut_path, target, arguments="", working_dir="", icon_location=""):
+    tmp_path = f"{shortcut_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(build_lnk(target, arguments, working_dir, icon_location))
+    os.replace(tmp_path, shortcut_path)
+
+def read_shortcut_com(shortcut_path):
+    shell = load_com_dispatch()('WScript.Shell')
+    shortcut = shell.CreateShortCut(shortcut_path)
+    return {
+        "target": shortcut.TargetPath,
+        "arguments": shortcut.Arguments,
+        "working_dir": shortcut.WorkingDirectory,
+        "icon_location": shortcut.IconLocation
+    }
+
+def read_shortcut(shortcut_path):
+    try:
+        return read_lnk(shortcut_path)
+    except LnkError:
+        if load_com_dispatch() is None:
+            raise
+        return read_shortcut_com(shortcut_path)
+
+def write_shortcut_com(shortcut_path, target, arguments="", working_dir="", icon_location=""):
+    shell = load_com_dispatch()('WScript.Shell')
+    shortcut = shell.CreateShortCut(shortcut_path)
+    shortcut.TargetPath = target
+    shortcut.Arguments = arguments
+    shortcut.WorkingDirectory = working_dir
+    shortcut.IconLocation = icon_location
+    shortcut.save()
+
+def update_shortcut(shortcut_path, **changes):
+    # Read-modify-write of an existing shortcut. Shortcuts the native reader
+    # can't parse are updated through COM so nothing else in them is lost.
+    try:
+        fields = read_lnk(shortcut_path)
+    except LnkError:
+        if load_com_dispatch() is None:
+            raise
+        fields = read_shortcut_com(shortcut_path)
+        fields.update(changes)
+        write_shortcut_com(shortcut_path, **fields)
+        return
+    fields.update(changes)
+    write_lnk(shortcut_path, **fields)
+
+def shortcut_fields(item):
+    return {key: item.get(key, "") for key in ("target", "arguments", "working_dir", "icon_location")}
+
+def diff_shortcut(item):
+    # Compares a write_shortcuts item with the shortcut on disk. Returns the
+    # action ("create", "update" or "unchanged") and the fields that differ.
+    fields = shortcut_fields(item)
+    wanted = dict(fields, icon_location="{},{}".format(*split_icon_location(fields["icon_location"])))
+    try:
+        current = read_lnk(item["path"])
+    except FileNotFoundError:
+        return "create", list(fields)
+    except (OSError, LnkError):
+        return "update", list(fields)
+    changed = [key for key in wanted if current.get(key) != wanted[key]]
+    return ("update" if changed else "unchanged"), changed
+
+def plan_shortcuts(shortcuts, max_workers=PRESTAGE_WORKERS):
+    # diff_shortcut for every item, reading the existing shortcuts in parallel
+    if not shortcuts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(shortcuts))) as pool:
+        return list(pool.map(diff_shortcut, shortcuts))
+
+def write_shortcuts(shortcuts, plan=None, max_workers=PRESTAGE_WORKERS):
+    # Batch create or update. Each item is a dict with "path", "target" and
+    # optionally "arguments", "working_dir" and "icon_location". Only shortcuts
+    # that differ from the wanted contents are written, in parallel; pass the
+    # result of plan_shortcuts to skip reading them again. Returns (path, result)
+    # pairs where result is "created", "updated", "unchanged" or an error message.
+    if plan is None:
+        plan = plan_shortcuts(shortcuts, max_workers)
+
+    def write(item, action):
+        if action == "unchanged":
+            return item["path"], "unchanged"
+        try:
+            write_lnk(item["path"], **shortcut_fields(item))
+        except OSError as e:
+            return item["path"], f"Error: {e}"
+        return item["path"], "created" if action == "create" else "updated"
+
+    if not shortcuts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(shortcuts))) as pool:
+        return list(pool.map(write, shortcuts, [action for action, changed in plan]))
+
+def iter_accounts(path, chunk_size=ACCOUNTS_CHUNK_CHARS):
+    # Yields the entries of the accountsList.json array one at a time, decoding
+    # from a buffer that is refilled in chunks instead of loading the whole file
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        buffer = ""
+        pos = 0
+        started = eof = False
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ",")):
+                pos += 1
+            if pos < len(buffer):
+                if not started:
+                    if buffer[pos] != "[":
+                        raise ValueError("accountsList.json should contain a list of accounts")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == "]":
+                    return
+                try:
+                    account, end = decoder.raw_decode(buffer, pos)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    # An entry that runs to the end of the buffer may be cut short
+                    if end < len(buffer) or eof:
+                        yield account
+                        pos = end
+                        continue
+            elif eof:
+                raise ValueError("accountsList.json ended before the list of accounts was closed")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+class AccountIndex:
+    # accountsList.json indexed once, in file order: one small record per
+    # account and a lowercase name for searching. load() only reads the file
+    # again when it changed.
+    def __init__(self):
+        self.stamp = None
+        self.records = []
+        self.keys = []
+
+    def load(self, path):
+        stat_result = os.stat(path)
+        stamp = (os.path.abspath(path), stat_result.st_mtime_ns, stat_result.st_size)
+        if stamp == self.stamp:
+            return False
+        records = []
+        seen = set()
+        for account in iter_accounts(path):
+            user_name = account.get('UserName') if isinstance(account, dict) else None
+            if not user_name or user_name in seen:
+                continue
+            seen.add(user_name)
+            records.append(AccountRecord(user_name, account.get('UseOtp', False), account.get('UseSteamServiceAccount', False)))
+        self.records = records
+        self.keys = [record.user_name.lower() for record in records]
+        self.stamp = stamp
+        return True
+
+    def search(self, text):
+        text = text.strip().lower()
+        if not text:
+            return list(self.records)
+        return [record for record, key in zip(self.records, self.keys) if text in key]
+
+def account_shortcut(record, shortcut_dir, roaming_dir="", launcher_path=None):
+    # The write_shortcuts item for an account
+    launcher_path = launcher_path or XIVLAUNCHER_PATH
+    arguments = f'--account={record.user_name}-{record.use_otp}-{record.use_steam}'
+    if roaming_dir:
+        arguments += f' --roamingPath={roaming_dir}'
+    return {
+        "path": os.path.join(shortcut_dir, f"{record.user_name}.lnk"),
+        "target": launcher_path,
+        "arguments": arguments,
+        "working_dir": os.path.dirname(launcher_path),
+        "icon_location": launcher_path
+    }
+
+def is_xivlauncher_target(target_path):
+    try:
+        return os.path.samefile(target_path, XIVLAUNCHER_PATH)
+    except (OSError, ValueError):
+        return False
+
+class ShortcutIndex:
+    # On-disk cache of what every .lnk points at, keyed by path and revalidated by
+    # mtime and size. A refresh is one os.scandir pass, and only shortcuts whose
+    # file changed since the last pass are parsed again.
+    def __init__(self, path=SHORTCUT_INDEX_FILE, read_shortcut=read_shortcut):
+        self.path = path
+        self.read_shortcut = read_shortcut
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        # Entries are replaced, never changed in place, so a copy of the dict is
+        # enough to write it outside the lock
+        with self.lock:
+            if not self.dirty:
+                return
+            data = {"version": 1, "entries": dict(self.entries)}
+            self.dirty = False
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            with self.lock:
+                self.dirty = True
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _parse(self, shortcut_path, mtime, size):
+        entry = {"mtime": mtime, "size": size, "target": "", "arguments": "", "working_dir": "", "icon_location": "", "valid": False, "error": None}
+        try:
+            entry.update(self.read_shortcut(shortcut_path))
+            entry["valid"] = is_xivlauncher_target(entry["target"])
+        except Exception as e:
+            entry["error"] = str(e)
+        return entry
+
+    def _lookup(self, shortcut_path, stat_result):
+        key = os.path.normcase(os.path.abspath(shortcut_path))
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry["mtime"] == stat_result.st_mtime_ns and entry["size"] == stat_result.st_size:
+            return entry
+        entry = self._parse(shortcut_path, stat_result.st_mtime_ns, stat_result.st_size)
+        with self.lock:
+            self.entries[key] = entry
+            self.dirty = True
+        return entry
+
+    def get(self, shortcut_path):
+        try:
+            stat_result = os.stat(shortcut_path)
+        except OSError as e:
+            return {"target": "", "arguments": "", "working_dir": "", "icon_location": "", "valid": False, "error": str(e)}
+        return self._lookup(shortcut_path, stat_result)
+
+    def scan(self, shortcut_dir):
+        # Returns (file name, entry) pairs in directory order and forgets entries
+        # for shortcuts that are no longer in the directory
+        results = []
+        seen = set()
+        with os.scandir(shortcut_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.is_file():
+                    continue
+                entry = self._lookup(dir_entry.path, dir_entry.stat())
+                seen.add(os.path.normcase(os.path.abspath(dir_entry.path)))
+                results.append((dir_entry.name, entry))
+
+        dir_key = os.path.normcase(os.path.abspath(shortcut_dir))
+        with self.lock:
+            for key in [key for key in self.entries if os.path.dirname(key) == dir_key and key not in seen]:
+                del self.entries[key]
+                self.dirty = True
+        self.save()
+        return results
+
+    def forget(self, shortcut_paths):
+        # Drops the entries of shortcuts that were deleted or renamed away
+        with self.lock:
+            for shortcut_path in shortcut_paths:
+                if self.entries.pop(os.path.normcase(os.path.abspath(shortcut_path)), None) is not None:
+                    self.dirty = True
+        self.save()
+
+class CfgFile:
+    # FFXIV.cfg as a list of lines: "<Section>" headers, "Key<tab>Value"
+    # settings, and anything else (blank lines mostly) kept as it is. An
+    # unchanged file is written back byte for byte, line endings included.
+    def __init__(self, lines=(), newline="\r\n", final_newline=True):
+        self.lines = list(lines)
+        self.newline = newline
+        self.final_newline = final_newline
+        self._reindex()
+
+    @classmethod
+    def parse(cls, data):
+        text = data.decode("utf-8", "surrogateescape")
+        newline = "\r\n" if "\r\n" in text else "\n"
+        raw_lines = text.split(newline)
+        final_newline = len(raw_lines) > 1 and raw_lines[-1] == ""
+        if final_newline:
+            raw_lines.pop()
+        lines = []
+        section = ""
+        for raw_line in raw_lines:
+            if raw_line.startswith("<") and raw_line.endswith(">"):
+                section = raw_line[1:-1]
+                lines.append(("section", section))
+            elif "\t" in raw_line:
+                key, value = raw_line.split("\t", 1)
+                lines.append(("setting", section, key, value))
+            else:
+                lines.append(("text", raw_line))
+        return cls(lines, newline, final_newline)
+
+    def _reindex(self):
+        self.index = {(line[1], line[2]): i for i, line in enumerate(self.lines) if line[0] == "setting"}
+
+    def to_bytes(self):
+        text = self.newline.join(f"<{line[1]}>" if line[0] == "section" else f"{line[2]}\t{line[3]}" if line[0] == "setting" else line[1] for line in self.lines)
+        if self.final_newline:
+            text += self.newline
+        return text.encode("utf-8", "surrogateescape")
+
+    def copy(self):
+        return CfgFile(self.lines, self.newline, self.final_newline)
+
+    def get(self, section, key, default=None):
+        i = self.index.get((section, key))
+        return self.lines[i][3] if i is not None else default
+
+    def settings(self):
+        # {section: {key: value}}, in file order
+        settings = {}
+        for section, key in self.index:
+            settings.setdefault(section, {})[key] = self.get(section, key)
+        return settings
+
+    def find(self, key):
+        # The sections that have key
+        return [section for section, other_key in self.index if other_key == key]
+
+    def set(self, section, key, value):
+        # Returns True if the file changed. A new key goes after the last
+        # setting of its section, and a new section at the end of the file.
+        i = self.index.get((section, key))
+        if i is not None:
+            if self.lines[i][3] == value:
+                return False
+            self.lines[i] = ("setting", section, key, value)
+            return True
+
+        position = None
+        current = ""
+        for i, line in enumerate(self.lines):
+            if line[0] == "section":
+                if current == section and position is not None:
+                    break
+                current = line[1]
+                if current == section:
+                    position = i + 1
+            elif current == section and (line[0] == "setting" or line[1]):
+                position = i + 1
+        if position is None and section == "":
+            position = 0
+        if position is None:
+            if self.lines and self.lines[-1] != ("text", ""):
+                self.lines.append(("text", ""))
+            self.lines.append(("section", section))
+            position = len(self.lines)
+        self.lines.insert(position, ("setting", section, key, value))
+        self._reindex()
+        return True
+
+    def remove(self, section, key):
+        i = self.index.get((section, key))
+        if i is None:
+            return False
+        del self.lines[i]
+        self._reindex()
+        return True
+
+    def diff(self, base):
+        # The delta that turns base into this file: {"set": {section: {key:
+        # value}}, "remove": {section: [key]}}
+        delta = {"set": {}, "remove": {}}
+        for (section, key), i in self.index.items():
+            value = self.lines[i][3]
+            if base.get(section, key) != value:
+                delta["set"].setdefault(section, {})[key] = value
+        for section, key in base.index:
+            if (section, key) not in self.index:
+                delta["remove"].setdefault(section, []).append(key)
+        return delta
+
+    def apply(self, delta):
+        # A merged copy; this file is left as it is
+        merged = self.copy()
+        for section, keys in (delta.get("remove") or {}).items():
+            for key in keys:
+                merged.remove(section, key)
+        for section, values in (delta.get("set") or {}).items():
+            for key, value in values.items():
+                merged.set(section, key, str(value))
+        return merged
+
+class BardConfigs:
+    # Where the bards' configs live in config_dir. A bard has either a full copy,
+    # <bard>.cfg, or a delta, <bard>.delta.json, holding only the settings where
+    # it differs from default.cfg. A delta wins over a full copy, and is merged
+    # onto default.cfg in memory when it is read. The parsed default.cfg is kept
+    # until the file changes, so hundreds of deltas cost one parse of the base.
+    def __init__(self, config_dir, max_workers=PRESTAGE_WORKERS):
+        self.config_dir = config_dir
+        self.base_path = os.path.join(config_dir, CONFIG_BASE_NAME)
+        self.max_workers = max_workers
+        self._base = None
+        self.lock = threading.Lock()
+
+    def full_path(self, bard_name):
+        return os.path.join(self.config_dir, f"{bard_name}.cfg")
+
+    def delta_path(self, bard_name):
+        return os.path.join(self.config_dir, f"{bard_name}{CONFIG_DELTA_SUFFIX}")
+
+    def has_delta(self, bard_name):
+        return os.path.isfile(self.delta_path(bard_name))
+
+    def base(self):
+        # Raises FileNotFoundError if there is no default.cfg
+        stat_result = os.stat(self.base_path)
+        with self.lock:
+            if self._base is not None and self._base[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+                return self._base[2]
+        with open(self.base_path, 'rb') as f:
+            base = CfgFile.parse(f.read())
+        with self.lock:
+            self._base = (stat_result.st_mtime_ns, stat_result.st_size, base)
+        return base
+
+    def read_delta(self, bard_name):
+        path = self.delta_path(bard_name)
+        with open(path, 'r', encoding='utf-8') as f:
+            delta = json.load(f)
+        if not isinstance(delta, dict) or not isinstance(delta.get("set", {}), dict) or not isinstance(delta.get("remove", {}), dict):
+            raise ValueError(f"{path} is not a config delta")
+        return delta
+
+    def encode_delta(self, delta):
+        return json.dumps({"version": 1, "set": delta.get("set", {}), "remove": delta.get("remove", {})}, indent=2).encode("utf-8")
+
+    def read(self, bard_name):
+        # Returns (path, data), with data merged for a bard with a delta. Raises
+        # FileNotFoundError if the bard has no config (or its delta has no
+        # default.cfg), and ValueError for a delta that can't be read.
+        try:
+            delta = self.read_delta(bard_name)
+        except FileNotFoundError:
+            path = self.full_path(bard_name)
+            with open(path, 'rb') as f:
+                return path, f.read()
+        return self.delta_path(bard_name), self.base().apply(delta).to_bytes()
+
+    def save(self, bard_name, data):
+        # Stores a whole config for the bard, as a delta if it has one. Returns
+        # the path written.
+        if self.has_delta(bard_name):
+            path, data = self.delta_path(bard_name), self.encode_delta(CfgFile.parse(data).diff(self.base()))
+        else:
+            path = self.full_path(bard_name)
+        write_file_atomic(path, data)
+        return path
+
+    def _update(self, bard_names, change, store=None):
+        # One pass over the bards: read and change every config in parallel,
+        # back the old ones up, then write the changed ones in parallel.
+        # change(bard_name) returns (result, old_data, writes), where writes is a
+        # list of (path, data) and data None deletes the file. Returns {bard_name:
+        # result}, with "Error: ..." for a bard that failed. Raises OSError if
+        # the backups can't be saved, before anything is written.
+        def prepare(bard_name):
+            try:
+                return bard_name, change(bard_name)
+            except FileNotFoundError as e:
+                if e.filename == self.base_path:
+                    return bard_name, (f"Error: Did not find {e.filename}", None, [])
+                return bard_name, ("no config", None, [])
+            except (OSError, ValueError) as e:
+                return bard_name, (f"Error: {e}", None, [])
+
+        def commit(item):
+            bard_name, (result, old_data, writes) = item
+            try:
+                for path, data in writes:
+                    if data is None:
+                        os.remove(path)
+                    else:
+                        write_file_atomic(path, data)
+            except OSError as e:
+                return bard_name, f"Error: {e}"
+            return bard_name, result
+
+        if not bard_names:
+            return {}
+        workers = min(self.max_workers, len(bard_names))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            prepared = list(pool.map(prepare, bard_names))
+        if store is not None:
+            for bard_name, (result, old_data, writes) in prepared:
+                if writes and old_data is not None:
+                    store.add(bard_name, old_data, save=False)
+            store.save()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(pool.map(commit, prepared))
+
+    def convert(self, bard_names, store=None):
+        # Replaces full copies with deltas against default.cfg. Results are
+        # "converted", "already a delta" or "no config".
+        def change(bard_name):
+            if self.has_delta(bard_name):
+                return "already a delta", None, []
+            path = self.full_path(bard_name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            delta = CfgFile.parse(data).diff(self.base())
+            return "converted", data, [(self.delta_path(bard_name), self.encode_delta(delta)), (path, None)]
+        return self._update(bard_names, change, store)
+
+    def set_key(self, bard_names, section, key, value, store=None):
+        # Sets one setting in every bard's config, full copy or delta. With
+        # section None, the key is looked up in each config. Results are
+        # "updated", "unchanged" or "no config".
+        def target_section(cfg):
+            if section is not None:
+                return section
+            sections = cfg.find(key)
+            if not sections:
+                raise ValueError(f"{key} is not in the config")
+            return sections[0]
+
+        def change(bard_name):
+            try:
+                delta = self.read_delta(bard_name)
+            except FileNotFoundError:
+                path = self.full_path(bard_name)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                cfg = CfgFile.parse(data)
+                if not cfg.set(target_section(cfg), key, value):
+                    return "unchanged", data, []
+                return "updated", data, [(path, cfg.to_bytes())]
+            base = self.base()
+            merged = base.apply(delta)
+            old_data = merged.to_bytes()
+            if not merged.set(target_section(merged), key, value):
+                return "unchanged", old_data, []
+            return "updated", old_data, [(self.delta_path(bard_name), self.encode_delta(merged.diff(base)))]
+        return self._update(bard_names, change, store)
+
+def write_file_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def prestage_bards(bard_names, shortcut_dir, config_dir, validate_shortcut, max_workers=PRESTAGE_WORKERS):
+    # First stage of a launch: check every shortcut and read every bard config in
+    # parallel, so all problems are known before the first bard starts and the
+    # serialized stage only has to write bytes and start the shortcut.
+    def stage(bard_name):
+        problems = []
+        shortcut_path = os.path.join(shortcut_dir, f"{bard_name}.lnk")
+        valid = validate_shortcut(shortcut_path)
+        if not valid:
+            problems.append(("ERROR", f"Invalid shortcut for {bard_name}. Skipping."))
+
+        config_path = configs.full_path(bard_name)
+        config_data = None
+        try:
+            config_path, config_data = configs.read(bard_name)
+        except FileNotFoundError as e:
+            problems.append(("WARNING", f"Did not find a config file at {e.filename or config_path} for {bard_name}"))
+        except (OSError, ValueError) as e:
+            problems.append(("ERROR", f"Could not read the config file for {bard_name}. Error: {e}"))
+        return StagedBard(bard_name, shortcut_path, config_path, config_data, valid, problems)
+
+    configs = BardConfigs(config_dir)
+
+    if not bard_names:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(bard_names)), initializer=init_com_thread) as pool:
+        return list(pool.map(stage, bard_names))
+
+class ConfigSwapper:
+    # Puts a bard's config in place of FFXIV.cfg. Digests are cached per file by
+    # mtime and size, so a swap onto a target that already holds the same bytes
+    # costs two stats and no write. Real swaps go through a temp file in the
+    # target's directory and os.replace, then the target is read back and
+    # compared, so the game never sees a partly written config.
+    def __init__(self, target=FFXIV_CONFIG_FILE):
+        self.target = target
+        self.digests = {}
+        self.lock = threading.Lock()
+
+    def _remember(self, path, stat_result, digest):
+        with self.lock:
+            self.digests[os.path.normcase(os.path.abspath(path))] = (stat_result.st_mtime_ns, stat_result.st_size, digest)
+
+    def digest(self, path, data=None):
+        # Returns None if path doesn't exist. data, if given, is the file's
+        # content already read by the caller.
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            return None
+        with self.lock:
+            cached = self.digests.get(os.path.normcase(os.path.abspath(path)))
+        if cached is not None and cached[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+            return cached[2]
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        self._remember(path, stat_result, digest)
+        return digest
+
+    def swap(self, source, data=None, target=None):
+        # Returns "unchanged" or "swapped"; raises OSError if the copy fails or
+        # doesn't read back the same
+        target = target or self.target
+        if data is None:
+            with open(source, 'rb') as f:
+                data = f.read()
+        # source may be None for data that isn't a file of its own, such as a
+        # merged delta, which then has no digest to cache
+        source_digest = self.digest(source, data) if source is not None else None
+        if source_digest is None:
+            source_digest = hashlib.sha256(data).hexdigest()
+        if self.digest(target) == source_digest:
+            return "unchanged"
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".swap_", suffix=".cfg", dir=os.path.dirname(os.path.abspath(target)))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with open(target, 'rb') as f:
+            written_digest = hashlib.sha256(f.read()).hexdigest()
+        if written_digest != source_digest:
+            raise OSError(f"{target} doesn't match {source or 'the config'} after the copy")
+        self._remember(target, os.stat(target), written_digest)
+        return "swapped"
+
+class BackupStore:
+    # Content-addressed store for old bard configs, kept in config_dir/backup.
+    # Each distinct config is one zlib compressed blob named by its SHA-256, so
+    # near-identical backups of many bards cost one file each; index.json
+    # records which bard had which blob when.
+    def __init__(self, backup_dir):
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, "objects")
+        self.index_path = os.path.join(backup_dir, "index.json")
+        self.entries = []
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            self.entries = data.get("entries", []) if isinstance(data, dict) else []
+        except (OSError, ValueError):
+            self.entries = []
+
+    def save(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": 1, "entries": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.z")
+
+    def _store_blob(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(data, 9))
+            os.replace(tmp_path, blob_path)
+        return digest
+
+    def read(self, digest):
+        with open(self._blob_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def add(self, bard_name, data, timestamp=None, save=True):
+        # Returns the new entry, or None if it matches the bard's latest backup
+        digest = self._store_blob(data)
+        latest = self.list(bard_name)
+        if latest and latest[0]["hash"] == digest:
+            return None
+        entry = {"bard": bard_name, "timestamp": timestamp if timestamp is not None else time.time(), "hash": digest, "size": len(data)}
+        self.entries.append(entry)
+        if save:
+            self.save()
+        return entry
+
+    def list(self, bard_name=None):
+        # Newest first
+        entries = [entry for entry in self.entries if bard_name is None or entry["bard"] == bard_name]
+        return sorted(entries, key=lambda entry: entry["timestamp"], reverse=True)
+
+    def diff(self, digest, current_path, current_data=None):
+        # Unified diff from the backup to the file at current_path, or to
+        # current_data if given
+        old_lines = self.read(digest).decode("utf-8", "replace").splitlines(keepends=True)
+        try:
+            if current_data is None:
+                with open(current_path, 'rb') as f:
+                    current_data = f.read()
+            new_lines = current_data.decode("utf-8", "replace").splitlines(keepends=True)
+        except FileNotFoundError:
+            new_lines = []
+        return "".join(difflib.unified_diff(old_lines, new_lines, f"backup {digest[:12]}", os.path.basename(current_path)))
+
+    def restore(self, bard_name, digest, target_path):
+        # The config being replaced is backed up first, so a restore can be undone
+        try:
+            with open(target_path, 'rb') as f:
+                self.add(bard_name, f.read())
+        except FileNotFoundError:
+            pass
+        tmp_path = f"{target_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.read(digest))
+        os.replace(tmp_path, target_path)
+
+    def prune(self, keep=None, max_age_days=None, now=None):
+        # Keeps at most keep backups per bard and drops those older than
+        # max_age_days, then deletes blobs nothing refers to. Returns how many
+        # entries were removed.
+        now = time.time() if now is None else now
+        kept = []
+        counts = {}
+        for entry in sorted(self.entries, key=lambda entry: entry["timestamp"], reverse=True):
+            counts[entry["bard"]] = counts.get(entry["bard"], 0) + 1
+            if keep is not None and counts[entry["bard"]] > keep:
+                continue
+            if max_age_days is not None and now - entry["timestamp"] > max_age_days * 86400:
+                continue
+            kept.append(entry)
+        removed = len(self.entries) - len(kept)
+        if removed:
+            self.entries = kept
+            self.save()
+            referenced = {entry["hash"] for entry in kept}
+            for dir_path, dir_names, file_names in os.walk(self.objects_dir):
+                for file_name in file_names:
+                    if file_name.endswith(".z") and file_name[:-2] not in referenced:
+                        os.remove(os.path.join(dir_path, file_name))
+        return removed
+
+    def import_legacy(self):
+        # Moves the <bard>_<YYYYmmdd>_<HHMMSS>.cfg copies older versions left in
+        # the backup directory into the store. Returns how many were imported.
+        imported = 0
+        pending = []
+        try:
+            names = sorted(os.listdir(self.backup_dir))
+        except FileNotFoundError:
+            return 0
+        for name in names + [None]:
+            if pending and (name is None or len(pending) >= 100):
+                # Only delete the copies once the index that refers to them is saved
+                self.save()
+                for path in pending:
+                    os.remove(path)
+                imported += len(pending)
+                pending = []
+            if name is None:
+                break
+            parts = name[:-4].rsplit("_", 2) if name.endswith(".cfg") else []
+            if len(parts) != 3:
+                continue
+            try:
+                timestamp = datetime.strptime(f"{parts[1]}_{parts[2]}", "%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                continue
+            path = os.path.join(self.backup_dir, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = self._store_blob(data)
+            self.entries.append({"bard": parts[0], "timestamp": timestamp, "hash": digest, "size": len(data)})
+            pending.append(path)
+        return imported
+
+class ThumbnailCache:
+    # Two levels of grid icons. In memory, an LRU of PhotoImages keyed by the
+    # hash of the source file and the thumbnail size, so tiles sharing an icon
+    # share one image. On disk, resized PNGs keyed by source path, mtime and
+    # size, trimmed oldest-first once the directory grows past max_bytes. The
+    # directory is only created and trimmed when the first thumbnail is written,
+    # so creating the cache costs nothing before the window has painted.
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_BYTES, max_items=THUMBNAIL_MEMORY_ITEMS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.images = OrderedDict()
+        self.source_hashes = {}
+        self.writes_since_trim = 0
+        self.trimmed = False
+
+    def _source_hash(self, path, stat_result):
+        key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+        digest = self.source_hashes.get(key)
+        if digest is None:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            self.source_hashes[key] = digest
+        return digest
+
+    def _disk_path(self, path, stat_result, size):
+        key = f"{os.path.normcase(os.path.abspath(path))}|{stat_result.st_mtime_ns}|{size[0]}x{size[1]}"
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png")
+
+    def _load_thumbnail(self, path, stat_result, size):
+        disk_path = self._disk_path(path, stat_result, size)
+        try:
+            with Image.open(disk_path) as cached:
+                cached.load()
+                os.utime(disk_path)  # Keeps recently used thumbnails out of trim()
+                return cached.copy()
+        except OSError:
+            pass
+
+        with Image.open(path) as source:
+            thumbnail = source.convert("RGBA").resize(size, Image.LANCZOS)
+        if not self.trimmed:
+            self.trim()
+        tmp_path = f"{disk_path}.tmp"
+        try:
+            thumbnail.save(tmp_path, "PNG")
+            os.replace(tmp_path, disk_path)
+        except OSError:
+            pass
+        self.writes_since_trim += 1
+        if self.writes_since_trim >= 32:
+            self.trim()
+        return thumbnail
+
+    def get(self, path, size=(64, 64)):
+        stat_result = os.stat(path)
+        key = (self._source_hash(path, stat_result), size)
+        photo = self.images.get(key)
+        if photo is not None:
+            self.images.move_to_end(key)
+            return photo
+
+        photo = ImageTk.PhotoImage(self._load_thumbnail(path, stat_result, size))
+        self.images[key] = photo
+        if len(self.images) > self.max_items:
+            self.images.popitem(last=False)
+        return photo
+
+    def trim(self):
+        self.writes_since_trim = 0
+        entries = []
+        total = 0
+        try:
+            if not self.trimmed:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self.trimmed = True
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".png"):
+                        stat_result = entry.stat()
+                        entries.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+                        total += stat_result.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, entry_size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                total -= entry_size
+            except OSError:
+                pass
+
+class StatusLog:
+    # Thread-safe status log. Records go into a bounded ring buffer that the UI
+    # drains in batches, and into a rotating log file that keeps the full
+    # history of a session for later.
+    def __init__(self, capacity=STATUS_LOG_CAPACITY, log_file=STATUS_LOG_FILE, max_bytes=1024 * 1024, backup_count=5):
+        self.records = deque(maxlen=capacity)
+        self.pending = deque(maxlen=capacity)
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger("bard_launcher")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if log_file and not self.logger.handlers:
+            try:
+                handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            except OSError:
+                handler = None
+            if handler is not None:
+                handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(bard)s] %(message)s"))
+                self.logger.addHandler(handler)
+
+    def log(self, message, level="INFO", bard=None):
+        record = LogRecord(time.time(), level, bard, message)
+        with self.lock:
+            self.records.append(record)
+            self.pending.append(record)
+        self.logger.log(getattr(logging, level, logging.INFO), message, extra={"bard": bard or "-"})
+
+    def drain(self):
+        with self.lock:
+            records = list(self.pending)
+            self.pending.clear()
+        return records
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.records)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.pending.clear()
+
+    @staticmethod
+    def matches(record, level="ALL", bard=""):
+        if level != "ALL" and record.level != level:
+            return False
+        return not bard or (record.bard is not None and bard.lower() in record.bard.lower())
+
+    @staticmethod
+    def format(record):
+        return f"{time.strftime('%H:%M:%S', time.localtime(record.timestamp))} {record.message}"
+
+def snapshot_directory(path):
+    # name -> (inode, size, mtime) for the files in path, from one scandir pass
+    snapshot = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat_result = entry.stat()
+                    snapshot[entry.name] = (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+    except OSError:
+        pass
+    return snapshot
+
+def diff_snapshots(old, new):
+    added = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+    modified = [name for name in new if name in old and new[name] != old[name]]
+    # A rename shows up as a removal plus an addition of the same file. Match
+    # them by inode, or by size and mtime where scandir reports no inode (Windows).
+    renamed = []
+    for old_name in list(removed):
+        ino, size, mtime = old[old_name]
+        for new_name in added:
+            new_ino, new_size, new_mtime = new[new_name]
+            if (ino and ino == new_ino) or (not ino and (size, mtime) == (new_size, new_mtime)):
+                renamed.append((old_name, new_name))
+                removed.remove(old_name)
+                added.remove(new_name)
+                break
+    return {"added": added, "removed": removed, "modified": modified, "renamed": renamed}
+
+def update_bard_records(records, changes, load_record, limit=WATCH_INCREMENTAL_LIMIT):
+    # Applies a diff_snapshots result for the shortcut folder to the bard
+    # records, so only the files that changed are read again. load_record(file
+    # name) returns the BardRecord for a file, or None if it is gone. Returns
+    # the new records, or None if the folder has to be scanned again instead:
+    # for more than limit changes, a kind of change this doesn't know, or a
+    # file whose bard name another file has too.
+    if set(changes) - {"added", "removed", "modified", "renamed"}:
+        return None
+    added, removed, modified, renamed = (list(changes.get(kind, [])) for kind in ("added", "removed", "modified", "renamed"))
+    if len(added) + len(removed) + len(modified) + len(renamed) > limit:
+        return None
+    records = list(records)
+    files = {os.path.basename(record.shortcut_path): i for i, record in enumerate(records)}
+    names = {record.name for record in records}
+
+    def position(file_name):
+        # The record file_name is the shortcut of, or None for a file that
+        # isn't a bard; False if another file has its bard name
+        i = files.get(file_name)
+        if i is None and file_name.split(".")[0] in names:
+            return False
+        return i
+
+    def load(i, file_name):
+        records[i] = load_record(file_name)
+        files[file_name] = i
+        names.add(file_name.split(".")[0])
+
+    for old_name, new_name in renamed:
+        i = position(old_name)
+        if i is False or position(new_name) is not None:
+            return None
+        if i is None:
+            added.append(new_name)
+            continue
+        del files[old_name]
+        names.discard(old_name.split(".")[0])
+        load(i, new_name)
+    for file_name in modified:
+        i = position(file_name)
+        if i is False:
+            return None
+        if i is not None:
+            load(i, file_name)
+    for file_name in removed:
+        i = position(file_name)
+        if i is False:
+            return None
+        if i is not None:
+            records[i] = None
+    for file_name in added:
+        if position(file_name) is not None:
+            return None
+        records.append(None)
+        load(len(records) - 1, file_name)
+    return [record for record in records if record is not None]
+
+class Inotify:
+    # Minimal ctypes binding for Linux inotify, used to wake the watcher only
+    # when something in a watched directory actually changed
+    MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800  # modify, attrib, close_write, moved_from/to, create, delete, delete/move_self
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.wake_read, self.wake_write = os.pipe()  # Lets wake() interrupt wait()
+        os.set_blocking(self.wake_read, False)
+
+    def add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {path}")
+        self.watches[wd] = path
+
+    def clear(self):
+        for wd in self.watches:
+            self.libc.inotify_rm_watch(self.fd, wd)
+        self.watches = {}
+
+    def wake(self):
+        os.write(self.wake_write, b"\0")
+
+    def wait(self, timeout):
+        # Returns the watched paths that had events within timeout seconds
+        ready, _, _ = select.select([self.fd, self.wake_read], [], [], timeout)
+        if self.wake_read in ready:
+            try:
+                os.read(self.wake_read, 64)
+            except BlockingIOError:
+                pass
+        if self.fd not in ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        paths = set()
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            wd, mask, cookie, name_length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size + name_length
+            if wd in self.watches:
+                paths.add(self.watches[wd])
+        return paths
+
+    def close(self):
+        for fd in (self.fd, self.wake_read, self.wake_write):
+            os.close(fd)
+
+class DirectoryWatcher:
+    # Watches a set of directories on a background thread and reports debounced
+    # changes as on_change(path, changes), where changes is the diff_snapshots
+    # result. Uses inotify where available and otherwise polls with a cheap
+    # scandir snapshot comparison.
+    def __init__(self, on_change, debounce=WATCH_DEBOUNCE_SECONDS, poll_interval=WATCH_POLL_SECONDS, use_inotify=True):
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.paths = ()
+        self.lock = threading.Lock()
+        self.paths_changed = threading.Event()
+        self.stop_event = threading.Event()
+        self.inotify = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except (OSError, AttributeError):
+                self.inotify = None
+        self.thread = threading.Thread(target=self._run, name="DirectoryWatcher", daemon=True)
+        self.thread.start()
+
+    def set_paths(self, paths):
+        paths = tuple(sorted({os.path.abspath(path) for path in paths if path and os.path.isdir(path)}))
+        with self.lock:
+            if paths == self.paths:
+                return
+            self.paths = paths
+        self.paths_changed.set()
+        if self.inotify is not None:
+            self.inotify.wake()
+
+    def stop(self):
+        self.stop_event.set()
+        self.paths_changed.set()
+        if self.inotify is not None:
+            self.inotify.wake()
+
+    def _run(self):
+        emitted = {}
+        latest = {}
+        last_event = {}
+        next_poll = 0.0
+        while not self.stop_event.is_set():
+            if self.paths_changed.is_set():
+                self.paths_changed.clear()
+                with self.lock:
+                    paths = self.paths
+                emitted = {path: emitted.get(path) or snapshot_directory(path) for path in paths}
+                latest = dict(emitted)
+                last_event = {}
+                if self.inotify is not None:
+                    self.inotify.clear()
+                    for path in paths:
+                        try:
+                            self.inotify.add_watch(path)
+                        except OSError:
+                            pass
+
+            now = time.monotonic()
+            if self.inotify is not None:
+                timeout = self.debounce if last_event else 1.0
+                for path in self.inotify.wait(timeout):
+                    last_event[path] = time.monotonic()
+            else:
+                self.paths_changed.wait(min(self.debounce, self.poll_interval) if last_event else self.poll_interval)
+                if now >= next_poll:
+                    next_poll = now + self.poll_interval
+                    for path in latest:
+                        snapshot = snapshot_directory(path)
+                        if snapshot != latest[path]:
+                            latest[path] = snapshot
+                            last_event[path] = time.monotonic()
+
+            # Only report once a directory has been quiet for the debounce period
+            now = time.monotonic()
+            for path in [path for path, seen in last_event.items() if now - seen >= self.debounce]:
+                del last_event[path]
+                if path not in emitted:
+                    continue
+                snapshot = snapshot_directory(path)
+                changes = diff_snapshots(emitted[path], snapshot)
+                emitted[path] = latest[path] = snapshot
+                if any(changes.values()):
+                    try:
+                        self.on_change(path, changes)
+                    except Exception:
+                        pass
+        if self.inotify is not None:
+            self.inotify.close()
+
+class LaunchReadinessProbe:
+    # Follows one launch through the process table: the new XIVLauncher process,
+    # then its game client, then the client's startup CPU and disk reads settling
+    # down, by which point it has read FFXIV.cfg and the next swap is safe.
+    # Create it before starting the shortcut so existing processes are ignored.
+    # on_phase(name) is told when the launcher and game are first seen and when
+    # the client is ready.
+    def __init__(self, poll_interval=0.5, settle_samples=3, cpu_settle_percent=15.0, min_game_age=2.0, on_phase=None):
+        load_psutil()
+        self.on_phase = on_phase
+        self.ready = False
+        self.poll_interval = poll_interval
+        self.settle_samples = settle_samples
+        self.cpu_settle_percent = cpu_settle_percent
+        self.min_game_age = min_game_age
+        self.known_pids = {proc.pid for proc in self._matching_processes((LAUNCHER_PROCESS_NAME,) + GAME_PROCESS_NAMES)}
+        self.launcher = None
+        self.game = None
+        self.game_seen_at = None
+        self.last_read_bytes = None
+        self.quiet_samples = 0
+        self.next_poll = 0.0
+
+    def _matching_processes(self, names):
+        for proc in psutil.process_iter(['name']):
+            if proc.info['name'] in names:
+                yield proc
+
+    def _find_game(self):
+        if self.launcher is not None:
+            try:
+                for child in self.launcher.children(recursive=True):
+                    if child.name() in GAME_PROCESS_NAMES:
+                        return child
+            except psutil.Error:
+                pass
+        # The launcher can exit or detach once the client is up, so fall back to
+        # any game process that was not running before this launch
+        for proc in self._matching_processes(GAME_PROCESS_NAMES):
+            if proc.pid not in self.known_pids:
+                return proc
+        return None
+
+    def _read_bytes(self):
+        try:
+            return self.game.io_counters().read_bytes
+        except (AttributeError, psutil.Error):
+            return None
+
+    def _phase(self, name):
+        if self.on_phase is not None:
+            self.on_phase(name)
+
+    def __call__(self):
+        if self.ready:
+            return True
+        now = time.monotonic()
+        if now < self.next_poll:
+            return False
+        self.next_poll = now + self.poll_interval
+
+        if self.launcher is None:
+            for proc in self._matching_processes((LAUNCHER_PROCESS_NAME,)):
+                if proc.pid not in self.known_pids:
+                    self.launcher = proc
+                    self._phase("launcher_seen")
+                    break
+
+        if self.game is None:
+            self.game = self._find_game()
+            if self.game is None:
+                return False
+            self.game_seen_at = now
+            self._phase("game_seen")
+            try:
+                self.game.cpu_percent(None)  # Prime the counter; the first reading is always 0
+            except psutil.Error:
+                pass
+            self.last_read_bytes = self._read_bytes()
+            return False
+
+        try:
+            cpu = self.game.cpu_percent(None)
+        except psutil.NoSuchProcess:
+            self.ready = True  # The client went away, nothing left to wait for
+            return True
+        except psutil.Error:
+            cpu = 0.0
+        read_bytes = self._read_bytes()
+        reading = read_bytes is not None and self.last_read_bytes is not None and read_bytes > self.last_read_bytes
+        self.last_read_bytes = read_bytes
+
+        if cpu < self.cpu_settle_percent and not reading:
+            self.quiet_samples += 1
+        else:
+            self.quiet_samples = 0
+        if now - self.game_seen_at >= self.min_game_age and self.quiet_samples >= self.settle_samples:
+            self.ready = True
+            self._phase("ready")
+        return self.ready
+
+def shortcut_account(arguments):
+    # The value of XIVLauncher's --account=<name>-<flags> argument, which is also
+    # on the running launcher's command line
+    for argument in (arguments or "").split():
+        if argument.startswith("--account="):
+            return argument[len("--account="):]
+    return None
+
+class ProcessRegistry:
+    # Which bards are in game, from the PIDs the launcher started or adopted: each
+    # bard's XIVLauncher process and the game clients under it, plus LightAmp.
+    # A refresh only checks the processes it already holds and their children;
+    # the process table is scanned on the first refresh, to adopt bards that
+    # were already running, and after that only while a launch is waiting for
+    # a launcher to show up; once its launcher is known, the game client is
+    # looked for among the launcher's children. States are "stopped", "launching", "running"
+    # and "exited". on_change(states) is called from whichever thread changed them,
+    # and on_client(bard_name, process) for every game client (or LightAmp, as
+    # bard_name None) the first time it is seen, including after a restart.
+    # XIVLauncher exits once the game is up, so which bard each game client
+    # belongs to is also kept in snapshot_path, by PID and create time; a
+    # restarted Bard Launcher adopts the clients it finds there.
+    def __init__(self, refresh_interval=PROCESS_REFRESH_SECONDS, launch_timeout=LAUNCH_TIMEOUT_SECONDS, on_change=None, on_client=None, snapshot_path=CLIENTS_FILE):
+        self.refresh_interval = refresh_interval
+        self.launch_timeout = launch_timeout
+        self.on_change = on_change
+        self.on_client = on_client
+        self.snapshot_path = snapshot_path
+        self.saved_games = None
+        self.foreign_checked = {}  # pid (as a string) -> create time already checked against the running process
+        self.snapshot_lock = threading.Lock()
+        self.unowned = []
+        self.new_clients = []
+        self.records = {}
+        self.accounts = {}
+        self.lightamp = None
+        self.scanned = False
+        self.lock = threading.RLock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _record(self, bard_name):
+        return self.records.setdefault(bard_name, {"state": "stopped", "launcher": None, "launcher_seen": False, "games": {}, "since": 0.0})
+
+    def _notify(self):
+        with self.lock:
+            new_clients, self.new_clients = self.new_clients, []
+        if self.on_client is not None:
+            for bard_name, proc in new_clients:
+                self.on_client(bard_name, proc)
+        if self.snapshot_path:
+            try:
+                self._save_snapshot()
+            except OSError:
+                pass  # Only costs the adoption of these clients after a restart
+        if self.on_change is not None:
+            self.on_change(self.states())
+
+    @staticmethod
+    def _create_time(proc):
+        try:
+            return proc.create_time()
+        except psutil.Error:
+            return None
+
+    def _load_snapshot(self):
+        # pid (as a string) -> {"bard": name, "create_time": seconds}
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {pid: entry for pid, entry in data.items() if isinstance(entry, dict)} if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _matches(entry, create_time):
+        # A PID that was reused by another process has a different create time
+        return isinstance(entry.get("bard"), str) and isinstance(entry.get("create_time"), (int, float)) and create_time is not None and abs(entry["create_time"] - create_time) < 0.01
+
+    def _save_snapshot(self):
+        # Entries written by another Bard Launcher (the command line next to the
+        # window, say) are kept for as long as their client is running. Their
+        # create time is only checked the first time they are seen; after that
+        # the PID still existing is enough, since adoption checks the create
+        # time again. snapshot_lock keeps two threads from writing an older list
+        # over a newer one, and the temp file is unique to each writer, as
+        # another Bard Launcher may be saving at the same time.
+        with self.snapshot_lock:
+            with self.lock:
+                games = {str(pid): {"bard": bard_name, "create_time": self._create_time(proc)} for bard_name, record in self.records.items() for pid, proc in record["games"].items()}
+            if games == self.saved_games:
+                return
+            entries = {}
+            for pid, entry in self._load_snapshot().items():
+                if pid in games or not pid.isdigit():
+                    continue
+                if pid in self.foreign_checked and self.foreign_checked[pid] == entry.get("create_time"):
+                    if psutil.pid_exists(int(pid)):
+                        entries[pid] = entry
+                    continue
+                try:
+                    create_time = psutil.Process(int(pid)).create_time()
+                except psutil.Error:
+                    continue
+                if self._matches(entry, create_time):
+                    entries[pid] = entry
+            self.foreign_checked = {pid: entry["create_time"] for pid, entry in entries.items()}
+            entries.update(games)
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(self.snapshot_path)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.snapshot_path)))
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.snapshot_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.saved_games = games
+
+    def _add_game(self, bard_name, record, proc):
+        # Called with the lock held
+        if proc.pid not in record["games"]:
+            record["games"][proc.pid] = proc
+            self.new_clients.append((bard_name, proc))
+
+    @staticmethod
+    def _alive(proc):
+        try:
+            return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    def set_accounts(self, accounts):
+        # bard name -> the --account value of its shortcut
+        with self.lock:
+            self.accounts = {bard_name: account for bard_name, account in accounts.items() if account}
+
+    def state(self, bard_name):
+        with self.lock:
+            record = self.records.get(bard_name)
+            return record["state"] if record is not None else "stopped"
+
+    def states(self):
+        with self.lock:
+            return {bard_name: record["state"] for bard_name, record in self.records.items()}
+
+    def is_active(self, bard_name):
+        return self.state(bard_name) in ("launching", "running")
+
+    def mark_launching(self, bard_name, since=None):
+        with self.lock:
+            self._record(bard_name).update(state="launching", launcher=None, launcher_seen=False, games={}, since=time.time() if since is None else since)
+        self._notify()
+
+    def mark_stopped(self, bard_name):
+        with self.lock:
+            self._record(bard_name).update(state="stopped", launcher=None, launcher_seen=False, games={})
+        self._notify()
+
+    def attach(self, bard_name, launcher=None, game=None):
+        with self.lock:
+            record = self._record(bard_name)
+            if launcher is not None:
+                record.update(launcher=launcher, launcher_seen=True)
+            if game is not None:
+                self._add_game(bard_name, record, game)
+                record["state"] = "running"
+        self._notify()
+
+    def clients(self):
+        # bard name -> the game client processes it currently has
+        with self.lock:
+            return {bard_name: list(record["games"].values()) for bard_name, record in self.records.items() if record["games"]}
+
+    def lightamp_running(self):
+        load_psutil()
+        with self.lock:
+            if self.lightamp is not None and self._alive(self.lightamp):
+                return True
+            self.lightamp = None
+        for proc in psutil.process_iter(['name']):
+            if proc.info['name'] == 'LightAmp.exe':
+                with self.lock:
+                    self.lightamp = proc
+                    self.new_clients.append((None, proc))
+                self._notify()
+                return True
+        return False
+
+    def unowned_clients(self):
+        # Game clients the last process table scan couldn't match to any bard
+        with self.lock:
+            return [proc for proc in self.unowned if self._alive(proc)]
+
+    def refresh(self, scan=False):
+        # scan forces a look at the whole process table
+        load_psutil()
+        now = time.time()
+        with self.lock:
+            before = {bard_name: record["state"] for bard_name, record in self.records.items()}
+            for bard_name, record in self.records.items():
+                launcher = record["launcher"]
+                if launcher is not None and not self._alive(launcher):
+                    record["launcher"] = launcher = None
+                if launcher is not None:
+                    try:
+                        for child in launcher.children(recursive=True):
+                            if child.name() in GAME_PROCESS_NAMES:
+                                self._add_game(bard_name, record, child)
+                    except psutil.Error:
+                        pass
+                record["games"] = {pid: proc for pid, proc in record["games"].items() if self._alive(proc)}
+
+            # A launch whose launcher is known finds its game client among the
+            # launcher's children above, so only a launch still waiting for its
+            # launcher needs the whole process table
+            if scan or not self.scanned or any(record["state"] == "launching" and not record["games"] and record["launcher"] is None for record in self.records.values()):
+                self._adopt()
+                self.scanned = True
+
+            for record in self.records.values():
+                if record["games"]:
+                    record["state"] = "running"
+                elif record["state"] == "running":
+                    record["state"] = "exited"
+                elif record["state"] == "launching" and record["launcher"] is None:
+                    # The launcher closed without starting a game, or never showed up
+                    if record["launcher_seen"] or now - record["since"] > self.launch_timeout:
+                        record["state"] = "exited"
+            changed = before != {bard_name: record["state"] for bard_name, record in self.records.items()} or bool(self.new_clients)
+        if changed:
+            self._notify()
 
-class ScrollableFrame(ttk.Frame):
+    def _adopt(self):
+        # Called with the lock held. Launchers are matched to bards by account,
+        # or else given to the oldest launch still waiting for one; game clients
+        # go to the bard whose launcher started them, or the bard the snapshot
+        # has them under, or else to the oldest launch still waiting for a game.
+        # Clients left over end up in self.unowned.
+        owned = set()
+        owner_by_launcher = {}
+        for bard_name, record in self.records.items():
+            owned.update(record["games"])
+            if record["launcher"] is not None:
+                owned.add(record["launcher"].pid)
+                owner_by_launcher[record["launcher"].pid] = bard_name
+        launchers, games = [], []
+        for proc in psutil.process_iter(['name', 'ppid', 'create_time', 'status']):
+            if proc.pid in owned or proc.info['status'] == psutil.STATUS_ZOMBIE:
+                continue
+            if proc.info['name'] == LAUNCHER_PROCESS_NAME:
+                launchers.append(proc)
+            elif proc.info['name'] in GAME_PROCESS_NAMES:
+                games.append(proc)
+
+        bard_by_account = {account: bard_name for bard_name, account in self.accounts.items()}
+        for proc in sorted(launchers, key=lambda proc: proc.info['create_time'] or 0):
+            bard_name = None
+            try:
+                for argument in proc.cmdline():
+                    if argument.startswith("--account="):
+                        bard_name = bard_by_account.get(argument[len("--account="):])
+            except psutil.Error:
+                pass
+            if bard_name is None:
+                bard_name = self._oldest_waiting("launcher", proc.info['create_time'])
+            if bard_name is None:
+                continue
+            record = self._record(bard_name)
+            if record["state"] not in ("launching", "running"):
+                record.update(state="launching", since=proc.info['create_time'] or time.time())
+            record.update(launcher=proc, launcher_seen=True)
+            owner_by_launcher[proc.pid] = bard_name
+
+        snapshot = self._load_snapshot() if self.snapshot_path and games else {}
+        unowned = []
+        for proc in sorted(games, key=lambda proc: proc.info['create_time'] or 0):
+            bard_name = owner_by_launcher.get(proc.info['ppid'])
+            entry = snapshot.get(str(proc.pid))
+            if bard_name is None and entry is not None and self._matches(entry, proc.info['create_time']):
+                bard_name = entry["bard"]
+            if bard_name is None:
+                bard_name = self._oldest_waiting("game", proc.info['create_time'])
+            if bard_name is not None:
+                self._add_game(bard_name, self._record(bard_name), proc)
+            else:
+                unowned.append(proc)
+        self.unowned = unowned
+
+    def _oldest_waiting(self, kind, created):
+        # The bard whose launch started longest ago, no later than the process
+        # was created, and that has no process of this kind yet
+        waiting = [(record["since"], bard_name) for bard_name, record in self.records.items()
+                   if record["state"] == "launching" and (created is None or record["since"] <= created + 1)
+                   and (record["launcher"] is None if kind == "launcher" else not record["games"])]
+        return min(waiting)[1] if waiting else None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                pass  # Try again on the next tick
+            self.stop_event.wait(self.refresh_interval)
+
+class LaunchTimeline:
+    # Monotonic timestamps of each bard's launch marks (see TIMELINE_MARKS),
+    # stored as seconds since the start of the run. Safe to mark from any thread.
+    def __init__(self, bards, mode="fixed", delay=None):
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.started = time.monotonic()
+        self.mode = mode
+        self.delay = delay
+        self.order = list(bards)
+        self.marks = {}
+        self.lock = threading.Lock()
+
+    def mark(self, bard_name, name):
+        offset = round(time.monotonic() - self.started, 3)
+        with self.lock:
+            self.marks.setdefault(bard_name, {}).setdefault(name, offset)
+
+    def to_dict(self):
+        with self.lock:
+            bards = {bard_name: dict(marks) for bard_name, marks in self.marks.items()}
+        return {"run_id": self.run_id, "started_at": self.started_at, "mode": self.mode, "delay": self.delay, "order": self.order, "bards": bards}
+
+    def save(self, directory=TIMELINE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.run_id}.json")
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+def load_timelines(directory=TIMELINE_DIR, limit=TIMELINE_HISTORY):
+    # Most recent runs last
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    except OSError:
+        return []
+    timelines = []
+    for name in names[-limit:]:
+        try:
+            with open(os.path.join(directory, name), 'r') as f:
+                timelines.append(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return timelines
+
+def write_timelines_csv(timelines, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["run_id", "started_at", "mode", "bard", "mark", "seconds"])
+        for timeline in timelines:
+            for bard_name in timeline["order"]:
+                marks = timeline["bards"].get(bard_name, {})
+                for name in TIMELINE_MARKS:
+                    if name in marks:
+                        writer.writerow([timeline["run_id"], timeline["started_at"], timeline["mode"], bard_name, name, marks[name]])
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a non-empty list
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def timeline_phase_stats(timelines):
+    # [(phase, samples, p50, p95)] over every bard of every run that has both marks
+    stats = []
+    for phase, start_mark, end_mark in TIMELINE_PHASES:
+        durations = [
+            marks[end_mark] - marks[start_mark]
+            for timeline in timelines
+            for marks in timeline["bards"].values()
+            if start_mark in marks and end_mark in marks
+        ]
+        if durations:
+            stats.append((phase, len(durations), percentile(durations, 0.5), percentile(durations, 0.95)))
+        else:
+            stats.append((phase, 0, None, None))
+    return stats
+
+def sparkline(values, top=None):
+    # Block characters scaled to top (default: the largest value)
+    values = list(values)
+    if not values:
+        return ""
+    top = top or max(values) or 1
+    return "".join(SPARK_CHARS[min(len(SPARK_CHARS) - 1, int(value / top * (len(SPARK_CHARS) - 1) + 0.5))] for value in values)
+
+class ResourceMonitor:
+    # Samples CPU (percent of one core), RSS and I/O rate of every game client in
+    # the ProcessRegistry on a background thread, and keeps the last
+    # MONITOR_HISTORY samples per bard in a ring buffer. on_sample(summaries) gets
+    # the latest figures after each pass; on_alert(bard_name, message, level) is
+    # told when a client crosses a threshold and when it drops back below it.
+    # The sampler's own CPU time is tracked so overhead_percent() can report it.
+    def __init__(self, registry, interval=MONITOR_DEFAULTS["interval"], thresholds=None, on_sample=None, on_alert=None):
+        self.registry = registry
+        self.interval = interval
+        self.thresholds = dict(MONITOR_DEFAULTS, **(thresholds or {}))
+        self.on_sample = on_sample
+        self.on_alert = on_alert
+        self.history = {}
+        self.processes = {}  # (pid, create_time) -> [Process, last I/O bytes, last sampled]
+        self.alerts = set()
+        self.cpu_seconds = 0.0
+        self.wall_started = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _sample_process(self, proc, now):
+        key = (proc.pid, proc.create_time())
+        tracked = self.processes.get(key)
+        if tracked is None:
+            # Our own Process object, so our cpu_percent calls don't share state with the probe's
+            tracked = self.processes[key] = [psutil.Process(proc.pid), None, None]
+            tracked[0].cpu_percent(None)
+        own, last_io, last_time = tracked
+        with own.oneshot():
+            cpu = own.cpu_percent(None)
+            rss = own.memory_info().rss
+            try:
+                io = own.io_counters()
+                io_bytes = io.read_bytes + io.write_bytes
+            except (AttributeError, psutil.AccessDenied):
+                io_bytes = None
+        io_rate = 0.0
+        if io_bytes is not None and last_io is not None and now > last_time:
+            io_rate = (io_bytes - last_io) / (now - last_time) / 1048576
+        tracked[1], tracked[2] = io_bytes, now
+        return key, cpu, rss / 1048576, io_rate
+
+    def sample(self):
+        # One pass over every client; returns {bard: summary}
+        load_psutil()
+        started_cpu = time.thread_time()
+        now = time.monotonic()
+        seen = set()
+        summaries = {}
+        for bard_name, clients in self.registry.clients().items():
+            cpu = rss_mb = io_rate = 0.0
+            for proc in clients:
+                try:
+                    key, proc_cpu, proc_rss, proc_io = self._sample_process(proc, now)
+                except psutil.Error:
+                    continue
+                seen.add(key)
+                cpu += proc_cpu
+                rss_mb += proc_rss
+                io_rate += proc_io
+            with self.lock:
+                history = self.history.setdefault(bard_name, deque(maxlen=MONITOR_HISTORY))
+                history.append((time.time(), cpu, rss_mb, io_rate))
+                cpu_history = [sample[1] for sample in history]
+            summaries[bard_name] = {"cpu_percent": cpu, "rss_mb": rss_mb, "io_mb_per_s": io_rate, "sparkline": sparkline(cpu_history[-MONITOR_SPARK_SAMPLES:], 100)}
+            self._check_alerts(bard_name, summaries[bard_name])
+        for key in set(self.processes) - seen:
+            del self.processes[key]
+        self.alerts = {alert for alert in self.alerts if alert[0] in summaries}
+        self.cpu_seconds += time.thread_time() - started_cpu
+        return summaries
+
+    def _check_alerts(self, bard_name, summary):
+        for key, limit_key, text in (("cpu_percent", "cpu_alert_percent", "CPU {value:.0f}% (limit {limit}%)"),
+                                     ("rss_mb", "rss_alert_mb", "memory {value:.0f} MB (limit {limit} MB)"),
+                                     ("io_mb_per_s", "io_alert_mb_per_s", "disk I/O {value:.1f} MB/s (limit {limit} MB/s)")):
+            limit = self.thresholds[limit_key]
+            over = summary[key] > limit
+            alert = (bard_name, key)
+            if over == (alert in self.alerts):
+                continue
+            if over:
+                self.alerts.add(alert)
+                message = f"{bard_name}'s client is over its threshold: {text.format(value=summary[key], limit=limit)}."
+            else:
+                self.alerts.discard(alert)
+                message = f"{bard_name}'s client is back under its threshold: {text.format(value=summary[key], limit=limit)}."
+            if self.on_alert is not None:
+                self.on_alert(bard_name, message, "WARNING" if over else "INFO")
+
+    def series(self, bard_name):
+        # (time, cpu_percent, rss_mb, io_mb_per_s) samples, oldest first
+        with self.lock:
+            return list(self.history.get(bard_name, ()))
+
+    def overhead_percent(self):
+        # CPU time spent sampling as a percentage of one core since start()
+        if self.wall_started is None:
+            return 0.0
+        elapsed = time.monotonic() - self.wall_started
+        return self.cpu_seconds / elapsed * 100 if elapsed > 0 else 0.0
+
+    def start(self):
+        if self.thread is None:
+            self.wall_started = time.monotonic()
+            self.thread = threading.Thread(target=self._run, name="ResourceMonitor", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                summaries = self.sample()
+            except Exception:
+                continue  # Try again on the next tick
+            if self.on_sample is not None:
+                self.on_sample(summaries)
+
+def physical_cores():
+    # The logical CPUs this process may use, grouped by physical core in core
+    # order. Linux reads the sysfs topology; elsewhere hyperthread siblings are
+    # assumed to be numbered next to each other, as Windows numbers them.
+    load_psutil()
+    logical = psutil.cpu_count() or 1
+    physical = psutil.cpu_count(logical=False) or logical
+    try:
+        cpus = sorted(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error):
+        cpus = list(range(logical))
+    groups = {}
+    for cpu in cpus:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/physical_package_id") as f:
+                package = int(f.read())
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/core_id") as f:
+                key = (package, int(f.read()))
+        except (OSError, ValueError):
+            key = cpu // max(1, logical // physical)
+        groups.setdefault(key, []).append(cpu)
+    return sorted(groups.values())
+
+def plan_placement(bards, cores, reserved_cores=2, lead_bard="", priority="normal", overrides=None):
+    # Spreads the bards round-robin over the physical cores, keeping the first
+    # reserved_cores for LightAmp (planned under None) and the lead bard.
+    # overrides maps a bard to {"cpus": [...], "priority": ...}; empty values
+    # keep the planned ones. Returns {bard: {"cpus": [...], "priority": ...}}.
+    reserved_cores = max(0, min(reserved_cores, len(cores) - 1))
+    reserved = [cpu for core in cores[:reserved_cores] for cpu in core] or [cpu for core in cores for cpu in core]
+    shared = cores[reserved_cores:]
+    plan = {None: {"cpus": reserved, "priority": priority}}
+    if lead_bard:
+        plan[lead_bard] = {"cpus": reserved, "priority": priority}
+    for i, bard_name in enumerate(bard_name for bard_name in bards if bard_name != lead_bard):
+        plan[bard_name] = {"cpus": list(shared[i % len(shared)]), "priority": priority}
+    for bard_name, override in (overrides or {}).items():
+        if bard_name in plan:
+            plan[bard_name] = dict(plan[bard_name], **{key: value for key, value in override.items() if value})
+    return plan
+
+def apply_placement(proc, placement):
+    # Returns a list of problems; not every platform supports CPU affinity, and
+    # raising priority may need elevated rights
+    problems = []
+    if placement.get("cpus"):
+        try:
+            proc.cpu_affinity(list(placement["cpus"]))
+        except AttributeError:
+            problems.append("CPU affinity isn't supported on this platform")
+        except (psutil.Error, ValueError, OSError) as e:
+            problems.append(f"couldn't set the CPU affinity: {e}")
+    priority = placement.get("priority") or "normal"
+    try:
+        value = getattr(psutil, PRIORITY_CLASSES[priority]) if sys.platform == "win32" else PRIORITY_NICE[priority]
+        if proc.nice() != value:
+            proc.nice(value)
+    except (psutil.Error, OSError, KeyError, AttributeError) as e:
+        problems.append(f"couldn't set {priority} priority: {e}")
+    return problems
+
+class AdmissionController:
+    # Decides when the next bard may start loading. It holds the bard back while
+    # too many clients are still loading (loading() says how many) or while the
+    # machine is short on CPU, free memory or disk throughput. Returns
+    # (admitted, reasons), where reasons is a list of (kind, message).
+    def __init__(self, loading, max_loading=2, max_cpu_percent=80, min_available_mb=2048, max_disk_mb_per_s=150):
+        load_psutil()
+        self.loading = loading
+        self.max_loading = max_loading
+        self.max_cpu_percent = max_cpu_percent
+        self.min_available_mb = min_available_mb
+        self.max_disk_mb_per_s = max_disk_mb_per_s
+        psutil.cpu_percent(None)  # Prime the counter; the first reading is always 0
+        self.last_disk_bytes = self._disk_bytes()
+        self.last_sampled = time.monotonic()
+
+    @staticmethod
+    def _disk_bytes():
+        try:
+            counters = psutil.disk_io_counters()
+        except (OSError, RuntimeError):
+            return None
+        return None if counters is None else counters.read_bytes + counters.write_bytes
+
+    def sample(self):
+        # CPU and disk figures are averages since the previous sample
+        now = time.monotonic()
+        disk_bytes = self._disk_bytes()
+        disk_rate = 0.0
+        if disk_bytes is not None and self.last_disk_bytes is not None and now > self.last_sampled:
+            disk_rate = (disk_bytes - self.last_disk_bytes) / (now - self.last_sampled) / 1048576
+        self.last_disk_bytes, self.last_sampled = disk_bytes, now
+        return {
+            "loading": self.loading(),
+            "cpu_percent": psutil.cpu_percent(None),
+            "available_mb": psutil.virtual_memory().available / 1048576,
+            "disk_mb_per_s": disk_rate
+        }
+
+    def __call__(self, bard_name=None):
+        sample = self.sample()
+        reasons = []
+        if sample["loading"] >= self.max_loading:
+            reasons.append(("loading", f"{sample['loading']} clients are still loading (limit {self.max_loading})"))
+        if sample["cpu_percent"] > self.max_cpu_percent:
+            reasons.append(("cpu", f"CPU is at {sample['cpu_percent']:.0f}% (limit {self.max_cpu_percent}%)"))
+        if sample["available_mb"] < self.min_available_mb:
+            reasons.append(("memory", f"only {sample['available_mb']:.0f} MB of memory is free (need {self.min_available_mb} MB)"))
+        if sample["disk_mb_per_s"] > self.max_disk_mb_per_s:
+            reasons.append(("disk", f"disks are busy at {sample['disk_mb_per_s']:.0f} MB/s (limit {self.max_disk_mb_per_s} MB/s)"))
+        return not reasons, reasons
+
+class LaunchJournal:
+    # Append-only record of the current launch run: a "plan" line with the bards
+    # in order, a "phase" line as each bard reaches a launch mark or is skipped,
+    # and an "end" line when the run finishes. Every line is fsynced, so after a
+    # crash the journal still shows which bards were started. Starting a new
+    # run replaces the file.
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.run_id = None
+        self.lock = threading.Lock()
+
+    def _append(self, record, mode='a'):
+        with self.lock:
+            with open(self.path, mode) as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def begin(self, run_id, bards, mode, delay):
+        self.run_id = run_id
+        self._append({"type": "plan", "run_id": run_id, "time": time.time(), "bards": list(bards), "mode": mode, "delay": delay}, 'w')
+
+    def mark(self, bard_name, phase):
+        self._append({"type": "phase", "run_id": self.run_id, "time": time.time(), "bard": bard_name, "phase": phase})
+
+    def end(self, cancelled):
+        self._append({"type": "end", "run_id": self.run_id, "time": time.time(), "cancelled": cancelled})
+
+    def last_run(self):
+        # Returns the last run as a dict with plan, done (bards launched or
+        # skipped), remaining (in plan order) and ended/cancelled, or None. A
+        # torn last line from a crash is ignored.
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        run = None
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "plan":
+                run = {"run_id": record["run_id"], "time": record["time"], "plan": record["bards"], "mode": record.get("mode"), "delay": record.get("delay"), "phases": {}, "ended": False, "cancelled": False}
+            elif run is None or record.get("run_id") != run["run_id"]:
+                continue
+            elif record["type"] == "phase":
+                run["phases"].setdefault(record["bard"], []).append(record["phase"])
+            elif record["type"] == "end":
+                run.update(ended=True, cancelled=record["cancelled"])
+        if run is None:
+            return None
+        run["done"] = [bard_name for bard_name in run["plan"] if {"shortcut_started", "skipped"} & set(run["phases"].get(bard_name, ()))]
+        run["remaining"] = [bard_name for bard_name in run["plan"] if bard_name not in run["done"]]
+        return run
+
+class LaunchScheduler:
+    # Runs a launch plan on a worker thread so the Tk main loop never blocks on a
+    # launch or on the delay between launches. Progress goes back to the UI as
+    # (kind, data) tuples on a thread-safe queue; launch_step(bard_name) does the
+    # actual work and can be swapped for a stand-in when testing.
+    # launch_step may return a readiness callable, in which case the delay is only
+    # an upper bound and the next bard starts as soon as it returns True, or
+    # False when nothing was launched and there is nothing to wait for.
+    # prepare(bards), if given, runs first on the worker thread and returns the
+    # bards that are actually going to be launched; on_finished(cancelled) runs
+    # on the worker thread just before the "finished" event. admit(bard_name), if
+    # given, is an AdmissionController (or anything returning (admitted,
+    # reasons)) that each bard has to pass before it is launched. delays maps a
+    # bard to the delay after it, where that differs from delay. turn(bard_name,
+    # timeout), if given, holds each bard back until someone else says it may
+    # go: it returns True once the bard may be launched, and False if it is
+    # still waiting after timeout seconds.
+    def __init__(self, bards, launch_step, delay, events=None, prepare=None, on_finished=None, admit=None, delays=None, turn=None):
+        self.bards = list(bards)
+        self.turn = turn
+        self.launch_step = launch_step
+        self.delay = delay
+        self.delays = dict(delays or {})
+        self.prepare = prepare
+        self.on_finished = on_finished
+        self.admit = admit
+        self.events = events if events is not None else queue.Queue()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancel = threading.Event()
+        self._skip = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="LaunchScheduler", daemon=True)
+        self._thread.start()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_paused(self):
+        return not self._resume.is_set()
+
+    def pause(self):
+        if self._resume.is_set():
+            self._resume.clear()
+            self._emit("paused")
+
+    def resume(self):
+        if not self._resume.is_set():
+            self._resume.set()
+            self._emit("resumed")
+
+    def cancel(self):
+        self._cancel.set()
+        self._resume.set()  # Wake the worker if it is paused
+        self._skip.set()
+
+    def skip(self):
+        self._skip.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _emit(self, kind, **data):
+        self.events.put((kind, data))
+
+    def _wait(self, seconds, ready=None):
+        # Wait in short slices so pause, skip and cancel take effect mid-delay.
+        # Time spent paused does not count towards the delay.
+        deadline = time.monotonic() + seconds
+        while not self._skip.is_set():
+            if ready is not None:
+                try:
+                    if ready():
+                        return
+                except Exception as e:
+                    self._emit("status", message=f"Readiness check failed, falling back to the fixed delay. Error: {e}", level="WARNING")
+                    ready = None
+            if not self._resume.is_set():
+                paused_at = time.monotonic()
+                self._resume.wait()
+                deadline += time.monotonic() - paused_at
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._skip.wait(min(remaining, 0.1))
+
+    def _admit(self, bard_name):
+        # Holds the bard back until admit() lets it through or the wait is
+        # skipped. Returns False if the run was cancelled while waiting.
+        waiting_since = time.monotonic()
+        logged_kinds, logged_at = None, 0.0
+        while not self._cancel.is_set():
+            if not self._resume.is_set():
+                self._resume.wait()
+                continue
+            if self._skip.is_set():
+                return True
+            try:
+                admitted, reasons = self.admit(bard_name)
+            except Exception as e:
+                self._emit("status", message=f"Admission check failed, launching {bard_name} anyway. Error: {e}", level="WARNING", bard=bard_name)
+                return True
+            if admitted:
+                if logged_kinds is not None:
+                    self._emit("status", message=f"Admitted {bard_name} after waiting {time.monotonic() - waiting_since:.1f}s.", bard=bard_name)
+                return True
+            kinds = [kind for kind, message in reasons]
+            now = time.monotonic()
+            if kinds != logged_kinds or now - logged_at >= ADMISSION_LOG_SECONDS:
+                self._emit("status", message=f"Waiting to launch {bard_name}: {'; '.join(message for kind, message in reasons)}.", bard=bard_name)
+                logged_kinds, logged_at = kinds, now
+            self._skip.wait(ADMISSION_POLL_SECONDS)
+        return False
+
+    def _wait_turn(self, bard_name):
+        # Returns False if the run was cancelled while waiting
+        while not self._cancel.is_set():
+            try:
+                if self.turn(bard_name, 0.1):
+                    return True
+            except Exception as e:
+                self._emit("status", message=f"Turn check failed, launching {bard_name} anyway. Error: {e}", level="WARNING", bard=bard_name)
+                return True
+        return False
+
+    def _run(self):
+        init_com_thread()
+        if self.prepare is not None:
+            try:
+                self.bards = list(self.prepare(self.bards))
+            except Exception as e:
+                self._emit("status", message=f"Failed to prepare the launch. Error: {e}", level="ERROR")
+                self._finish(True)
+                return
+
+        total = len(self.bards)
+        self._emit("started", total=total, bards=list(self.bards))
+        for i, bard_name in enumerate(self.bards, start=1):
+            self._resume.wait()
+            if self._cancel.is_set():
+                break
+            if self.turn is not None and not self._wait_turn(bard_name):
+                break
+            self._skip.clear()
+            if self.admit is not None:
+                if not self._admit(bard_name):
+                    break
+                self._skip.clear()
+            self._emit("bard", bard=bard_name, index=i)
+            ready = None
+            started = time.monotonic()
+            try:
+                ready = self.launch_step(bard_name)
+            except Exception as e:
+                self._emit("status", message=f"Failed to launch {bard_name}. Error: {e}", level="ERROR", bard=bard_name)
+            self._emit("progress", value=i)
+            if i < total and ready is not False and not self._cancel.is_set():
+                self._wait(self.delays.get(bard_name, self.delay), ready)
+                if ready is not None:
+                    self._emit("status", message=f"Moved on from {bard_name} after {time.monotonic() - started:.1f}s.", bard=bard_name)
+        self._finish(self._cancel.is_set())
+
+    def _finish(self, cancelled):
+        if self.on_finished is not None:
+            try:
+                self.on_finished(cancelled)
+            except Exception as e:
+                self._emit("status", message=f"Error while finishing the launch. Error: {e}", level="ERROR")
+        self._emit("finished", cancelled=cancelled)
+
+class LaunchEngine:
+    # Everything a launch needs, without Tk: settings use the same keys as
+    # bard_launcher_config.json, status messages go to the StatusLog and the
+    # scheduler's events to the events queue. The GUI and the command line are
+    # both clients of this.
+    def __init__(self, settings=None, status_log=None, events=None, shortcut_index=None, launcher=None, process_registry=None):
+        self.settings = dict(settings or {})
+        self.status_log = status_log if status_log is not None else StatusLog()
+        self.events = events if events is not None else queue.Queue()
+        self.shortcut_index = shortcut_index if shortcut_index is not None else ShortcutIndex()
+        self.config_swapper = ConfigSwapper()
+        self.process_registry = process_registry if process_registry is not None else ProcessRegistry()
+        self.process_registry.on_client = self.place_client
+        self.journal = LaunchJournal()
+        self.loading = {}  # bard name -> (readiness probe, monotonic launch time)
+        self.resource_monitor = ResourceMonitor(self.process_registry, on_alert=lambda bard_name, message, level: self.log(message, level, bard_name))
+        self.apply_monitor_settings()
+        self.launcher = launcher if launcher is not None else getattr(os, "startfile", None)
+        self.min_delay = 10  # Tests and benchmarks lower this to run without waiting
+        self.scheduler = None
+        self.plans = {}  # profile name -> LaunchPlan
+        self.plans_lock = threading.Lock()
+
+    def log(self, message, level="INFO", bard=None):
+        self.status_log.log(message, level, bard)
+
+    @property
+    def delay(self):
+        try:
+            return max(self.min_delay, int(self.settings.get("delay", 10)))
+        except (TypeError, ValueError):
+            return 10
+
+    def is_running(self):
+        return self.scheduler is not None and self.scheduler.is_running()
+
+    @property
+    def admission(self):
+        admission = dict(ADMISSION_DEFAULTS)
+        admission.update(self.settings.get("admission") or {})
+        return admission
+
+    def apply_monitor_settings(self):
+        monitor = dict(MONITOR_DEFAULTS, **(self.settings.get("monitor") or {}))
+        self.resource_monitor.interval = monitor["interval"]
+        self.resource_monitor.thresholds = monitor
+
+    def place_client(self, bard_name, proc):
+        # Runs on whichever thread found the client; bard_name None is LightAmp.
+        # Bards are spread in the order of the saved selections, so a bard keeps
+        # its cores from run to run.
+        placement = dict(PLACEMENT_DEFAULTS, **(self.settings.get("placement") or {}))
+        if not placement["enabled"]:
+            return
+        bards = list(self.settings.get("bard_checkbuttons") or {})
+        if bard_name is not None and bard_name not in bards:
+            bards.append(bard_name)
+        plan = plan_placement(bards, physical_cores(), placement["reserved_cores"], placement["lead_bard"], placement["priority"], self.settings.get("bard_placement"))
+        target = plan[bard_name]
+        problems = apply_placement(proc, target)
+        name = bard_name or "LightAmp"
+        self.log(f"Placed {name} (PID {proc.pid}) on CPUs {','.join(map(str, target['cpus']))} at {target['priority'].replace('_', ' ')} priority.", bard=bard_name)
+        for problem in problems:
+            self.log(f"{name}: {problem}", "WARNING", bard_name)
+
+    def place_all(self):
+        # Re-applies the placement to everything already running, after the
+        # placement settings change
+        if not (self.settings.get("placement") or {}).get("enabled"):
+            return
+        for bard_name, procs in self.process_registry.clients().items():
+            for proc in procs:
+                self.place_client(bard_name, proc)
+        with self.process_registry.lock:
+            lightamp = self.process_registry.lightamp
+        if lightamp is not None:
+            self.place_client(None, lightamp)
+
+    def loading_count(self):
+        # Clients this engine started that their readiness probe hasn't seen
+        # settle yet. Runs on the scheduler thread, which also owns the probes.
+        now = time.monotonic()
+        for bard_name, (probe, started) in list(self.loading.items()):
+            try:
+                done = probe() or now - started > LAUNCH_TIMEOUT_SECONDS
+            except Exception:
+                done = True
+            if done:
+                del self.loading[bard_name]
+        return len(self.loading)
+
+    def roster(self):
+        shortcut_dir = self.settings.get("shortcut_dir", "")
+        if not shortcut_dir or not os.path.isdir(shortcut_dir):
+            return []
+        names = []
+        accounts = {}
+        for file, shortcut_info in self.shortcut_index.scan(shortcut_dir):
+            bard_name = file.split(".")[0]
+            if bard_name not in names:
+                names.append(bard_name)
+                accounts[bard_name] = shortcut_account(shortcut_info["arguments"])
+        self.process_registry.set_accounts(accounts)
+        return names
+
+    def plan(self, selected_only=False, only=None):
+        # Bards in roster order, or in the order given by only
+        roster = self.roster()
+        if only is not None:
+            for bard_name in only:
+                if bard_name not in roster:
+                    self.log(f"No shortcut found for {bard_name}. Skipping.", "WARNING", bard_name)
+            return [bard_name for bard_name in only if bard_name in roster]
+        if selected_only:
+            selected = self.settings.get("bard_checkbuttons", {})
+            return [bard_name for bard_name in roster if selected.get(bard_name)]
+        return roster
+
+    def plan_stamp(self, profile):
+        # Anything that would change a compiled plan. Adding, removing, renaming
+        # or rewriting a shortcut changes the directory's mtime.
+        stamp = [json.dumps(profile, sort_keys=True), bool(self.settings.get("lightamp_check", False))]
+        for key in ("shortcut_dir", "config_dir"):
+            path = self.settings.get(key, "")
+            try:
+                stamp.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                stamp.append((path, None))
+        return tuple(stamp)
+
+    def compile_plan(self, name):
+        # Checks a profile against the shortcut directory. Returns a LaunchPlan
+        # with the bards that can be launched, in profile order, or None if there
+        # is no such profile. problems are (bard, level, message) tuples.
+        profile = (self.settings.get("profiles") or {}).get(name)
+        if profile is None:
+            return None
+        stamp = self.plan_stamp(profile)
+        shortcut_dir = self.settings.get("shortcut_dir", "")
+        roster = set(self.roster())
+        bards = []
+        problems = []
+        for bard_name in profile.get("bards") or []:
+            if bard_name in bards:
+                continue
+            if bard_name not in roster:
+                problems.append((bard_name, "WARNING", f"No shortcut found for {bard_name}. Skipping."))
+            elif not self.shortcut_index.get(os.path.join(shortcut_dir, f"{bard_name}.lnk"))["valid"]:
+                problems.append((bard_name, "ERROR", f"Invalid shortcut for {bard_name}. Skipping."))
+            else:
+                bards.append(bard_name)
+        delays = {}
+        for bard_name, seconds in (profile.get("delays") or {}).items():
+            try:
+                delays[bard_name] = max(self.min_delay, int(seconds))
+            except (TypeError, ValueError):
+                problems.append((bard_name, "WARNING", f"Ignoring the delay {seconds!r} after {bard_name}."))
+        lightamp = profile.get("lightamp")
+        if lightamp is None:
+            lightamp = self.settings.get("lightamp_check", False)
+        self.shortcut_index.save()
+        return LaunchPlan(name, bards, delays, bool(lightamp), problems, stamp)
+
+    def launch_plan(self, name):
+        # The compiled plan for a profile, compiled again only if it is stale
+        profile = (self.settings.get("profiles") or {}).get(name)
+        if profile is None:
+            return None
+        with self.plans_lock:
+            plan = self.plans.get(name)
+        if plan is None or plan.stamp != self.plan_stamp(profile):
+            plan = self.compile_plan(name)
+            with self.plans_lock:
+                self.plans[name] = plan
+        return plan
+
+    def compile_plans(self):
+        # Compiles every profile ahead of time; safe to run on a worker thread
+        profiles = self.settings.get("profiles") or {}
+        with self.plans_lock:
+            for name in [name for name in self.plans if name not in profiles]:
+                del self.plans[name]
+        return [self.launch_plan(name) for name in list(profiles)]
+
+    def start_profile(self, name, dry_run=False, lightamp=None):
+        plan = self.launch_plan(name)
+        if plan is None:
+            self.log(f"There is no profile named {name}.", "ERROR")
+            return None
+        for bard_name, level, message in plan.problems:
+            self.log(message, level, bard_name)
+        if not plan.bards:
+            self.log(f"Profile {name} has no bards to launch.", "ERROR")
+            return None
+        self.log(f"Launching profile {name}: {len(plan.bards)} bards.")
+        return self.start_run(plan.bards, dry_run, plan.lightamp if lightamp is None else lightamp, plan.delays)
+
+    def start_run(self, bards, dry_run=False, lightamp=None, delays=None, turn=None):
+        if self.is_running():
+            self.log("A launch is already in progress.", "ERROR")
+            return None
+        shortcut_dir = self.settings.get("shortcut_dir", "")
+        config_dir = self.settings.get("config_dir", "")
+        adaptive = bool(self.settings.get("adaptive_delay", False))
+        delay = self.delay
+        if lightamp is None:
+            lightamp = self.settings.get("lightamp_check", False)
+
+        self.log("Starting process..." if not dry_run else "Checking the launch (dry run)...")
+        if lightamp and not dry_run:
+            self.start_lightamp()
+
+        staged = {}
+        timeline = None if dry_run else LaunchTimeline(bards, "adaptive" if adaptive else "fixed", delay)
+        if timeline is not None:
+            self.write_journal(self.journal.begin, timeline.run_id, bards, timeline.mode, delay)
+
+        def mark(bard_name, phase):
+            timeline.mark(bard_name, phase)
+            self.write_journal(self.journal.mark, bard_name, phase)
+
+        def prepare(bards):
+            running = set(bards) - set(self.skip_running(bards))
+            bards = [bard_name for bard_name in bards if bard_name not in running]
+            self.log(f"Checking {len(bards)} shortcuts and configs...")
+            results = prestage_bards(bards, shortcut_dir, config_dir, self.is_valid_xivlauncher_shortcut)
+            for item in results:
+                for level, problem in item.problems:
+                    self.log(problem, level, item.bard_name)
+                if item.valid:
+                    staged[item.bard_name] = item
+            if not dry_run:
+                # Nothing to retry for these when the run is resumed
+                for bard_name in running | {item.bard_name for item in results if not item.valid}:
+                    self.write_journal(self.journal.mark, bard_name, "skipped")
+            self.shortcut_index.save()
+            self.log(f"{len(staged)} of {len(results)} bards are ready to launch.")
+            return [item.bard_name for item in results if item.valid]
+
+        def launch_step(bard_name):
+            item = staged[bard_name]
+            if dry_run:
+                self.log(f"Would launch {item.shortcut_path} with config {item.config_path if item.config_data is not None else '(none)'}.", bard=bard_name)
+                return False
+            mark(bard_name, "start")
+            self.log(f"Working on Bard {bard_name}.", bard=bard_name)
+            if not self.write_staged_config(item):
+                self.write_journal(self.journal.mark, bard_name, "failed")
+                return False
+            mark(bard_name, "config_swapped")
+            self.log(f"Starting FFXIV for {bard_name}...", bard=bard_name)
+            ready = self.start_shortcut(item.shortcut_path, bard_name, adaptive, timeline)
+            self.write_journal(self.journal.mark, bard_name, "failed" if ready is False else "shortcut_started")
+            return ready
+
+        def on_finished(cancelled):
+            if timeline is not None:
+                self.write_journal(self.journal.end, cancelled)
+                self.save_timeline(timeline)
+
+        admit = None
+        admission = self.admission
+        if admission["enabled"] and not dry_run:
+            admit = AdmissionController(self.loading_count, admission["max_loading"], admission["max_cpu_percent"], admission["min_available_mb"], admission["max_disk_mb_per_s"])
+
+        self.scheduler = LaunchScheduler(bards, launch_step, 0 if dry_run else delay, self.events, prepare, on_finished, admit, None if dry_run else delays, turn)
+        self.scheduler.start()
+        return self.scheduler
+
+    def resume_run(self, dry_run=False, lightamp=None):
+        # Continues the last run recorded in the journal with the bards that
+        # weren't started, in their original order
+        run = self.journal.last_run()
+        if run is None or not run["remaining"]:
+            self.log("There is no unfinished launch run to resume.")
+            return None
+        self.log(f"Resuming the launch run from {datetime.fromtimestamp(run['time']).strftime('%Y-%m-%d %H:%M:%S')}: {len(run['done'])} of {len(run['plan'])} bards were already launched or skipped.")
+        return self.start_run(run["remaining"], dry_run, lightamp)
+
+    def write_journal(self, method, *args):
+        # A journal that can't be written shouldn't stop the launch
+        try:
+            method(*args)
+        except OSError as e:
+            self.log(f"Failed to write the launch journal. Error: {e}", "WARNING")
+
+    def skip_running(self, bards):
+        self.process_registry.refresh(scan=True)
+        remaining = []
+        for bard_name in bards:
+            state = self.process_registry.state(bard_name)
+            if state in ("launching", "running"):
+                self.log(f"{bard_name} is already {state}. Skipping.", "WARNING", bard_name)
+            else:
+                remaining.append(bard_name)
+        unowned = self.process_registry.unowned_clients()
+        if unowned and remaining:
+            self.log(f"{len(unowned)} game clients are running that Bard Launcher didn't start and can't match to a bard (PIDs {', '.join(str(proc.pid) for proc in unowned)}). If any of them belongs to a bard in this launch, that bard will be started a second time.", "WARNING")
+        return remaining
+
+    def launch_single(self, bard_name):
+        if self.is_running():
+            self.log("A launch is already in progress.", "ERROR")
+            return None
+        shortcut_dir = self.settings.get("shortcut_dir", "")
+        self.scheduler = LaunchScheduler([bard_name], lambda name: self.launch_shortcut(shortcut_dir, name), 0, self.events, self.skip_running)
+        self.scheduler.start()
+        return self.scheduler
+
+    def save_timeline(self, timeline):
+        try:
+            path = timeline.save()
+        except OSError as e:
+            self.log(f"Failed to save the launch timeline. Error: {e}", "ERROR")
+            return None
+        self.log(f"Saved launch timeline to {path}")
+        return path
+
+    def write_staged_config(self, item):
+        # Returns False if the bard shouldn't be launched
+        if item.config_data is None:
+            return True
+        target = self.config_swapper.target
+        try:
+            source = None if item.config_path.endswith(CONFIG_DELTA_SUFFIX) else item.config_path
+            result = self.config_swapper.swap(source, item.config_data)
+        except OSError as e:
+            self.log(f"Failed to copy the config for {item.bard_name} to FFXIV config {target}. Skipping. Error: {e}", "ERROR", item.bard_name)
+            return False
+        if result == "unchanged":
+            self.log(f"FFXIV config {target} already matches the config for {item.bard_name}.", bard=item.bard_name)
+        else:
+            self.log(f"Copied the config for {item.bard_name} to FFXIV config {target}.", bard=item.bard_name)
+        return True
+
+    def start_lightamp(self):
+        # Returns "running", "started", "invalid_path" or "failed"
+        if self.process_registry.lightamp_running():
+            self.log("LightAmp is already running.")
+            return "running"
+
+        lightamp_path = self.settings.get("lightamp_location", "")
+        if not os.path.isfile(lightamp_path):
+            self.log("Invalid LightAmp.exe file path", "ERROR")
+            return "invalid_path"
+
+        try:
+            self.launcher(lightamp_path)
+            self.log("Started LightAmp.")
+            return "started"
+        except Exception as e:
+            self.log(f"Failed to start LightAmp. Error: {e}", "ERROR")
+            return "failed"
+
+    def launch_shortcut(self, shortcut_dir, bard_name, adaptive=False):
+        # Runs on the scheduler thread; self.log is safe to call from there.
+        # Returns what the scheduler should wait on before the next bard.
+        self.log(f"Starting FFXIV for {bard_name}...", bard=bard_name)
+        shortcut_path = os.path.join(shortcut_dir, f"{bard_name}.lnk")
+
+        if not self.is_valid_xivlauncher_shortcut(shortcut_path):
+            self.log(f"Invalid shortcut for {bard_name}. Skipping.", "ERROR", bard_name)
+            return False
+        return self.start_shortcut(shortcut_path, bard_name, adaptive)
+
+    def start_shortcut(self, shortcut_path, bard_name, adaptive=False, timeline=None):
+        probe = None
+        if adaptive or timeline is not None:
+            def on_phase(name):
+                if timeline is not None:
+                    timeline.mark(bard_name, name)
+                # The probe has already found the processes, so hand them to the registry
+                if name == "launcher_seen":
+                    self.process_registry.attach(bard_name, launcher=probe.launcher)
+                elif name == "game_seen":
+                    self.process_registry.attach(bard_name, game=probe.game)
+            probe = LaunchReadinessProbe(on_phase=on_phase)
+        self.process_registry.mark_launching(bard_name)
+        try:
+            self.launcher(shortcut_path)
+        except Exception as e:
+            self.process_registry.mark_stopped(bard_name)
+            self.log(f"Failed to launch the shortcut for {bard_name}. Error: {e}", "ERROR", bard_name)
+            return False
+        if timeline is not None:
+            timeline.mark(bard_name, "shortcut_started")
+        if probe is not None:
+            self.loading[bard_name] = (probe, time.monotonic())
+        self.log(f"Successfully launched FFXIV for {bard_name}.", bard=bard_name)
+        if probe is not None and not adaptive:
+            # Fixed delay: still follow the launch for the timeline, but never cut the wait short
+            return lambda: probe() and False
+        return probe
+
+    def is_valid_xivlauncher_shortcut(self, shortcut_path):
+        shortcut_info = self.shortcut_index.get(shortcut_path)
+        if shortcut_info["error"]:
+            self.log(f"Error verifying shortcut: {shortcut_info['error']}", "ERROR")
+        return shortcut_info["valid"]
+
+class AgentError(OSError):
+    pass
+
+def set_send_timeout(sock, seconds):
+    # SO_SNDTIMEO makes a blocking send fail after seconds while reads on the
+    # same socket still block; Windows takes milliseconds, others a timeval
+    if sys.platform == "win32":
+        value = struct.pack("L", int(seconds * 1000))
+    else:
+        value = struct.pack("ll", int(seconds), int(seconds % 1 * 1000000))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, value)
+
+
+class LaunchAgent:
+    # Serves a LaunchEngine over TCP so that a LaunchController on another PC
+    # can drive it. The protocol is one JSON object per line. Requests carry an
+    # "id" and a "command" and get a reply with the same id and "ok"; the
+    # engine's events and status messages are pushed to every controller as
+    # {"event": kind, ...}. The first request on a connection has to be a
+    # "hello" with the agent's token. The agent takes over the engine's events
+    # queue and status log; on_log(record), if set, sees every status record.
+    # A "launch" is one run of this PC's bards, in which each bard waits for the
+    # controller's "advance": the agent sends {"event": "turn", "bard": ...}
+    # when the bard is next, that is once this PC's delay (or adaptive delay)
+    # after the bard before has passed. Each connection has its own send lock
+    # and a send timeout, so a controller that stops reading is dropped
+    # instead of holding up the others.
+    def __init__(self, engine, host=AGENT_HOST, port=AGENT_PORT, token="", name=None, config_path=None, send_timeout=AGENT_TIMEOUT):
+        self.engine = engine
+        self.send_timeout = send_timeout
+        self.token = token
+        self.name = name or socket.gethostname()
+        self.config_path = config_path
+        self.on_log = None
+        self.turns = threading.Condition()
+        self.announced = set()
+        self.granted = set()
+        self.server = socket.create_server((host, port))
+        self.address = self.server.getsockname()[:2]
+        self.clients = []
+        self.send_locks = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        for target, name in ((self._accept, "AgentAccept"), (self._pump, "AgentPump")):
+            threading.Thread(target=target, name=name, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self.server.close()
+        with self.lock:
+            clients, self.clients = self.clients, []
+        for sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def handle(self, request):
+        engine = self.engine
+        command = request.get("command")
+        if self.config_path and command in ("hello", "plan", "launch", "lightamp"):
+            # Pick up settings changed in the GUI on this PC since the last request
+            engine.settings = read_config_file(self.config_path)
+        if command == "hello":
+            return {"ok": True, "name": self.name, "protocol": AGENT_PROTOCOL_VERSION, "bards": engine.roster(), "profiles": sorted(engine.settings.get("profiles") or {})}
+        if command == "plan":
+            profile = request.get("profile")
+            if profile:
+                plan = engine.launch_plan(profile)
+                if plan is None:
+                    return {"ok": False, "error": f"There is no profile named {profile}"}
+                return {"ok": True, "bards": plan.bards, "delays": plan.delays, "delay": engine.delay, "lightamp": plan.lightamp, "problems": plan.problems}
+            return {"ok": True, "bards": engine.plan(selected_only=not request.get("all")), "delays": {}, "delay": engine.delay, "lightamp": bool(engine.settings.get("lightamp_check", False)), "problems": []}
+        if command == "launch":
+            delays = {}
+            for bard_name, seconds in (request.get("delays") or {}).items():
+                try:
+                    delays[str(bard_name)] = max(engine.min_delay, float(seconds))
+                except (TypeError, ValueError):
+                    pass
+            with self.turns:
+                self.announced.clear()
+                self.granted.clear()
+            if engine.start_run(list(request.get("bards") or []), bool(request.get("dry_run")), lightamp=False, delays=delays, turn=self._turn) is None:
+                return {"ok": False, "error": "A launch is already in progress"}
+            return {"ok": True}
+        if command == "advance":
+            with self.turns:
+                self.granted.add(request.get("bard"))
+                self.turns.notify_all()
+            return {"ok": True}
+        if command == "lightamp":
+            return {"ok": True, "result": engine.start_lightamp()}
+        if command == "status":
+            return {"ok": True, "running": engine.is_running(), "states": engine.process_registry.states()}
+        if command in ("pause", "resume", "skip", "cancel"):
+            if engine.scheduler is not None:
+                getattr(engine.scheduler, command)()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command {command!r}"}
+
+    def _turn(self, bard_name, timeout):
+        # The scheduler's turn hook for a controller's launch
+        with self.turns:
+            if bard_name not in self.announced:
+                self.announced.add(bard_name)
+                self.engine.events.put(("turn", {"bard": bard_name}))
+            if bard_name not in self.granted:
+                self.turns.wait(timeout)
+            if bard_name not in self.granted:
+                return False
+            self.granted.discard(bard_name)
+            self.announced.discard(bard_name)
+            return True
+
+    def _accept(self):
+        while not self._stop.is_set():
+            try:
+                sock, peer = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(sock, peer), name="AgentConnection", daemon=True).start()
+
+    def _send(self, sock, message):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self.lock:
+            send_lock = self.send_locks.setdefault(sock, threading.Lock())
+        with send_lock:
+            sock.sendall(data)
+
+    def _drop(self, sock):
+        # Shutting the socket down ends its _serve loop, which cleans up
+        with self.lock:
+            if sock in self.clients:
+                self.clients.remove(sock)
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _broadcast(self, message):
+        with self.lock:
+            clients = list(self.clients)
+        for sock in clients:
+            try:
+                self._send(sock, message)
+            except OSError:
+                self._drop(sock)
+
+    def _serve(self, sock, peer):
+        authenticated = False
+        try:
+            set_send_timeout(sock, self.send_timeout)
+            with sock, sock.makefile('r', encoding='utf-8') as reader:
+                for line in reader:
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("requests must be JSON objects")
+                    except ValueError as e:
+                        self._send(sock, {"id": None, "ok": False, "error": f"Bad request: {e}"})
+                        continue
+                    if not authenticated:
+                        if request.get("command") != "hello" or not hmac.compare_digest(str(request.get("token", "")).encode("utf-8"), self.token.encode("utf-8")):
+                            self.engine.log(f"Refused a controller connection from {peer[0]}.", "WARNING")
+                            self._send(sock, {"id": request.get("id"), "ok": False, "error": "Not authorized"})
+                            return
+                        authenticated = True
+                        with self.lock:
+                            self.clients.append(sock)
+                        self.engine.log(f"Controller connected from {peer[0]}.")
+                    try:
+                        reply = self.handle(request)
+                    except Exception as e:
+                        reply = {"ok": False, "error": str(e)}
+                    self._send(sock, dict(reply, id=request.get("id")))
+        except OSError:
+            pass
+        finally:
+            with self.lock:
+                if sock in self.clients:
+                    self.clients.remove(sock)
+                self.send_locks.pop(sock, None)
+            if authenticated:
+                self.engine.log(f"Controller at {peer[0]} disconnected.")
+
+    def _pump(self):
+        # Status messages go out before the event that follows them, so a
+        # controller sees a bard's messages before its "finished"
+        while not self._stop.is_set():
+            try:
+                kind, data = self.engine.events.get(timeout=0.1)
+            except queue.Empty:
+                kind = data = None
+            if kind == "status":
+                self.engine.log(data["message"], data.get("level", "INFO"), data.get("bard"))
+            for record in self.engine.status_log.drain():
+                if self.on_log is not None:
+                    self.on_log(record)
+                self._broadcast(dict(record._asdict(), event="log"))
+            if kind not in (None, "status"):
+                self._broadcast(dict(data, event=kind))
+
+class AgentConnection:
+    # Controller side of one agent. call() sends a request and waits for its
+    # reply, raising AgentError if the agent refuses it or doesn't answer.
+    # Events the agent pushes go to on_event(connection, kind, data) on the
+    # reader thread, followed by "disconnected" when the connection closes.
+    def __init__(self, address, token="", on_event=None, timeout=AGENT_TIMEOUT):
+        self.address = address
+        self.name = f"{address[0]}:{address[1]}"
+        self.on_event = on_event
+        self.timeout = timeout
+        self.replies = {}
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.sock = socket.create_connection(address, timeout)
+        self.sock.settimeout(None)
+        threading.Thread(target=self._read, name="AgentReader", daemon=True).start()
+        self.info = self.call("hello", token=token)
+
+    def call(self, command, **args):
+        with self.lock:
+            if self.closed.is_set():
+                raise AgentError(f"The connection to {self.name} is closed")
+            self.next_id += 1
+            request_id = self.next_id
+            reply = self.replies[request_id] = queue.Queue(1)
+            self.sock.sendall((json.dumps(dict(args, id=request_id, command=command)) + "\n").encode("utf-8"))
+        try:
+            message = reply.get(timeout=self.timeout)
+        except queue.Empty:
+            raise AgentError(f"{self.name} did not answer {command} within {self.timeout}s") from None
+        finally:
+            with self.lock:
+                self.replies.pop(request_id, None)
+        if message is None:
+            raise AgentError(f"Lost the connection to {self.name}")
+        if not message.get("ok"):
+            raise AgentError(f"{self.name}: {message.get('error', 'request failed')}")
+        return message
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _read(self):
+        try:
+            with self.sock.makefile('r', encoding='utf-8') as reader:
+                for line in reader:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "event" in message:
+                        if self.on_event is not None:
+                            self.on_event(self, message.pop("event"), message)
+                        continue
+                    with self.lock:
+                        reply = self.replies.get(message.get("id"))
+                    if reply is not None:
+                        reply.put(message)
+        except OSError:
+            pass
+        finally:
+            with self.lock:
+                self.closed.set()
+                pending = list(self.replies.values())
+            for reply in pending:
+                reply.put(None)
+            if self.on_event is not None:
+                self.on_event(self, "disconnected", {})
+
+class LaunchController:
+    # Runs one launch across several agents. The bards of every agent go into
+    # one global order, round-robin across the agents or one agent after the
+    # other, and are launched one at a time. Each agent gets its bards as one
+    # run and paces it itself, with its own delay or adaptive delay, because a
+    # PC can only swap its FFXIV config again once the client before has read
+    # it; the controller lets a bard go once its agent says it is next and gap
+    # seconds have passed since the last launch on any agent. Progress from
+    # every agent comes out of events as (kind, data) tuples like
+    # LaunchScheduler's, with an "agent" key; "status" data has the fields of a
+    # LogRecord.
+    def __init__(self, addresses, token="", gap=ORCHESTRATE_GAP_SECONDS, order="round-robin", events=None, timeout=AGENT_TIMEOUT):
+        self.addresses = list(addresses)
+        self.token = token
+        self.gap = gap
+        self.order = order
+        self.timeout = timeout
+        self.events = events if events is not None else queue.Queue()
+        self.agents = []
+        self.runs = {}  # agent name -> what its run in progress has reported
+        self.changed = threading.Condition()
+        self._cancel = threading.Event()
+        self._closing = False
+
+    def _emit(self, kind, **data):
+        self.events.put((kind, data))
+
+    def _status(self, message, level="INFO", agent=None, bard=None, timestamp=None):
+        self._emit("status", agent=agent, timestamp=timestamp or time.time(), level=level, bard=bard, message=message)
+
+    def connect(self):
+        # Connects to every agent at once; any failure closes the lot
+        def connect(address):
+            return AgentConnection(address, self.token, self.on_agent_event, self.timeout)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.addresses))) as pool:
+            futures = [pool.submit(connect, address) for address in self.addresses]
+        agents, errors = [], []
+        for address, future in zip(self.addresses, futures):
+            try:
+                agents.append(future.result())
+            except OSError as e:
+                errors.append(f"{address[0]}:{address[1]}: {e}")
+        for agent in agents:
+            if agent.info.get("protocol") != AGENT_PROTOCOL_VERSION:
+                errors.append(f"{agent.name}: the agent runs a different version of Bard Launcher")
+        if errors:
+            for agent in agents:
+                agent.close()
+            raise AgentError("Could not connect to every agent. " + "; ".join(errors))
+        seen = set()
+        for agent in agents:
+            # Agents on the same PC would otherwise share a name
+            agent.name = agent.info["name"] if agent.info["name"] not in seen else f"{agent.info['name']}@{agent.address[1]}"
+            seen.add(agent.name)
+            self._status(f"Connected to {agent.name} ({len(agent.info['bards'])} bards).", agent=agent.name)
+        self.agents = agents
+        return agents
+
+    def plan(self, profile=None, all_bards=False):
+        # Returns the steps as (agent, bard, delay after it) in launch order, and
+        # the agents that should start LightAmp
+        per_agent = []
+        for agent in self.agents:
+            try:
+                reply = agent.call("plan", profile=profile, all=all_bards)
+            except AgentError as e:
+                self._status(f"Leaving {agent.name} out of the launch. {e}", "WARNING", agent.name)
+                continue
+            for bard_name, level, message in reply["problems"]:
+                self._status(message, level, agent.name, bard_name)
+            per_agent.append((agent, [(bard_name, reply["delays"].get(bard_name, reply["delay"])) for bard_name in reply["bards"]], reply["lightamp"]))
+        if self.order == "sequential":
+            steps = [(agent, bard_name, delay) for agent, bards, lightamp in per_agent for bard_name, delay in bards]
+        else:
+            steps = []
+            for i in range(max((len(bards) for agent, bards, lightamp in per_agent), default=0)):
+                steps.extend((agent, *bards[i]) for agent, bards, lightamp in per_agent if i < len(bards))
+        return steps, [agent for agent, bards, lightamp in per_agent if lightamp and bards]
+
+    def run(self, steps, lightamp_agents=(), dry_run=False):
+        self._emit("started", total=len(steps))
+        if not dry_run:
+            for agent in lightamp_agents:
+                try:
+                    self._status(f"LightAmp: {agent.call('lightamp')['result']}.", agent=agent.name)
+                except AgentError as e:
+                    self._status(f"Failed to start LightAmp. {e}", "ERROR", agent.name)
+
+        slices = {}
+        for agent, bard_name, delay in steps:
+            slices.setdefault(agent, []).append((bard_name, delay))
+        with self.changed:
+            self.runs = {agent.name: {"bards": None, "next": None, "current": None, "launched": set(), "finished": False} for agent in slices}
+        for agent, bards in slices.items():
+            try:
+                agent.call("launch", bards=[bard_name for bard_name, delay in bards], delays=dict(bards), dry_run=dry_run)
+            except AgentError as e:
+                self._status(f"Failed to start the launch. {e}", "ERROR", agent.name)
+                with self.changed:
+                    self.runs[agent.name]["finished"] = True
+
+        last_launch = None
+        for i, (agent, bard_name, delay) in enumerate(steps, start=1):
+            run = self.runs[agent.name]
+            # The agent asks for the bard once its own delay after the bard
+            # before has passed, or skips it (already running, bad shortcut)
+            if not self._wait_for(lambda: run["next"] == bard_name or run["finished"] or (run["bards"] is not None and bard_name not in run["bards"])):
+                break
+            if run["next"] != bard_name:
+                self._status(f"{agent.name} skipped {bard_name}.", "WARNING", agent.name, bard_name)
+                self._emit("progress", value=i)
+                continue
+            if not dry_run and last_launch is not None and not self._wait_until(last_launch + self.gap):
+                break
+            self._emit("bard", agent=agent.name, bard=bard_name, index=i)
+            try:
+                agent.call("advance", bard=bard_name)
+            except AgentError as e:
+                self._status(f"Failed to launch {bard_name}. {e}", "ERROR", agent.name, bard_name)
+                self._emit("progress", value=i)
+                continue
+            if not self._wait_for(lambda: bard_name in run["launched"] or run["finished"]):
+                break
+            last_launch = time.monotonic()
+            self._emit("progress", value=i)
+        cancelled = self._cancel.is_set()
+        if cancelled:
+            for agent in self.agents:
+                try:
+                    agent.call("cancel")
+                except AgentError:
+                    pass
+        self._emit("finished", cancelled=cancelled)
+        return not cancelled
+
+    def cancel(self):
+        self._cancel.set()
+
+    def close(self):
+        self._closing = True
+        for agent in self.agents:
+            agent.close()
+
+    def on_agent_event(self, agent, kind, data):
+        # Runs on the agent's reader thread
+        if kind == "log":
+            self._status(data["message"], data["level"], agent.name, data.get("bard"), data["timestamp"])
+            return
+        if kind == "disconnected" and not self._closing:
+            self._status(f"Lost the connection to {agent.name}.", "ERROR", agent.name)
+        with self.changed:
+            run = self.runs.get(agent.name)
+            if run is None:
+                return
+            if kind == "started":
+                run["bards"] = data.get("bards") or []
+            elif kind == "turn":
+                run["next"] = data.get("bard")
+            elif kind == "bard":
+                run["current"] = data.get("bard")
+            elif kind == "progress":
+                run["launched"].add(run["current"])
+            elif kind in ("finished", "disconnected"):
+                run["finished"] = True
+            self.changed.notify_all()
+
+    def _wait_for(self, predicate):
+        # Returns False if the run was cancelled first
+        with self.changed:
+            while not self._cancel.is_set():
+                if predicate():
+                    return True
+                self.changed.wait(0.1)
+        return False
+
+    def _wait_until(self, deadline):
+        while not self._cancel.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            self._cancel.wait(min(remaining, 0.1))
+        return False
+
+class VirtualBardView(ttk.Frame):
+    # Scrollable list or grid of bards drawn on a canvas that only has widgets
+    # for the cells currently in view.
+    # create_cell(parent) builds a cell (a dict with at least a "frame" widget)
+    # and fill_cell(cell, record) points it at a bard; scrolling moves and
+    # refills the same cells, so the widget count depends on the window size
+    # rather than on the number of bards.
     def __init__(self, container, *args, **kwargs):
         super().__init__(container, *args, **kwargs)
-        canvas = tk.Canvas(self)
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
-        self.scrollable_frame = ttk.Frame(canvas)
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.pack(side="left", fill="both", expand=True)
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind_all(sequence, self.on_mousewheel, add="+")
+
+        self.records = []
+        self.cells = []
+        self.create_cell = None
+        self.fill_cell = None
+        self.cell_width = 1
+        self.cell_height = 1
+        self.fixed_columns = None
+        self.layout_columns = None
+
+    def set_layout(self, create_cell, fill_cell, cell_width, cell_height, columns=None):
+        for cell in self.cells:
+            cell["frame"].destroy()
+        self.canvas.delete("all")
+        self.cells = []
+        self.create_cell = create_cell
+        self.fill_cell = fill_cell
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.fixed_columns = columns
+        self.layout_columns = None
+        self.canvas.configure(yscrollincrement=cell_height)
+        self.canvas.yview_moveto(0)
+
+    def set_records(self, records, force=False):
+        self.records = list(records)
+        if force:
+            for cell in self.cells:
+                cell["record"] = None
+        self.refresh()
+
+    def columns(self):
+        if self.fixed_columns:
+            return self.fixed_columns
+        return max(1, self.canvas.winfo_width() // self.cell_width)
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not (str(widget) == str(self) or str(widget).startswith(f"{self}.")):
+            return
+        step = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        self.yview("scroll", step, "units")
+
+    def _new_cell(self):
+        cell = self.create_cell(self.canvas)
+        cell["window"] = self.canvas.create_window(0, 0, window=cell["frame"], anchor="nw", state="hidden")
+        cell["index"] = None
+        cell["record"] = None
+        self.cells.append(cell)
+        return cell
+
+    def refresh(self):
+        if self.create_cell is None:
+            return
+        columns = self.columns()
+        relayout = columns != self.layout_columns
+        self.layout_columns = columns
+        rows = -(-len(self.records) // columns)
+        self.canvas.configure(scrollregion=(0, 0, columns * self.cell_width, rows * self.cell_height))
+
+        top = self.canvas.canvasy(0)
+        first_row = max(0, int(top // self.cell_height))
+        last_row = min(rows, int((top + self.canvas.winfo_height()) // self.cell_height) + 2)
+        first = first_row * columns
+        last = min(len(self.records), last_row * columns)
+
+        # Cells that are still in view keep their bard; the rest are recycled
+        in_view = {cell["index"]: cell for cell in self.cells if cell["index"] is not None and first <= cell["index"] < last}
+        spare = [cell for cell in self.cells if cell["index"] is None or not first <= cell["index"] < last]
+        for index in range(first, last):
+            cell = in_view.get(index)
+            if cell is None:
+                cell = spare.pop() if spare else self._new_cell()
+            record = self.records[index]
+            if cell["record"] != record:
+                self.fill_cell(cell, record)
+                cell["record"] = record
+            if relayout or cell["index"] != index:
+                row, col = divmod(index, columns)
+                self.canvas.coords(cell["window"], col * self.cell_width, row * self.cell_height)
+                self.canvas.itemconfigure(cell["window"], state="normal")
+                cell["index"] = index
+        for cell in spare:
+            if cell["index"] is not None:
+                self.canvas.itemconfigure(cell["window"], state="hidden")
+                cell["index"] = None
 
 class BardLauncherGUI:
     def __init__(self, root):
         self.root = root
-        self.root.title("Bard Launcher 2.07.2")
+        self.root.title(f"Bard Launcher {APP_VERSION}")
         self.root.geometry("800x600")
 
         # Track if the Start All or Start Selected buttons have been pressed
         self.start_all_pressed = False
         self.start_selected_pressed = False
+        self.start_profile_pressed = None
+
+        # Launches run on the LaunchEngine's scheduler; its events and any status
+        # messages posted from worker threads are drained on the Tk thread by
+        # process_events and flush_status_log
+        self.events = queue.Queue()
+        self.status_log = StatusLog()
+        self.after_run = None
 
         # Set the initial theme
         self.style = ttk.Style(self.root)
@@ -59,10 +3574,12 @@ class BardLauncherGUI:
         # Create frames for tabs
         self.main_frame = ttk.Frame(self.notebook)
         self.settings_frame = ttk.Frame(self.notebook)
+        self.timeline_frame = ttk.Frame(self.notebook)
         self.readme_frame = ttk.Frame(self.notebook)
         
         self.notebook.add(self.main_frame, text="Main")
         self.notebook.add(self.settings_frame, text="Settings")
+        self.notebook.add(self.timeline_frame, text="Timeline")
         self.notebook.add(self.readme_frame, text="Readme")
 
         # Configure grid layout to make the frames expand
@@ -71,8 +3588,21 @@ class BardLauncherGUI:
         self.notebook.grid_rowconfigure(0, weight=1)
         self.notebook.grid_columnconfigure(0, weight=1)
 
+        # The Readme tab, the Timeline summary, the Shortcut Creator and most
+        # of the Settings tab are built the first time their tab is shown
+        self.readme_text = None
+        self.settings_sections_built = False
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
         # Load saved config if it exists
+        self.settings_store = SettingsStore(on_error=lambda e: self.log(f"Failed to save the settings. Error: {e}", "ERROR"))
         self.config_data = self.load_config()
+        self.shortcut_index = ShortcutIndex()
+        self.engine = LaunchEngine(self.config_data, status_log=self.status_log, events=self.events, shortcut_index=self.shortcut_index)
+        self.engine.process_registry.on_change = lambda states: self.events.put(("process_states", states))
+        self.engine.resource_monitor.on_sample = lambda summaries: self.events.put(("usage", summaries))
+        self.thumbnail_cache = ThumbnailCache()
+        self.watcher = DirectoryWatcher(lambda path, changes: self.events.put(("fs_changes", {"path": path, "changes": changes})))
 
         # Config Directory
         self.config_dir_label = ttk.Label(self.settings_frame, text="Config Directory")
@@ -100,6 +3630,12 @@ class BardLauncherGUI:
         self.delay_entry.insert(0, "10")  # Default value
         Hovertip(self.delay_entry, 'Set the delay in seconds between launching each shortcut')
 
+        # Adaptive Delay Toggle
+        self.adaptive_delay_var = tk.BooleanVar()
+        self.adaptive_delay_checkbutton = ttk.Checkbutton(self.settings_frame, text="Adaptive Delay", variable=self.adaptive_delay_var)
+        self.adaptive_delay_checkbutton.grid(row=2, column=2, padx=5, pady=5, sticky="w")
+        Hovertip(self.adaptive_delay_checkbutton, 'Move on as soon as the game client has started and settled, using the delay as an upper bound')
+
         # Dark Mode Toggle
         self.dark_mode_var = tk.BooleanVar()
         self.dark_mode_checkbutton = ttk.Checkbutton(self.settings_frame, text="Dark Mode", variable=self.dark_mode_var, command=self.toggle_dark_mode)
@@ -128,8 +3664,10 @@ class BardLauncherGUI:
         Hovertip(self.view_mode_checkbutton, 'Toggle between list and grid view')
 
         # Bard Buttons
-        self.bard_buttons_frame = ttk.Frame(self.main_frame)
+        self.bard_buttons_frame = VirtualBardView(self.main_frame)
         self.bard_buttons_frame.grid(row=1, column=0, columnspan=4, padx=5, pady=5, sticky="nsew")
+        self.main_frame.grid_rowconfigure(1, weight=1)
+        self.main_frame.grid_columnconfigure(3, weight=1)
 
         # Progress Bar
         self.progress_bar = ttk.Progressbar(self.main_frame, orient="horizontal", length=400, mode="determinate")
@@ -141,11 +3679,56 @@ class BardLauncherGUI:
         self.status_text = scrolledtext.ScrolledText(self.main_frame, height=10, width=80)
         self.status_text.grid(row=4, column=0, columnspan=4, padx=5, pady=5, sticky="nsew")
 
+        # Status Filters
+        self.status_level_var = tk.StringVar(value="ALL")
+        self.status_level_combobox = ttk.Combobox(self.main_frame, textvariable=self.status_level_var, values=STATUS_LEVELS, state="readonly", width=10)
+        self.status_level_combobox.grid(row=3, column=2, padx=5, pady=5, sticky="e")
+        self.status_level_combobox.bind("<<ComboboxSelected>>", lambda e: self.render_status_log())
+        Hovertip(self.status_level_combobox, 'Only show status messages of this level')
+
+        self.status_bard_var = tk.StringVar()
+        self.status_bard_combobox = ttk.Combobox(self.main_frame, textvariable=self.status_bard_var, width=20, postcommand=lambda: self.status_bard_combobox.configure(values=[""] + list(self.bard_checkbuttons)))
+        self.status_bard_combobox.grid(row=3, column=3, padx=5, pady=5, sticky="ew")
+        self.status_bard_combobox.bind("<<ComboboxSelected>>", lambda e: self.render_status_log())
+        self.status_bard_combobox.bind("<KeyRelease>", lambda e: self.render_status_log())
+        Hovertip(self.status_bard_combobox, 'Only show status messages for this bard')
+
         # Clear Status Button
         self.clear_status_button = ttk.Button(self.main_frame, text="Clear Status", command=self.clear_status)
         self.clear_status_button.grid(row=5, column=0, padx=5, pady=5, sticky="ew")
         Hovertip(self.clear_status_button, 'Clear the status log')
 
+        # Launch Run Controls
+        self.pause_button = ttk.Button(self.main_frame, text="Pause", command=self.toggle_pause, state="disabled")
+        self.pause_button.grid(row=5, column=1, padx=5, pady=5, sticky="ew")
+        Hovertip(self.pause_button, 'Pause or resume the current launch run')
+
+        self.skip_button = ttk.Button(self.main_frame, text="Skip Wait", command=self.skip_current, state="disabled")
+        self.skip_button.grid(row=5, column=2, padx=5, pady=5, sticky="ew")
+        Hovertip(self.skip_button, 'Stop waiting on the current bard and move on to the next one')
+
+        self.cancel_button = ttk.Button(self.main_frame, text="Cancel", command=self.cancel_run, state="disabled")
+        self.cancel_button.grid(row=5, column=3, padx=5, pady=5, sticky="ew")
+        Hovertip(self.cancel_button, 'Cancel the current launch run')
+
+        self.resume_button = ttk.Button(self.main_frame, text="Resume Last Run", command=self.resume_last_run, state="disabled")
+        self.resume_button.grid(row=6, column=0, padx=5, pady=5, sticky="ew")
+        Hovertip(self.resume_button, 'Launch the bards the last run did not get to, in the same order')
+
+        # Launch Profiles
+        self.profiles = {}
+        self.profile_var = tk.StringVar()
+        self.profile_combobox = ttk.Combobox(self.main_frame, textvariable=self.profile_var, state="readonly", width=20, postcommand=lambda: self.profile_combobox.configure(values=sorted(self.profiles)))
+        self.profile_combobox.grid(row=6, column=1, padx=5, pady=5, sticky="ew")
+        self.profile_combobox.bind("<<ComboboxSelected>>", lambda e: self.select_profile(self.profile_var.get()))
+        Hovertip(self.profile_combobox, 'Switch to a launch profile: selects its bards')
+        self.start_profile_button = ttk.Button(self.main_frame, text="Start Profile", command=self.confirm_start_profile_process)
+        self.start_profile_button.grid(row=6, column=2, padx=5, pady=5, sticky="ew")
+        Hovertip(self.start_profile_button, 'Launch the bards of the current profile, in the profile order and with its delays')
+        self.edit_profiles_button = ttk.Button(self.main_frame, text="Profiles...", command=self.show_profiles)
+        self.edit_profiles_button.grid(row=6, column=3, padx=5, pady=5, sticky="ew")
+        Hovertip(self.edit_profiles_button, 'Create, change or delete launch profiles')
+
         # Save Settings Button
         self.save_settings_button = ttk.Button(self.settings_frame, text="Save Settings", command=self.save_settings)
         self.save_settings_button.grid(row=3, column=0, padx=5, pady=5, sticky="ew")
@@ -161,11 +3744,166 @@ class BardLauncherGUI:
         self.reset_config_button.grid(row=3, column=2, padx=5, pady=5, sticky="ew")
         Hovertip(self.reset_config_button, 'Reset the configuration to default settings')
 
-        # Readme Tab
-        self.readme_text = HTMLLabel(self.readme_frame, html=self.load_readme())
-        self.readme_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Timeline Tab
+        self.timeline_runs_label = ttk.Label(self.timeline_frame, text="")
+        self.timeline_runs_label.grid(row=0, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        self.timeline_tree = ttk.Treeview(self.timeline_frame, columns=("phase", "samples", "p50", "p95"), show="headings", height=8)
+        for column, heading, width in (("phase", "Phase", 200), ("samples", "Samples", 80), ("p50", "p50", 80), ("p95", "p95", 80)):
+            self.timeline_tree.heading(column, text=heading)
+            self.timeline_tree.column(column, width=width, anchor="w" if column == "phase" else "e")
+        self.timeline_tree.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        self.timeline_frame.grid_rowconfigure(1, weight=1)
+        self.timeline_frame.grid_columnconfigure(2, weight=1)
+
+        self.timeline_refresh_button = ttk.Button(self.timeline_frame, text="Refresh", command=self.refresh_timeline_summary)
+        self.timeline_refresh_button.grid(row=2, column=0, padx=5, pady=5, sticky="ew")
+        Hovertip(self.timeline_refresh_button, 'Reload the phase summary from the saved launch timelines')
+        self.timeline_json_button = ttk.Button(self.timeline_frame, text="Export JSON", command=lambda: self.export_timeline("json"))
+        self.timeline_json_button.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        Hovertip(self.timeline_json_button, 'Export the timeline of the last launch run as JSON')
+        self.timeline_csv_button = ttk.Button(self.timeline_frame, text="Export CSV", command=lambda: self.export_timeline("csv"))
+        self.timeline_csv_button.grid(row=2, column=2, padx=5, pady=5, sticky="w")
+        Hovertip(self.timeline_csv_button, 'Export the timeline of the last launch run as CSV')
 
         self.bard_checkbuttons = {}
+        self.bard_views_grid = None
+        self.bard_accounts = {}  # bard name -> the --account of its shortcut
+        self.bard_placement = {}
+        self.set_section_settings(self.config_data or {})
+
+        # Load previous paths and checkbox states
+        if self.config_data:
+            self.config_dir_entry.insert(0, self.config_data.get('config_dir', ''))
+            self.shortcut_dir_entry.insert(0, self.config_data.get('shortcut_dir', ''))
+            self.delay_entry.delete(0, tk.END)  # Clear the delay entry field before inserting new value
+            self.delay_entry.insert(0, str(self.config_data.get('delay', 10)))
+            self.adaptive_delay_var.set(self.config_data.get('adaptive_delay', False))
+            self.dark_mode_var.set(self.config_data.get('dark_mode', False))
+            self.bard_placement = self.config_data.get('bard_placement') or {}
+            self.profiles = self.config_data.get('profiles') or {}
+            self.profile_var.set(self.config_data.get('active_profile', ''))
+            self.toggle_dark_mode()  # Set initial theme based on saved config
+        else:
+            # Set a common default path for the config directory
+            default_config_path = os.path.join(os.path.expanduser('~'), "Documents", "My Games", "FINAL FANTASY XIV - A Realm Reborn")
+            if os.path.isdir(default_config_path):
+                self.config_dir_entry.insert(0, default_config_path)
+
+        # Scanning the shortcuts and loading their icons waits until the window
+        # has painted once
+        self.root.after(1, lambda: self.root.after_idle(self.finish_startup))
+        self.root.after(100, self.process_events)
+        self.root.after(STATUS_FLUSH_MS, self.flush_status_log)
+
+    def finish_startup(self):
+        self.populate_shortcuts(self.config_data.get('bard_checkbuttons') if self.config_data else None)
+        self.watch_directories()
+        self.engine.process_registry.start()
+        self.engine.resource_monitor.start()
+        self.update_resume_button()
+        threading.Thread(target=self.engine.compile_plans, name="CompilePlans", daemon=True).start()
+        run = self.engine.journal.last_run()
+        if run is not None and not run["ended"] and run["remaining"]:
+            # The last run never finished: the app was closed or crashed mid-launch
+            if messagebox.askyesno("Resume Launch", f"The last launch run stopped after {len(run['done'])} of {len(run['plan'])} bards. Launch the remaining {len(run['remaining'])} now?"):
+                self.resume_last_run()
+
+    def on_tab_changed(self, event):
+        selected = self.notebook.nametowidget(self.notebook.select())
+        if selected is self.readme_frame and self.readme_text is None:
+            self.build_readme_tab()
+        elif selected is self.timeline_frame:
+            self.refresh_timeline_summary()
+        elif selected is self.settings_frame and not self.settings_sections_built:
+            self.build_settings_sections()
+
+    def build_settings_sections(self):
+        # The sections of the Settings tab below the directories and the delay.
+        # Until they are built, section_values holds what they show.
+        # Config Backups
+        self.backup_section = ttk.LabelFrame(self.settings_frame, text="Config Backups")
+        self.backup_section.grid(row=6, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        self.backup_keep_label = ttk.Label(self.backup_section, text="Keep per bard")
+        self.backup_keep_label.grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        self.backup_keep_entry = ttk.Entry(self.backup_section, width=5)
+        self.backup_keep_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        Hovertip(self.backup_keep_entry, 'How many config backups to keep for each bard')
+        self.backup_age_label = ttk.Label(self.backup_section, text="Max age (days)")
+        self.backup_age_label.grid(row=0, column=2, padx=5, pady=5, sticky="e")
+        self.backup_age_entry = ttk.Entry(self.backup_section, width=5)
+        self.backup_age_entry.grid(row=0, column=3, padx=5, pady=5, sticky="w")
+        Hovertip(self.backup_age_entry, 'Config backups older than this are deleted')
+
+        # Admission Control
+        self.admission_section = ttk.LabelFrame(self.settings_frame, text="Admission Control")
+        self.admission_section.grid(row=7, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        self.admission_var = tk.BooleanVar()
+        self.admission_checkbutton = ttk.Checkbutton(self.admission_section, text="Wait for headroom before each launch", variable=self.admission_var)
+        self.admission_checkbutton.grid(row=0, column=0, columnspan=4, padx=5, pady=5, sticky="w")
+        Hovertip(self.admission_checkbutton, 'Hold the next bard back while too many clients are loading or the machine is busy. The reason for each wait is shown in the status log.')
+        self.admission_entries = {}
+        for i, (key, text, tip) in enumerate((
+                ("max_loading", "Max loading clients", 'How many game clients may be loading at the same time'),
+                ("max_cpu_percent", "Max CPU %", 'Only launch while total CPU use is at or below this'),
+                ("min_available_mb", "Min free memory (MB)", 'Only launch while at least this much memory is free'),
+                ("max_disk_mb_per_s", "Max disk MB/s", 'Only launch while disk reads and writes are at or below this'))):
+            label = ttk.Label(self.admission_section, text=text)
+            label.grid(row=1 + i // 2, column=(i % 2) * 2, padx=5, pady=5, sticky="e")
+            entry = ttk.Entry(self.admission_section, width=7)
+            entry.grid(row=1 + i // 2, column=(i % 2) * 2 + 1, padx=5, pady=5, sticky="w")
+            Hovertip(entry, tip)
+            self.admission_entries[key] = entry
+
+        # Client Monitor
+        self.monitor_section = ttk.LabelFrame(self.settings_frame, text="Client Monitor")
+        self.monitor_section.grid(row=8, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        self.monitor_entries = {}
+        for i, (key, text, tip) in enumerate((
+                ("interval", "Sample every (s)", 'How often to sample the CPU, memory and disk use of running clients'),
+                ("cpu_alert_percent", "CPU alert %", 'Warn in the status log when a client uses more CPU than this (100% is one core)'),
+                ("rss_alert_mb", "Memory alert (MB)", 'Warn in the status log when a client uses more memory than this'),
+                ("io_alert_mb_per_s", "Disk alert MB/s", 'Warn in the status log when a client reads and writes more than this'))):
+            label = ttk.Label(self.monitor_section, text=text)
+            label.grid(row=i // 2, column=(i % 2) * 2, padx=5, pady=5, sticky="e")
+            entry = ttk.Entry(self.monitor_section, width=7)
+            entry.grid(row=i // 2, column=(i % 2) * 2 + 1, padx=5, pady=5, sticky="w")
+            Hovertip(entry, tip)
+            self.monitor_entries[key] = entry
+
+        # CPU Placement
+        self.placement_section = ttk.LabelFrame(self.settings_frame, text="CPU Placement")
+        self.placement_section.grid(row=9, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        self.placement_var = tk.BooleanVar()
+        self.placement_checkbutton = ttk.Checkbutton(self.placement_section, text="Pin game clients to CPU cores", variable=self.placement_var)
+        self.placement_checkbutton.grid(row=0, column=0, columnspan=4, padx=5, pady=5, sticky="w")
+        Hovertip(self.placement_checkbutton, 'Spread the game clients over the physical cores, one core each in turn, and set their priority. Clients are placed as soon as they start, including after a restart. Right-click a bard for its own placement.')
+        self.reserved_cores_label = ttk.Label(self.placement_section, text="Reserved cores")
+        self.reserved_cores_label.grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        self.reserved_cores_entry = ttk.Entry(self.placement_section, width=7)
+        self.reserved_cores_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        Hovertip(self.reserved_cores_entry, 'How many physical cores to keep for LightAmp and the lead bard')
+        self.placement_priority_label = ttk.Label(self.placement_section, text="Priority")
+        self.placement_priority_label.grid(row=1, column=2, padx=5, pady=5, sticky="e")
+        self.placement_priority_var = tk.StringVar()
+        self.placement_priority_combobox = ttk.Combobox(self.placement_section, textvariable=self.placement_priority_var, values=PRIORITY_LEVELS, state="readonly", width=12)
+        self.placement_priority_combobox.grid(row=1, column=3, padx=5, pady=5, sticky="w")
+        Hovertip(self.placement_priority_combobox, 'Process priority for the game clients and LightAmp. Above normal and high may need Bard Launcher to run as administrator.')
+        self.lead_bard_label = ttk.Label(self.placement_section, text="Lead bard")
+        self.lead_bard_label.grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        self.lead_bard_var = tk.StringVar()
+        self.lead_bard_combobox = ttk.Combobox(self.placement_section, textvariable=self.lead_bard_var, width=20, postcommand=lambda: self.lead_bard_combobox.configure(values=[""] + list(self.bard_checkbuttons)))
+        self.lead_bard_combobox.grid(row=2, column=1, columnspan=3, padx=5, pady=5, sticky="w")
+        Hovertip(self.lead_bard_combobox, 'This bard shares the reserved cores with LightAmp instead of a core with other bards')
+
+        # Bard Configs
+        self.bard_configs_section = ttk.LabelFrame(self.settings_frame, text="Bard Configs")
+        self.bard_configs_section.grid(row=10, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        self.convert_configs_button = ttk.Button(self.bard_configs_section, text="Use Base + Deltas for Selected", command=self.convert_selected_configs)
+        self.convert_configs_button.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        Hovertip(self.convert_configs_button, 'Keep only the settings where each selected bard differs from default.cfg. The rest comes from default.cfg when the bard is launched, so a change to default.cfg reaches every bard. The full configs are backed up first.')
+        self.set_config_value_button = ttk.Button(self.bard_configs_section, text="Set Value for Selected...", command=self.show_set_config_value)
+        self.set_config_value_button.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        Hovertip(self.set_config_value_button, 'Change one setting in the config of every selected bard')
 
         # Experimental Section
         self.experimental_section = ttk.LabelFrame(self.settings_frame, text="Experimental")
@@ -173,7 +3911,6 @@ class BardLauncherGUI:
 
         self.experimental_section.grid_rowconfigure(0, weight=1)
         self.experimental_section.grid_columnconfigure(0, weight=1)
-        self.experimental_vars = {}
 
         separator = ttk.Separator(self.experimental_section, orient='horizontal')
         separator.grid(row=0, column=0, columnspan=3, padx=5, pady=10, sticky="ew")
@@ -192,6 +3929,17 @@ class BardLauncherGUI:
         self.lightamp_browse_button.grid(row=2, column=2, padx=5, pady=5)
         Hovertip(self.lightamp_browse_button, 'Browse to select the LightAmp executable')
 
+        self.settings_sections_built = True
+        self.show_section_settings()
+        self.build_shortcut_creator()
+
+    def build_readme_tab(self):
+        global HTMLLabel
+        from tkhtmlview import HTMLLabel
+        self.readme_text = HTMLLabel(self.readme_frame, html=self.load_readme())
+        self.readme_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def build_shortcut_creator(self):
         # Separator
         separator = ttk.Separator(self.experimental_section, orient='horizontal')
         separator.grid(row=3, column=0, columnspan=3, padx=5, pady=10, sticky="ew")
@@ -233,29 +3981,237 @@ class BardLauncherGUI:
         self.create_button.grid(row=9, column=0, columnspan=3, padx=5, pady=10)
         Hovertip(self.create_button, 'Create shortcuts for the selected accounts')
 
-        self.accounts_frame = ScrollableFrame(self.experimental_section)
-        self.accounts_frame.grid(row=10, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
-        self.accounts_vars = {}
+        self.account_search_label = ttk.Label(self.experimental_section, text="Search Accounts:")
+        self.account_search_label.grid(row=10, column=0, padx=5, pady=5, sticky="e")
+        self.account_search_var = tk.StringVar()
+        self.account_search_entry = ttk.Entry(self.experimental_section, textvariable=self.account_search_var, width=50)
+        self.account_search_entry.grid(row=10, column=1, padx=5, pady=5, sticky="ew")
+        Hovertip(self.account_search_entry, 'Only show accounts whose name contains this text')
+        self.account_count_label = ttk.Label(self.experimental_section, text="")
+        self.account_count_label.grid(row=10, column=2, padx=5, pady=5, sticky="w")
 
-        # Load previous paths and checkbox states
-        if self.config_data:
-            self.config_dir_entry.insert(0, self.config_data.get('config_dir', ''))
-            self.shortcut_dir_entry.insert(0, self.config_data.get('shortcut_dir', ''))
-            self.delay_entry.delete(0, tk.END)  # Clear the delay entry field before inserting new value
-            self.delay_entry.insert(0, str(self.config_data.get('delay', 10)))
-            self.dark_mode_var.set(self.config_data.get('dark_mode', False))
-            self.toggle_dark_mode()  # Set initial theme based on saved config
-            if 'bard_checkbuttons' in self.config_data:
-                self.populate_shortcuts(self.config_data['bard_checkbuttons'])
-            else:
+        self.account_buttons_frame = ttk.Frame(self.experimental_section)
+        self.account_buttons_frame.grid(row=11, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        self.select_shown_button = ttk.Button(self.account_buttons_frame, text="Select Shown", command=lambda: self.select_shown_accounts(True))
+        self.select_shown_button.pack(side="left", padx=(0, 5))
+        Hovertip(self.select_shown_button, 'Select every account that matches the search')
+        self.clear_shown_button = ttk.Button(self.account_buttons_frame, text="Clear Shown", command=lambda: self.select_shown_accounts(False))
+        self.clear_shown_button.pack(side="left")
+        Hovertip(self.clear_shown_button, 'Clear the selection of every account that matches the search')
+
+        self.accounts_view = VirtualBardView(self.experimental_section)
+        self.accounts_view.set_layout(self.create_account_cell, self.fill_account_cell, 300, 26, columns=1)
+        self.accounts_view.grid(row=12, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        self.account_index = AccountIndex()
+        self.selected_accounts = set()
+        self.account_search_var.trace_add("write", lambda *args: self.filter_accounts())
+
+    def log(self, message, level="INFO", bard=None):
+        # Safe to call from any thread; the widget catches up in flush_status_log
+        self.status_log.log(message, level, bard)
+
+    def flush_status_log(self):
+        records = self.status_log.drain()
+        level, bard = self.status_level_var.get(), self.status_bard_var.get()
+        lines = [StatusLog.format(record) for record in records if StatusLog.matches(record, level, bard)]
+        if lines:
+            self.status_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.trim_status_text()
+            self.status_text.see(tk.END)
+        self.root.after(STATUS_FLUSH_MS, self.flush_status_log)
+
+    def render_status_log(self):
+        # Rebuild the widget from the ring buffer with the current filters
+        self.status_log.drain()
+        level, bard = self.status_level_var.get(), self.status_bard_var.get()
+        lines = [StatusLog.format(record) for record in self.status_log.snapshot() if StatusLog.matches(record, level, bard)]
+        self.status_text.delete(1.0, tk.END)
+        if lines:
+            self.status_text.insert(tk.END, "\n".join(lines[-STATUS_MAX_LINES:]) + "\n")
+        self.status_text.see(tk.END)
+
+    def trim_status_text(self):
+        line_count = int(self.status_text.index("end-1c").split(".")[0]) - 1
+        if line_count > STATUS_MAX_LINES:
+            self.status_text.delete(1.0, f"{line_count - STATUS_MAX_LINES + 1}.0")
+
+    def process_events(self):
+        try:
+            while True:
+                kind, data = self.events.get_nowait()
+                if kind == "status":
+                    self.log(data["message"], data.get("level", "INFO"), data.get("bard"))
+                elif kind == "started":
+                    self.progress_bar["maximum"] = max(1, data["total"])
+                    self.progress_bar["value"] = 0
+                elif kind == "progress":
+                    self.progress_bar["value"] = data["value"]
+                elif kind == "paused":
+                    self.log("Launch paused.")
+                elif kind == "resumed":
+                    self.log("Launch resumed.")
+                elif kind == "fs_changes":
+                    self.apply_directory_changes(data["path"], data["changes"])
+                elif kind == "process_states":
+                    self.apply_process_states(data)
+                elif kind == "usage":
+                    self.apply_usage(data)
+                elif kind == "finished":
+                    self.log("Launch cancelled." if data["cancelled"] else "All Done!")
+                    if self.notebook.select() == str(self.timeline_frame):
+                        self.refresh_timeline_summary()
+                    self.set_run_controls(False)
+                    if self.after_run:
+                        after_run, self.after_run = self.after_run, None
+                        after_run()
+        except queue.Empty:
+            pass
+        self.root.after(100, self.process_events)
+
+    def apply_process_states(self, states):
+        # Only the cells whose bard changed state are refilled
+        records = [record._replace(state=states.get(record.name, "stopped")) for record in self.bard_buttons_frame.records]
+        self.bard_buttons_frame.set_records(records)
+
+    def apply_usage(self, summaries):
+        records = []
+        for record in self.bard_buttons_frame.records:
+            summary = summaries.get(record.name)
+            usage = f"{summary['sparkline']}\n{summary['cpu_percent']:.0f}% {summary['rss_mb']:.0f} MB" if summary else ""
+            records.append(record._replace(usage=usage))
+        self.bard_buttons_frame.set_records(records)
+
+    def watch_directories(self):
+        self.watcher.set_paths([self.shortcut_dir_entry.get(), self.config_dir_entry.get()])
+
+    def apply_directory_changes(self, path, changes):
+        def same_dir(other):
+            return bool(other) and os.path.normcase(os.path.abspath(other)) == os.path.normcase(path)
+
+        shortcut_dir = self.shortcut_dir_entry.get()
+        if same_dir(shortcut_dir):
+            # Carry selections over to renamed shortcuts before refreshing
+            for old_name, new_name in changes["renamed"]:
+                old_bard, new_bard = old_name.split(".")[0], new_name.split(".")[0]
+                if old_bard in self.bard_checkbuttons and new_bard not in self.bard_checkbuttons:
+                    self.bard_checkbuttons[new_bard] = self.bard_checkbuttons.pop(old_bard)
+
+            # Only the changed shortcuts are read again, unless there are too
+            # many changes to go one by one
+            def load_record(file):
+                shortcut_path = os.path.join(shortcut_dir, file)
+                if not os.path.isfile(shortcut_path):
+                    return None
+                return self.load_bard_record(shortcut_dir, file, self.shortcut_index.get(shortcut_path))
+
+            records = update_bard_records(self.bard_buttons_frame.records, changes, load_record)
+            if records is None:
                 self.populate_shortcuts()
-            self.lightamp_check_var.set(self.config_data.get('lightamp_check', False))
-            self.lightamp_entry.insert(0, self.config_data.get('lightamp_location', ''))
+            else:
+                self.shortcut_index.forget([os.path.join(shortcut_dir, name) for name in changes["removed"]] + [os.path.join(shortcut_dir, old_name) for old_name, new_name in changes["renamed"]])
+                self.bard_accounts = {record.name: self.bard_accounts.get(record.name) for record in records}
+                self.engine.process_registry.set_accounts(self.bard_accounts)
+                self.reconcile_bard_views(records)
+            for name in changes["added"]:
+                self.log(f"Shortcut added: {name}")
+            for name in changes["removed"]:
+                self.log(f"Shortcut removed: {name}")
+            for old_name, new_name in changes["renamed"]:
+                self.log(f"Shortcut renamed: {old_name} -> {new_name}")
+
+        if same_dir(self.config_dir_entry.get()):
+            # Only logged: launches read the configs fresh, and the caches on the
+            # way (BardConfigs' default.cfg, ConfigSwapper's digest) check mtime
+            # and size. Modifications are left out: every launch rewrites
+            # FFXIV.cfg, which may live in the config directory.
+            for name in changes["added"]:
+                self.log(f"Config added: {name}")
+            for name in changes["removed"]:
+                self.log(f"Config removed: {name}")
+            for old_name, new_name in changes["renamed"]:
+                self.log(f"Config renamed: {old_name} -> {new_name}")
+
+    def refresh_timeline_summary(self):
+        self.timeline_tree.delete(*self.timeline_tree.get_children())
+        timelines = load_timelines()
+        for phase, samples, p50, p95 in timeline_phase_stats(timelines):
+            self.timeline_tree.insert("", tk.END, values=(phase, samples, "-" if p50 is None else f"{p50:.1f}s", "-" if p95 is None else f"{p95:.1f}s"))
+        self.timeline_runs_label.config(text=f"Across the last {len(timelines)} runs")
+
+    def export_timeline(self, file_format):
+        timelines = load_timelines(limit=1)
+        if not timelines:
+            messagebox.showerror("Error", "No launch timelines have been recorded yet.")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=f".{file_format}", initialfile=f"timeline_{timelines[0]['run_id']}.{file_format}", filetypes=[(f"{file_format.upper()} files", f"*.{file_format}"), ("All files", "*.*")])
+        if not file_path:
+            return
+        if file_format == "csv":
+            write_timelines_csv(timelines, file_path)
         else:
-            # Set a common default path for the config directory
-            default_config_path = os.path.join(os.path.expanduser('~'), "Documents", "My Games", "FINAL FANTASY XIV - A Realm Reborn")
-            if os.path.isdir(default_config_path):
-                self.config_dir_entry.insert(0, default_config_path)
+            with open(file_path, 'w') as f:
+                json.dump(timelines[0], f, indent=2)
+        self.log(f"Exported the last launch timeline to {file_path}")
+
+    def run_launch(self, start, after_run=None):
+        # start() asks the engine for a scheduler and returns it, or None
+        if self.engine.is_running():
+            messagebox.showerror("Error", "A launch is already in progress.")
+            return False
+        if start() is None:
+            return False
+        self.after_run = after_run
+        self.set_run_controls(True)
+        return True
+
+    def set_run_controls(self, running):
+        state = "normal" if running else "disabled"
+        self.pause_button.config(state=state, text="Pause")
+        self.skip_button.config(state=state)
+        self.cancel_button.config(state=state)
+        self.update_resume_button()
+
+    def update_resume_button(self):
+        run = self.engine.journal.last_run()
+        resumable = run is not None and bool(run["remaining"]) and not self.engine.is_running()
+        self.resume_button.config(state="normal" if resumable else "disabled")
+
+    def resume_last_run(self):
+        try:
+            delay = max(10, int(self.delay_entry.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number for the delay.")
+            return
+        settings = self.current_settings(delay)
+        if not settings["config_dir"] or not settings["shortcut_dir"]:
+            messagebox.showerror("Error", "Please select both directories.")
+            return
+        if self.engine.is_running():
+            messagebox.showerror("Error", "A launch is already in progress.")
+            return
+        self.engine.settings = settings
+        if settings["lightamp_check"] and self.engine.start_lightamp() == "invalid_path":
+            messagebox.showerror("Error", "Invalid LightAmp.exe file path")
+        self.run_launch(lambda: self.engine.resume_run(lightamp=False))
+
+    def toggle_pause(self):
+        scheduler = self.engine.scheduler
+        if scheduler is None:
+            return
+        if scheduler.is_paused():
+            scheduler.resume()
+            self.pause_button.config(text="Pause")
+        else:
+            scheduler.pause()
+            self.pause_button.config(text="Resume")
+
+    def skip_current(self):
+        if self.engine.scheduler is not None:
+            self.engine.scheduler.skip()
+
+    def cancel_run(self):
+        if self.engine.scheduler is not None:
+            self.engine.scheduler.cancel()
 
     def toggle_roaming_path(self):
         if self.roaming_check_var.get():
@@ -291,19 +4247,45 @@ class BardLauncherGUI:
             self.lightamp_entry.insert(0, file_path)
 
     def load_accounts(self, file_path):
-        with open(file_path, 'r') as file:
-            accounts = json.load(file)
+        try:
+            self.account_index.load(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not read the accounts from {file_path}. Error: {e}")
+            return False
+        self.selected_accounts &= {record.user_name for record in self.account_index.records}
+        self.filter_accounts()
+        return True
+
+    def filter_accounts(self):
+        self.accounts_view.set_records([record.user_name for record in self.account_index.search(self.account_search_var.get())], force=True)
+        self.update_account_count()
 
-        for widget in self.accounts_frame.scrollable_frame.winfo_children():
-            widget.destroy()
+    def update_account_count(self):
+        self.account_count_label.configure(text=f"{len(self.accounts_view.records)} of {len(self.account_index.records)} shown, {len(self.selected_accounts)} selected")
 
-        self.accounts_vars = {}
-        for account in accounts:
-            user_name = account.get('UserName')
-            var = tk.BooleanVar()
-            chk = ttk.Checkbutton(self.accounts_frame.scrollable_frame, text=user_name, variable=var)
-            chk.pack(anchor='w')
-            self.accounts_vars[user_name] = var
+    def select_shown_accounts(self, selected):
+        if selected:
+            self.selected_accounts.update(self.accounts_view.records)
+        else:
+            self.selected_accounts.difference_update(self.accounts_view.records)
+        self.accounts_view.set_records(self.accounts_view.records, force=True)
+        self.update_account_count()
+
+    def create_account_cell(self, parent):
+        cell = {"var": tk.BooleanVar()}
+        cell["frame"] = ttk.Checkbutton(parent, variable=cell["var"], command=lambda: self.toggle_account(cell))
+        return cell
+
+    def fill_account_cell(self, cell, user_name):
+        cell["frame"].configure(text=user_name)
+        cell["var"].set(user_name in self.selected_accounts)
+
+    def toggle_account(self, cell):
+        if cell["var"].get():
+            self.selected_accounts.add(cell["record"])
+        else:
+            self.selected_accounts.discard(cell["record"])
+        self.update_account_count()
 
     def create_shortcuts(self):
         json_file_path = self.json_entry.get()
@@ -313,55 +4295,53 @@ class BardLauncherGUI:
         if not os.path.isfile(json_file_path):
             messagebox.showerror("Error", "Invalid accountsList.json file path")
             return
+        if not shortcut_directory:
+            messagebox.showerror("Error", "Please select the shortcut directory.")
+            return
+        if not self.load_accounts(json_file_path):
+            return
 
-        if not os.path.exists(shortcut_directory):
-            os.makedirs(shortcut_directory)
-
-        with open(json_file_path, 'r') as file:
-            accounts = json.load(file)
+        shortcuts = [account_shortcut(record, shortcut_directory, roaming_directory) for record in self.account_index.records if record.user_name in self.selected_accounts]
+        if not shortcuts:
+            messagebox.showerror("Error", "Please select at least one account.")
+            return
 
-        xiv_launcher_path = os.path.expanduser(r"~\AppData\Local\XIVLauncher\XIVLauncher.exe")
+        # Show what would change before writing anything
+        plan = plan_shortcuts(shortcuts)
+        creates = [os.path.basename(item["path"]) for item, (action, changed) in zip(shortcuts, plan) if action == "create"]
+        updates = [f"{os.path.basename(item['path'])} ({', '.join(changed).replace('_', ' ')})" for item, (action, changed) in zip(shortcuts, plan) if action == "update"]
+        unchanged = len(shortcuts) - len(creates) - len(updates)
+        if not creates and not updates:
+            messagebox.showinfo("Create Shortcuts", f"All {unchanged} shortcuts are already up to date.")
+            self.log(f"All {unchanged} shortcuts are already up to date")
+            return
+        lines = [f"Create: {name}" for name in creates] + [f"Update: {name}" for name in updates]
+        if len(lines) > 15:
+            lines = lines[:15] + [f"...and {len(lines) - 15} more"]
+        summary = f"{len(creates)} to create, {len(updates)} to update, {unchanged} already up to date.\n\n" + "\n".join(lines)
+        if not messagebox.askokcancel("Create Shortcuts", summary):
+            return
 
-        for account in accounts:
-            user_name = account.get('UserName')
-            if not self.accounts_vars[user_name].get():
+        if not os.path.exists(shortcut_directory):
+            os.makedirs(shortcut_directory)
+        for shortcut_path, result in write_shortcuts(shortcuts, plan):
+            if result == "unchanged":
                 continue
-
-            use_otp = account.get('UseOtp', False)
-            use_steam = account.get('UseSteamServiceAccount', False)
-
-            # Construct the arguments for the target
-            args = f'--account={user_name}-{use_otp}-{use_steam}'
-            if roaming_directory:
-                args += f' --roamingPath={roaming_directory}'
-
-            # Shortcut file name
-            shortcut_name = f"{user_name}.lnk"
-            shortcut_path = os.path.join(shortcut_directory, shortcut_name)
-
-            # Create the shortcut
-            shell = Dispatch('WScript.Shell')
-            shortcut = shell.CreateShortCut(shortcut_path)
-            shortcut.TargetPath = xiv_launcher_path
-            shortcut.Arguments = args
-            shortcut.WorkingDirectory = os.path.dirname(xiv_launcher_path)
-            shortcut.IconLocation = xiv_launcher_path
-            shortcut.save()
-
-            self.status_text.insert(tk.END, f"Created shortcut for {user_name} at {shortcut_path}\n")
+            if result.startswith("Error"):
+                self.log(f"Failed to create shortcut at {shortcut_path}. {result}", "ERROR")
+            else:
+                self.log(f"{result.capitalize()} shortcut at {shortcut_path}")
+        if unchanged:
+            self.log(f"{unchanged} shortcuts were already up to date")
 
     def load_readme(self):
-        try:
-            with open("Readme.txt", "r") as file:
-                content = file.read()
-                return markdown.markdown(content)
-        except FileNotFoundError:
-            return "<h2>Readme.txt file not found in the current directory.</h2>"
+        return render_readme()
 
     def browse_config_dir(self):
         directory = filedialog.askdirectory()
         self.config_dir_entry.delete(0, tk.END)
         self.config_dir_entry.insert(0, directory)
+        self.watch_directories()
 
     def browse_shortcut_dir(self):
         directory = filedialog.askdirectory()
@@ -373,73 +4353,106 @@ class BardLauncherGUI:
         shortcut_dir = self.shortcut_dir_entry.get()
         if not shortcut_dir:
             return
+        self.reconcile_bard_views(self.load_bard_records(shortcut_dir), checkbutton_states)
+        self.watch_directories()
+
+    def load_bard_records(self, shortcut_dir):
+        records = []
+        self.bard_accounts = {}
+        for file, shortcut_info in self.shortcut_index.scan(shortcut_dir):
+            if file.split(".")[0] not in self.bard_accounts:
+                records.append(self.load_bard_record(shortcut_dir, file, shortcut_info))
+        self.engine.process_registry.set_accounts(self.bard_accounts)
+        return records
 
-        for widget in self.bard_buttons_frame.winfo_children():
-            widget.destroy()
+    def load_bard_record(self, shortcut_dir, file, shortcut_info):
+        bard_name = file.split(".")[0]
+        self.bard_accounts[bard_name] = shortcut_account(shortcut_info["arguments"])
+        if shortcut_info["error"]:
+            self.log(f"Error retrieving icon: {shortcut_info['error']}", "WARNING", bard_name)
+        icon_path = shortcut_info["icon_location"].split(',')[0]
+        if not icon_path or not os.path.exists(icon_path):
+            icon_path = self.default_icon_path  # Use default icon if specific icon is missing
+        return BardRecord(bard_name, os.path.join(shortcut_dir, file), icon_path, self.engine.process_registry.state(bard_name))
 
+    def reconcile_bard_views(self, records, checkbutton_states=None):
+        # The checkbox variables are the model: they are kept per bard name so
+        # selections survive a refresh. The view only refills the visible cells
+        # whose bard record changed.
+        grid_view = self.view_mode_var.get()
+        if grid_view != self.bard_views_grid:
+            if grid_view:
+                self.bard_buttons_frame.set_layout(self.create_grid_cell, self.fill_grid_cell, 120, 150)
+            else:
+                self.bard_buttons_frame.set_layout(self.create_list_cell, self.fill_list_cell, 860, 36, columns=1)
+            self.bard_views_grid = grid_view
+
+        previous_vars = self.bard_checkbuttons
         self.bard_checkbuttons = {}
-        if self.view_mode_var.get():
-            # Grid view
-            row = 0
-            col = 0
-            max_cols = 4
-            for file in os.listdir(shortcut_dir):
-                bard_name = file.split(".")[0]
+        for record in records:
+            var = previous_vars.get(record.name)
+            if var is None:
                 var = tk.BooleanVar()
-                if checkbutton_states and bard_name in checkbutton_states:
-                    var.set(checkbutton_states[bard_name])
-                self.bard_checkbuttons[bard_name] = var
+            if checkbutton_states and record.name in checkbutton_states:
+                var.set(checkbutton_states[record.name])
+            self.bard_checkbuttons[record.name] = var
+        self.bard_buttons_frame.set_records(records)
 
-                # Load the icon for the shortcut
-                shortcut_path = os.path.join(shortcut_dir, file)
-                icon_path = self.get_icon_path(shortcut_path)
-                if not icon_path or not os.path.exists(icon_path):
-                    icon_path = self.default_icon_path  # Use default icon if specific icon is missing
-                icon_image = Image.open(icon_path)
-                icon_image = icon_image.resize((64, 64), Image.LANCZOS)
-                icon_photo = ImageTk.PhotoImage(icon_image)
-
-                bard_button = ttk.Checkbutton(self.bard_buttons_frame, image=icon_photo, text=bard_name, variable=var, compound='top')
-                bard_button.image = icon_photo  # Keep a reference to avoid garbage collection
-                bard_button.grid(row=row, column=col, padx=10, pady=10)
-                Hovertip(bard_button, bard_name)
-
-                # Bind right-click to show context menu
-                bard_button.bind("<Button-3>", lambda event, name=bard_name: self.show_context_menu(event, name))
-
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-        else:
-            # List view
-            row = 0
-            for file in os.listdir(shortcut_dir):
-                bard_name = file.split(".")[0]
-                var = tk.BooleanVar()
-                if checkbutton_states and bard_name in checkbutton_states:
-                    var.set(checkbutton_states[bard_name])
-                checkbutton = ttk.Checkbutton(self.bard_buttons_frame, text=bard_name, variable=var)
-                checkbutton.grid(row=row, column=0, padx=5, pady=5, sticky="w")
-                self.bard_checkbuttons[bard_name] = var
-
-                bard_button = ttk.Button(self.bard_buttons_frame, text=f"Launch {bard_name}", command=lambda name=bard_name: self.launch_bard(self.shortcut_dir_entry.get(), name))
-                bard_button.grid(row=row, column=1, padx=5, pady=5)
-                Hovertip(bard_button, f'Launch the shortcut for {bard_name}')
-                copy_button = ttk.Button(self.bard_buttons_frame, text=f"Copy Config for {bard_name}", command=lambda name=bard_name: self.copy_config(name))
-                copy_button.grid(row=row, column=2, padx=5, pady=5)
-                Hovertip(copy_button, f'Copy the config for {bard_name}')
-                row += 1
+    def load_bard_icon(self, icon_path):
+        try:
+            return self.thumbnail_cache.get(icon_path, (64, 64))
+        except OSError:
+            # Not an image Pillow can read (e.g. an .exe icon location)
+            return self.thumbnail_cache.get(self.default_icon_path, (64, 64))
+
+    def create_grid_cell(self, parent):
+        cell = {}
+        cell["frame"] = bard_button = ttk.Checkbutton(parent, compound='top')
+        cell["tip"] = Hovertip(bard_button, "")
+
+        # Bind right-click to show context menu
+        bard_button.bind("<Button-3>", lambda event: self.show_context_menu(event, cell["record"].name))
+        return cell
+
+    def fill_grid_cell(self, cell, record):
+        icon_photo = self.load_bard_icon(record.icon_path)
+        label = record.name if record.state == "stopped" else f"{record.name}\n({record.state})"
+        if record.usage:
+            label = f"{label}\n{record.usage}"
+        cell["frame"].configure(image=icon_photo, text=label, variable=self.bard_checkbuttons[record.name])
+        cell["frame"].image = icon_photo  # Keep a reference to avoid garbage collection
+        cell["tip"].text = f"{record.name}: {record.state}"
+
+    def create_list_cell(self, parent):
+        cell = {}
+        cell["frame"] = frame = ttk.Frame(parent)
+        cell["checkbutton"] = ttk.Checkbutton(frame, width=20)
+        cell["checkbutton"].grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        cell["launch_button"] = ttk.Button(frame, width=28, command=lambda: self.launch_bard(cell["record"].name))
+        cell["launch_button"].grid(row=0, column=1, padx=5, pady=5)
+        cell["launch_tip"] = Hovertip(cell["launch_button"], "")
+        cell["copy_button"] = ttk.Button(frame, width=32, command=lambda: self.copy_config(cell["record"].name))
+        cell["copy_button"].grid(row=0, column=2, padx=5, pady=5)
+        cell["copy_tip"] = Hovertip(cell["copy_button"], "")
+        cell["state_label"] = ttk.Label(frame, width=32)
+        cell["state_label"].grid(row=0, column=3, padx=5, pady=5, sticky="w")
+        return cell
+
+    def fill_list_cell(self, cell, record):
+        bard_name = record.name
+        cell["checkbutton"].configure(text=bard_name, variable=self.bard_checkbuttons[bard_name])
+        cell["launch_button"].configure(text=f"Launch {bard_name}")
+        cell["launch_tip"].text = f'Launch the shortcut for {bard_name}'
+        cell["copy_button"].configure(text=f"Copy Config for {bard_name}")
+        cell["copy_tip"].text = f'Copy the config for {bard_name}'
+        cell["state_label"].configure(text=f"{record.state.capitalize()}  {record.usage.replace(chr(10), '  ')}".rstrip())
 
     def get_icon_path(self, shortcut_path):
-        try:
-            shell = Dispatch('WScript.Shell')
-            shortcut = shell.CreateShortCut(shortcut_path)
-            icon_path = shortcut.IconLocation.split(',')[0]
-            return icon_path
-        except Exception as e:
-            self.status_text.insert(tk.END, f"Error retrieving icon: {e}\n")
+        shortcut_info = self.shortcut_index.get(shortcut_path)
+        if shortcut_info["error"]:
+            self.log(f"Error retrieving icon: {shortcut_info['error']}", "WARNING")
             return ''
+        return shortcut_info["icon_location"].split(',')[0]
 
     def toggle_dark_mode(self):
         if self.dark_mode_var.get():
@@ -461,9 +4474,181 @@ class BardLauncherGUI:
         self.start_selected_pressed = True
         self.start_selected_process()
 
+    def confirm_start_profile_process(self):
+        name = self.profile_var.get()
+        if not name:
+            messagebox.showerror("Error", "Please choose a profile.")
+            return
+        if self.start_profile_pressed == name:
+            if not messagebox.askokcancel("Confirm", f"Profile {name} has already been started. Do you want to run it again?"):
+                return
+        self.start_profile_pressed = name
+        self.start_profile_process(name)
+
+    def start_profile_process(self, name):
+        try:
+            delay = max(10, int(self.delay_entry.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number for the delay.")
+            return
+        settings = self.current_settings(delay)
+        if not settings["config_dir"] or not settings["shortcut_dir"]:
+            messagebox.showerror("Error", "Please select both directories.")
+            return
+        self.save_config(**settings)
+        self.run_launch(lambda: self.engine.start_profile(name))
+
+    def select_profile(self, name):
+        # Switching only ticks the profile's bards; its plan is already compiled
+        profile = self.profiles.get(name)
+        if profile is None:
+            return
+        bards = set(profile.get("bards", []))
+        for bard_name, var in self.bard_checkbuttons.items():
+            var.set(bard_name in bards)
+        missing = [bard_name for bard_name in profile.get("bards", []) if bard_name not in self.bard_checkbuttons]
+        if missing:
+            self.log(f"Profile {name}: no shortcut for {', '.join(missing)}.", "WARNING")
+        self.log(f"Switched to profile {name} ({len(bards) - len(missing)} bards).")
+        self.save_profiles()
+
+    def save_profiles(self):
+        try:
+            delay = max(10, int(self.delay_entry.get()))
+        except ValueError:
+            delay = self.engine.delay
+        self.save_config(**self.current_settings(delay))
+        threading.Thread(target=self.engine.compile_plans, name="CompilePlans", daemon=True).start()
+
+    def show_profiles(self):
+        # Each profile is a bard order, delays after individual bards and
+        # whether to start LightAmp. Changes are kept in the dialog until Save.
+        window = tk.Toplevel(self.root)
+        window.title("Launch Profiles")
+        state = {"bards": [], "delays": {}}
+
+        ttk.Label(window, text="Profile").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        name_var = tk.StringVar(value=self.profile_var.get())
+        name_combobox = ttk.Combobox(window, textvariable=name_var, width=30, postcommand=lambda: name_combobox.configure(values=sorted(self.profiles)))
+        name_combobox.grid(row=0, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+        Hovertip(name_combobox, 'Pick a profile to change, or type a new name')
+
+        bards_list = tk.Listbox(window, height=14, width=36, exportselection=False)
+        bards_list.grid(row=1, column=0, columnspan=2, rowspan=6, padx=5, pady=5, sticky="nsew")
+        window.grid_rowconfigure(6, weight=1)
+        window.grid_columnconfigure(1, weight=1)
+
+        lightamp_var = tk.BooleanVar()
+        ttk.Checkbutton(window, text="Start LightAmp", variable=lightamp_var).grid(row=7, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        ttk.Label(window, text="Delay after (s)").grid(row=8, column=0, padx=5, pady=5, sticky="e")
+        delay_entry = ttk.Entry(window, width=7)
+        delay_entry.grid(row=8, column=1, padx=5, pady=5, sticky="w")
+        Hovertip(delay_entry, 'Seconds to wait after the selected bard (minimum 10). Leave empty to use the Seconds Delay setting.')
+
+        def render(select=None):
+            bards_list.delete(0, tk.END)
+            for bard_name in state["bards"]:
+                delay = state["delays"].get(bard_name)
+                bards_list.insert(tk.END, f"{bard_name}  ({delay}s)" if delay else bard_name)
+            if select is not None and 0 <= select < len(state["bards"]):
+                bards_list.selection_set(select)
+                bards_list.see(select)
+                show_delay()
+
+        def load(*args):
+            profile = self.profiles.get(name_var.get(), {})
+            state["bards"] = list(profile.get("bards", []))
+            state["delays"] = dict(profile.get("delays", {}))
+            lightamp_var.set(profile.get("lightamp", self.lightamp_settings()[0]))
+            render()
+
+        def selected_index():
+            selection = bards_list.curselection()
+            return selection[0] if selection else None
+
+        def show_delay(*args):
+            index = selected_index()
+            delay_entry.delete(0, tk.END)
+            if index is not None:
+                delay_entry.insert(0, str(state["delays"].get(state["bards"][index], "")))
+
+        def set_delay(*args):
+            index = selected_index()
+            if index is None:
+                return
+            value = delay_entry.get().strip()
+            bard_name = state["bards"][index]
+            if not value:
+                state["delays"].pop(bard_name, None)
+            else:
+                try:
+                    state["delays"][bard_name] = max(10, int(value))
+                except ValueError:
+                    messagebox.showerror("Error", "Please enter a valid number for the delay.", parent=window)
+                    return
+            render(index)
+
+        def move(step):
+            index = selected_index()
+            if index is None or not 0 <= index + step < len(state["bards"]):
+                return
+            bards = state["bards"]
+            bards[index], bards[index + step] = bards[index + step], bards[index]
+            render(index + step)
+
+        def remove():
+            index = selected_index()
+            if index is None:
+                return
+            state["delays"].pop(state["bards"].pop(index), None)
+            render(min(index, len(state["bards"]) - 1))
+
+        def add_selected():
+            # Ticked bards that aren't in the profile yet go at the end, in list order
+            added = [bard_name for bard_name, var in self.bard_checkbuttons.items() if var.get() and bard_name not in state["bards"]]
+            state["bards"].extend(added)
+            render()
+
+        def save():
+            name = name_var.get().strip()
+            if not name:
+                messagebox.showerror("Error", "Please enter a profile name.", parent=window)
+                return
+            if not state["bards"]:
+                messagebox.showerror("Error", "A profile needs at least one bard.", parent=window)
+                return
+            self.profiles[name] = {"bards": list(state["bards"]), "delays": {bard_name: delay for bard_name, delay in state["delays"].items() if bard_name in state["bards"]}, "lightamp": lightamp_var.get()}
+            self.profile_var.set(name)
+            self.log(f"Saved profile {name} ({len(state['bards'])} bards).")
+            self.select_profile(name)
+
+        def delete():
+            name = name_var.get().strip()
+            if name not in self.profiles or not messagebox.askokcancel("Delete Profile", f"Delete profile {name}?", parent=window):
+                return
+            del self.profiles[name]
+            if self.profile_var.get() == name:
+                self.profile_var.set("")
+            name_var.set("")
+            load()
+            self.log(f"Deleted profile {name}.")
+            self.save_profiles()
+
+        bards_list.bind("<<ListboxSelect>>", show_delay)
+        delay_entry.bind("<Return>", set_delay)
+        delay_entry.bind("<FocusOut>", set_delay)
+        name_combobox.bind("<<ComboboxSelected>>", load)
+        buttons = ttk.Frame(window)
+        buttons.grid(row=1, column=2, rowspan=6, padx=5, pady=5, sticky="n")
+        for text, command in (("Up", lambda: move(-1)), ("Down", lambda: move(1)), ("Remove", remove), ("Add Selected Bards", add_selected)):
+            ttk.Button(buttons, text=text, command=command).pack(fill="x", pady=2)
+        ttk.Button(window, text="Save", command=save).grid(row=9, column=0, padx=5, pady=5, sticky="ew")
+        ttk.Button(window, text="Delete", command=delete).grid(row=9, column=1, padx=5, pady=5, sticky="w")
+        ttk.Button(window, text="Close", command=window.destroy).grid(row=9, column=2, padx=5, pady=5, sticky="e")
+        load()
+
     def start_all_process(self):
-        self.start_process(selected_only=False)
-        self.create_dynamic_buttons()
+        self.start_process(selected_only=False, after_run=self.create_dynamic_buttons)
 
     def start_selected_process(self):
         self.start_process(selected_only=True)
@@ -471,7 +4656,7 @@ class BardLauncherGUI:
     def create_dynamic_buttons(self):
         self.populate_shortcuts()
 
-    def start_process(self, selected_only):
+    def start_process(self, selected_only, after_run=None):
         config_dir = self.config_dir_entry.get()
         shortcut_dir = self.shortcut_dir_entry.get()
         try:
@@ -485,81 +4670,143 @@ class BardLauncherGUI:
             return
 
         # Save paths and checkbox states to config file
-        self.save_config(config_dir, shortcut_dir, delay, self.dark_mode_var.get(), {k: v.get() for k, v in self.bard_checkbuttons.items()}, self.lightamp_check_var.get(), self.lightamp_entry.get())
-
-        config_file = os.path.join(os.path.expanduser('~'), "Documents", "My Games", "FINAL FANTASY XIV - A Realm Reborn", "FFXIV.cfg")
-        self.status_text.insert(tk.END, "Starting process...\n")
+        settings = self.current_settings(delay)
+        self.save_config(**settings)
 
+        self.populate_shortcuts()  # Pick up anything the watcher hasn't reported yet
         selected_bards = [bard_name for bard_name, var in self.bard_checkbuttons.items() if not selected_only or var.get()]
-        self.progress_bar["maximum"] = len(selected_bards)
 
-        if self.lightamp_check_var.get():
-            self.start_lightamp()
+        if self.engine.is_running():
+            messagebox.showerror("Error", "A launch is already in progress.")
+            return
 
-        for i, bard_name in enumerate(selected_bards, start=1):
-            self.status_text.insert(tk.END, f"Working on Bard {bard_name}.\n")
+        self.engine.settings = settings
+        if settings["lightamp_check"] and self.engine.start_lightamp() == "invalid_path":
+            messagebox.showerror("Error", "Invalid LightAmp.exe file path")
+        self.run_launch(lambda: self.engine.start_run(selected_bards, lightamp=False), after_run)
 
-            config_file_path = os.path.join(config_dir, f"{bard_name}.cfg")
-            if os.path.isfile(config_file_path):
-                self.status_text.insert(tk.END, f"Found a config file for {bard_name}. Copying to FFXIV config {config_file}.\n")
-                shutil.copy2(config_file_path, config_file)
-                self.status_text.insert(tk.END, "Done.\n")
-            else:
-                self.status_text.insert(tk.END, f"Did not find a config file at {config_file_path} for {bard_name}\n")
+    def current_settings(self, delay):
+        backup_keep, backup_max_age_days = self.backup_retention()
+        lightamp_check, lightamp_location = self.lightamp_settings()
+        return {
+            "config_dir": self.config_dir_entry.get(),
+            "shortcut_dir": self.shortcut_dir_entry.get(),
+            "delay": delay,
+            "dark_mode": self.dark_mode_var.get(),
+            "bard_checkbuttons": {k: v.get() for k, v in self.bard_checkbuttons.items()},
+            "lightamp_check": lightamp_check,
+            "lightamp_location": lightamp_location,
+            "adaptive_delay": self.adaptive_delay_var.get(),
+            "backup_keep": backup_keep,
+            "backup_max_age_days": backup_max_age_days,
+            "admission": self.admission_settings(),
+            "monitor": self.monitor_settings(),
+            "placement": self.placement_settings(),
+            "bard_placement": {bard_name: placement for bard_name, placement in self.bard_placement.items() if bard_name in self.bard_checkbuttons},
+            "profiles": self.profiles,
+            "active_profile": self.profile_var.get()
+        }
 
-            self.launch_bard(shortcut_dir, bard_name)
-            self.progress_bar["value"] = i
-            self.root.update_idletasks()
+    def set_section_settings(self, settings):
+        # Takes the values for the sections build_settings_sections makes from
+        # saved settings; they are shown at once if the sections are built
+        self.section_values = {
+            "backup_keep": settings.get('backup_keep', BACKUP_KEEP),
+            "backup_max_age_days": settings.get('backup_max_age_days', BACKUP_MAX_AGE_DAYS),
+            "admission": dict(ADMISSION_DEFAULTS, **(settings.get('admission') or {})),
+            "monitor": dict(MONITOR_DEFAULTS, **(settings.get('monitor') or {})),
+            "placement": dict(PLACEMENT_DEFAULTS, **(settings.get('placement') or {})),
+            "lightamp_check": settings.get('lightamp_check', False),
+            "lightamp_location": settings.get('lightamp_location', '')
+        }
+        if self.settings_sections_built:
+            self.show_section_settings()
 
-        self.status_text.insert(tk.END, "All Done!\n")
+    def show_section_settings(self):
+        values = self.section_values
+        self.backup_keep_entry.delete(0, tk.END)
+        self.backup_keep_entry.insert(0, str(values["backup_keep"]))
+        self.backup_age_entry.delete(0, tk.END)
+        self.backup_age_entry.insert(0, str(values["backup_max_age_days"]))
+        self.admission_var.set(values["admission"]["enabled"])
+        for key, entry in self.admission_entries.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, str(values["admission"][key]))
+        for key, entry in self.monitor_entries.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, str(values["monitor"][key]))
+        placement = values["placement"]
+        self.placement_var.set(placement["enabled"])
+        self.reserved_cores_entry.delete(0, tk.END)
+        self.reserved_cores_entry.insert(0, str(placement["reserved_cores"]))
+        self.placement_priority_var.set(placement["priority"])
+        self.lead_bard_var.set(placement["lead_bard"])
+        self.lightamp_check_var.set(values["lightamp_check"])
+        self.lightamp_entry.delete(0, tk.END)
+        self.lightamp_entry.insert(0, values["lightamp_location"])
 
-    def start_lightamp(self):
-        # Check if LightAmp is already running
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] == 'LightAmp.exe':
-                self.status_text.insert(tk.END, "LightAmp is already running.\n")
-                return
+    def lightamp_settings(self):
+        if not self.settings_sections_built:
+            return self.section_values["lightamp_check"], self.section_values["lightamp_location"]
+        return self.lightamp_check_var.get(), self.lightamp_entry.get()
 
-        # Start LightAmp
-        lightamp_path = self.lightamp_entry.get()
-        if not os.path.isfile(lightamp_path):
-            messagebox.showerror("Error", "Invalid LightAmp.exe file path")
-            return
+    def monitor_settings(self):
+        # Falls back to the defaults for anything that isn't a positive number
+        if not self.settings_sections_built:
+            return dict(self.section_values["monitor"])
+        monitor = {}
+        for key, entry in self.monitor_entries.items():
+            try:
+                value = float(entry.get())
+            except ValueError:
+                value = 0
+            monitor[key] = value if value > 0 else MONITOR_DEFAULTS[key]
+        return monitor
 
+    def placement_settings(self):
+        # Reserved cores may be 0; anything else that isn't a number falls back to the default
+        if not self.settings_sections_built:
+            return dict(self.section_values["placement"])
         try:
-            os.startfile(lightamp_path)
-            self.status_text.insert(tk.END, "Started LightAmp.\n")
-        except Exception as e:
-            self.status_text.insert(tk.END, f"Failed to start LightAmp. Error: {e}\n")
+            reserved_cores = max(0, int(self.reserved_cores_entry.get()))
+        except ValueError:
+            reserved_cores = PLACEMENT_DEFAULTS["reserved_cores"]
+        return {
+            "enabled": self.placement_var.get(),
+            "reserved_cores": reserved_cores,
+            "lead_bard": self.lead_bard_var.get(),
+            "priority": self.placement_priority_var.get() or PLACEMENT_DEFAULTS["priority"]
+        }
 
-    def launch_bard(self, shortcut_dir, bard_name):
-        self.status_text.insert(tk.END, f"Starting FFXIV for {bard_name}...\n")
-        shortcut_path = os.path.join(shortcut_dir, f"{bard_name}.lnk")
-        
-        if not self.is_valid_xivlauncher_shortcut(shortcut_path):
-            self.status_text.insert(tk.END, f"Invalid shortcut for {bard_name}. Skipping.\n")
-            return
-        
-        try:
-            os.startfile(shortcut_path)
-        except Exception as e:
-            self.status_text.insert(tk.END, f"Failed to launch the shortcut for {bard_name}. Error: {e}\n")
-        else:
-            self.status_text.insert(tk.END, f"Successfully launched FFXIV for {bard_name}.\n")
-        self.root.update()
-        time.sleep(max(10, int(self.delay_entry.get())))
+    def admission_settings(self):
+        # Falls back to the defaults for anything that isn't a positive number
+        if not self.settings_sections_built:
+            return dict(self.section_values["admission"])
+        admission = {"enabled": self.admission_var.get()}
+        for key, entry in self.admission_entries.items():
+            try:
+                value = int(entry.get())
+            except ValueError:
+                value = 0
+            admission[key] = value if value > 0 else ADMISSION_DEFAULTS[key]
+        return admission
 
-    def is_valid_xivlauncher_shortcut(self, shortcut_path):
-        try:
-            shell = Dispatch('WScript.Shell')
-            shortcut = shell.CreateShortCut(shortcut_path)
-            target_path = shortcut.TargetPath
-            # Replace with the actual path to XIVLauncher.exe on your system
-            expected_path = os.path.expanduser(r"~\AppData\Local\XIVLauncher\XIVLauncher.exe")
-            return os.path.samefile(target_path, expected_path)
-        except Exception as e:
-            self.status_text.insert(tk.END, f"Error verifying shortcut: {e}\n")
-            return False
+    def backup_retention(self):
+        # Falls back to the defaults for anything that isn't a positive number
+        if not self.settings_sections_built:
+            return [self.section_values["backup_keep"], self.section_values["backup_max_age_days"]]
+        retention = []
+        for entry, default in ((self.backup_keep_entry, BACKUP_KEEP), (self.backup_age_entry, BACKUP_MAX_AGE_DAYS)):
+            try:
+                value = int(entry.get())
+            except ValueError:
+                value = default
+            retention.append(value if value > 0 else default)
+        return retention
+
+    def launch_bard(self, bard_name):
+        self.engine.settings = self.current_settings(self.engine.delay)
+        self.run_launch(lambda: self.engine.launch_single(bard_name))
 
     def copy_config(self, bard_name):
         config_dir = self.config_dir_entry.get()
@@ -567,23 +4814,257 @@ class BardLauncherGUI:
             messagebox.showerror("Error", "Please select the config directory.")
             return
         
-        config_file = os.path.join(os.path.expanduser('~'), "Documents", "My Games", "FINAL FANTASY XIV - A Realm Reborn", "FFXIV.cfg")
-        new_config_file_path = os.path.join(config_dir, f"{bard_name}.cfg")
+        config_file = FFXIV_CONFIG_FILE
+        configs = BardConfigs(config_dir)
+        new_config_file_path = configs.full_path(bard_name)
         
         if messagebox.askokcancel("Confirm Copy", f"Are you sure you want to copy the config for {bard_name}?"):
-            backup_dir = os.path.join(config_dir, "backup")
-            os.makedirs(backup_dir, exist_ok=True)
-            if os.path.isfile(new_config_file_path):
-                backup_file_path = os.path.join(backup_dir, f"{bard_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.cfg")
-                shutil.move(new_config_file_path, backup_file_path)
-                self.status_text.insert(tk.END, f"Moved existing config to backup: {backup_file_path}\n")
-            
-            self.status_text.insert(tk.END, f"Copying config file to {new_config_file_path}...\n")
+            try:
+                existing_data = configs.read(bard_name)[1]
+            except FileNotFoundError:
+                existing_data = None
+            except (OSError, ValueError) as e:
+                self.log(f"Failed to read the existing config. Not copying. Error: {e}", "ERROR", bard_name)
+                return
+            if existing_data is not None:
+                store = self.open_backup_store(config_dir)
+                try:
+                    entry = store.add(bard_name, existing_data)
+                    keep, max_age_days = self.backup_retention()
+                    store.prune(keep, max_age_days)
+                except OSError as e:
+                    self.log(f"Failed to back up the existing config. Not copying. Error: {e}", "ERROR", bard_name)
+                    return
+                if entry is not None:
+                    self.log(f"Backed up the existing config as {entry['hash'][:12]}.", bard=bard_name)
+                else:
+                    self.log("The existing config is already backed up.", bard=bard_name)
+
+            if configs.has_delta(bard_name):
+                new_config_file_path = configs.delta_path(bard_name)
+            self.log(f"Copying config file to {new_config_file_path}...", bard=bard_name)
             if os.path.isfile(config_file):
-                shutil.copy2(config_file, new_config_file_path)
-                self.status_text.insert(tk.END, "Config file copied successfully.\n")
+                try:
+                    if configs.has_delta(bard_name):
+                        # Only the settings that differ from default.cfg are kept
+                        with open(config_file, 'rb') as f:
+                            configs.save(bard_name, f.read())
+                    else:
+                        self.engine.config_swapper.swap(config_file, target=new_config_file_path)
+                except (OSError, ValueError) as e:
+                    self.log(f"Failed to copy the config file. Error: {e}", "ERROR", bard_name)
+                    return
+                self.log("Config file copied successfully.", bard=bard_name)
+            else:
+                self.log(f"Did not find a config file at {config_file}", "WARNING", bard_name)
+
+    def open_backup_store(self, config_dir):
+        store = BackupStore(os.path.join(config_dir, "backup"))
+        try:
+            imported = store.import_legacy()
+        except OSError as e:
+            self.log(f"Failed to move old config backups into the backup store. Error: {e}", "WARNING")
+            imported = 0
+        if imported:
+            self.log(f"Moved {imported} old config backups into the backup store.")
+        return store
+
+    def show_backups(self, bard_name):
+        config_dir = self.config_dir_entry.get()
+        if not config_dir:
+            messagebox.showerror("Error", "Please select the config directory.")
+            return
+        store = self.open_backup_store(config_dir)
+        configs = BardConfigs(config_dir)
+        config_path = configs.full_path(bard_name)
+
+        def current_data():
+            # The merged config for a bard with a delta, otherwise None to read config_path
+            if not configs.has_delta(bard_name):
+                return None
+            return configs.read(bard_name)[1]
+
+        window = tk.Toplevel(self.root)
+        window.title(f"Config Backups - {bard_name}")
+        tree = ttk.Treeview(window, columns=("when", "hash", "size"), show="headings", height=10)
+        for column, heading, width in (("when", "Backed Up", 160), ("hash", "Content", 120), ("size", "Size", 90)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="e" if column == "size" else "w")
+        tree.grid(row=0, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        window.grid_rowconfigure(0, weight=1)
+        window.grid_columnconfigure(2, weight=1)
+
+        def fill():
+            tree.delete(*tree.get_children())
+            for entry in store.list(bard_name):
+                tree.insert("", tk.END, iid=f"{entry['timestamp']}:{entry['hash']}", values=(datetime.fromtimestamp(entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S'), entry['hash'][:12], f"{entry['size']} bytes"))
+
+        def selected_hash():
+            selection = tree.selection()
+            if not selection:
+                messagebox.showerror("Error", "Please select a backup.", parent=window)
+                return None
+            return selection[0].split(":", 1)[1]
+
+        def show_diff():
+            digest = selected_hash()
+            if digest is None:
+                return
+            diff_window = tk.Toplevel(window)
+            diff_window.title(f"{bard_name}: backup {digest[:12]} -> current")
+            diff_text = scrolledtext.ScrolledText(diff_window, width=100, height=30)
+            diff_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            try:
+                diff = store.diff(digest, config_path, current_data()) or "No differences."
+            except (OSError, ValueError, zlib.error) as e:
+                diff = f"Failed to compare with the current config. Error: {e}"
+            diff_text.insert(tk.END, diff)
+            diff_text.config(state="disabled")
+
+        def restore():
+            digest = selected_hash()
+            if digest is None:
+                return
+            if not messagebox.askokcancel("Confirm Restore", f"Replace the config for {bard_name} with backup {digest[:12]}? The current config is backed up first.", parent=window):
+                return
+            try:
+                if configs.has_delta(bard_name):
+                    store.add(bard_name, current_data())
+                    configs.save(bard_name, store.read(digest))
+                else:
+                    store.restore(bard_name, digest, config_path)
+            except (OSError, ValueError, zlib.error) as e:
+                self.log(f"Failed to restore backup {digest[:12]}. Error: {e}", "ERROR", bard_name)
+                return
+            self.log(f"Restored backup {digest[:12]}.", bard=bard_name)
+            fill()
+
+        ttk.Button(window, text="Diff With Current", command=show_diff).grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+        ttk.Button(window, text="Restore", command=restore).grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Button(window, text="Close", command=window.destroy).grid(row=1, column=2, padx=5, pady=5, sticky="e")
+        fill()
+
+    def selected_config_bards(self):
+        # Returns (configs, bard names), or None after telling the user what's missing
+        config_dir = self.config_dir_entry.get()
+        if not config_dir:
+            messagebox.showerror("Error", "Please select the config directory.")
+            return None
+        bards = [bard_name for bard_name, var in self.bard_checkbuttons.items() if var.get()]
+        if not bards:
+            messagebox.showerror("Error", "Please select at least one bard.")
+            return None
+        return BardConfigs(config_dir), bards
+
+    def log_config_results(self, results, action):
+        counts = {}
+        for bard_name, result in results.items():
+            if result.startswith("Error: "):
+                self.log(f"{action} failed. {result[len('Error: '):]}", "ERROR", bard_name)
+                result = "failed"
+            counts[result] = counts.get(result, 0) + 1
+        self.log(f"{action}: " + ", ".join(f"{count} {result}" for result, count in counts.items()) + ".")
+
+    def convert_selected_configs(self):
+        selection = self.selected_config_bards()
+        if selection is None:
+            return
+        configs, bards = selection
+        if not os.path.isfile(configs.base_path):
+            messagebox.showerror("Error", f"Did not find a base config at {configs.base_path}.")
+            return
+        if not messagebox.askokcancel("Confirm Convert", f"Keep only the settings that differ from {CONFIG_BASE_NAME} for {len(bards)} bards? Their full configs are backed up first."):
+            return
+        store = self.open_backup_store(configs.config_dir)
+        try:
+            results = configs.convert(bards, store)
+            keep, max_age_days = self.backup_retention()
+            store.prune(keep, max_age_days)
+        except OSError as e:
+            self.log(f"Failed to back up the configs. Nothing was converted. Error: {e}", "ERROR")
+            return
+        self.log_config_results(results, "Convert")
+
+    def show_set_config_value(self):
+        selection = self.selected_config_bards()
+        if selection is None:
+            return
+        configs, bards = selection
+        try:
+            known = configs.base().settings()
+        except (OSError, ValueError):
+            known = {}
+        window = tk.Toplevel(self.root)
+        window.title(f"Set Config Value - {len(bards)} bards")
+        ttk.Label(window, text="Section").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        section_var = tk.StringVar()
+        section_combobox = ttk.Combobox(window, textvariable=section_var, values=[""] + list(known), width=30)
+        section_combobox.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        Hovertip(section_combobox, 'Leave empty to find the key in each config')
+        ttk.Label(window, text="Key").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        key_var = tk.StringVar()
+        key_combobox = ttk.Combobox(window, textvariable=key_var, width=30, postcommand=lambda: key_combobox.configure(values=list(known.get(section_var.get(), {})) if section_var.get() else sorted({key for keys in known.values() for key in keys})))
+        key_combobox.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(window, text="Value").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        value_entry = ttk.Entry(window, width=32)
+        value_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+
+        def apply():
+            key = key_var.get().strip()
+            if not key or "\t" in key:
+                messagebox.showerror("Error", "Please enter a key.", parent=window)
+                return
+            value = value_entry.get()
+            if not messagebox.askokcancel("Confirm Set", f"Set {key} to {value!r} for {len(bards)} bards? The configs are backed up first.", parent=window):
+                return
+            store = self.open_backup_store(configs.config_dir)
+            try:
+                results = configs.set_key(bards, section_var.get().strip() or None, key, value, store)
+                keep, max_age_days = self.backup_retention()
+                store.prune(keep, max_age_days)
+            except OSError as e:
+                self.log(f"Failed to back up the configs. Nothing was changed. Error: {e}", "ERROR")
+                return
+            self.log_config_results(results, f"Set {key}")
+            window.destroy()
+
+        ttk.Button(window, text="Apply", command=apply).grid(row=3, column=0, padx=5, pady=5, sticky="ew")
+        ttk.Button(window, text="Cancel", command=window.destroy).grid(row=3, column=1, padx=5, pady=5, sticky="e")
+
+    def show_placement(self, bard_name):
+        # Per-bard CPUs and priority; left empty, the bard gets the planned ones
+        placement = self.bard_placement.get(bard_name, {})
+        load_psutil()
+        window = tk.Toplevel(self.root)
+        window.title(f"CPU Placement - {bard_name}")
+        ttk.Label(window, text="CPUs").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        cpus_entry = ttk.Entry(window, width=20)
+        cpus_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        cpus_entry.insert(0, ",".join(map(str, placement.get("cpus") or [])))
+        Hovertip(cpus_entry, f'Comma-separated logical CPU numbers, 0 to {(psutil.cpu_count() or 1) - 1}. Leave empty to use the planned cores.')
+        ttk.Label(window, text="Priority").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        priority_var = tk.StringVar(value=placement.get("priority") or "")
+        ttk.Combobox(window, textvariable=priority_var, values=("",) + PRIORITY_LEVELS, state="readonly", width=12).grid(row=1, column=1, padx=5, pady=5, sticky="w")
+
+        def save():
+            try:
+                cpus = sorted({int(cpu) for cpu in cpus_entry.get().replace(" ", "").split(",") if cpu})
+            except ValueError:
+                messagebox.showerror("Error", "CPUs must be a comma-separated list of numbers.", parent=window)
+                return
+            if any(cpu < 0 or cpu >= (psutil.cpu_count() or 1) for cpu in cpus):
+                messagebox.showerror("Error", f"This machine has CPUs 0 to {(psutil.cpu_count() or 1) - 1}.", parent=window)
+                return
+            if cpus or priority_var.get():
+                self.bard_placement[bard_name] = {"cpus": cpus, "priority": priority_var.get()}
             else:
-                self.status_text.insert(tk.END, f"Did not find a config file at {config_file}\n")
+                self.bard_placement.pop(bard_name, None)
+            self.save_config(**self.current_settings(max(10, int(self.delay_entry.get()))))
+            self.log(f"Saved CPU placement: CPUs {','.join(map(str, cpus)) or 'planned'}, {priority_var.get() or 'default'} priority.", bard=bard_name)
+            window.destroy()
+
+        ttk.Button(window, text="Save", command=save).grid(row=2, column=0, padx=5, pady=5, sticky="ew")
+        ttk.Button(window, text="Cancel", command=window.destroy).grid(row=2, column=1, padx=5, pady=5, sticky="e")
 
     def move_default_config(self):
         config_dir = self.config_dir_entry.get()
@@ -592,20 +5073,26 @@ class BardLauncherGUI:
             return
 
         # Save paths and checkbox states to config file
-        self.save_config(config_dir, self.shortcut_dir_entry.get(), max(10, int(self.delay_entry.get())), self.dark_mode_var.get(), {k: v.get() for k, v in self.bard_checkbuttons.items()}, self.lightamp_check_var.get(), self.lightamp_entry.get())
+        self.save_config(**self.current_settings(max(10, int(self.delay_entry.get()))))
 
-        config_file = os.path.join(os.path.expanduser('~'), "Documents", "My Games", "FINAL FANTASY XIV - A Realm Reborn", "FFXIV.cfg")
         default_config_file_path = os.path.join(config_dir, "default.cfg")
 
-        self.status_text.insert(tk.END, "Moving default config file...\n")
+        self.log("Moving default config file...")
 
         if os.path.isfile(default_config_file_path):
-            shutil.copy2(default_config_file_path, config_file)
-            self.status_text.insert(tk.END, "Default config file moved successfully.\n")
+            try:
+                result = self.engine.config_swapper.swap(default_config_file_path)
+            except OSError as e:
+                self.log(f"Failed to move the default config file. Error: {e}", "ERROR")
+                return
+            if result == "unchanged":
+                self.log("FFXIV config already matches the default config file.")
+            else:
+                self.log("Default config file moved successfully.")
         else:
-            self.status_text.insert(tk.END, f"Did not find a default config file at {default_config_file_path}\n")
+            self.log(f"Did not find a default config file at {default_config_file_path}", "WARNING")
 
-    def save_config(self, config_dir, shortcut_dir, delay, dark_mode, bard_checkbuttons, lightamp_check, lightamp_location):
+    def save_config(self, config_dir, shortcut_dir, delay, dark_mode, bard_checkbuttons, lightamp_check, lightamp_location, adaptive_delay=False, backup_keep=BACKUP_KEEP, backup_max_age_days=BACKUP_MAX_AGE_DAYS, admission=None, monitor=None, placement=None, bard_placement=None, profiles=None, active_profile=""):
         config_data = {
             "config_dir": config_dir,
             "shortcut_dir": shortcut_dir,
@@ -613,34 +5100,32 @@ class BardLauncherGUI:
             "dark_mode": dark_mode,
             "bard_checkbuttons": bard_checkbuttons,
             "lightamp_check": lightamp_check,
-            "lightamp_location": lightamp_location
+            "lightamp_location": lightamp_location,
+            "adaptive_delay": adaptive_delay,
+            "backup_keep": backup_keep,
+            "backup_max_age_days": backup_max_age_days,
+            "admission": admission or dict(ADMISSION_DEFAULTS),
+            "monitor": monitor or dict(MONITOR_DEFAULTS),
+            "placement": placement or dict(PLACEMENT_DEFAULTS),
+            "bard_placement": bard_placement or {},
+            "profiles": profiles or {},
+            "active_profile": active_profile
         }
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config_data, f)
+        self.settings_store.save(config_data)
+        self.engine.settings = config_data
+        self.engine.apply_monitor_settings()
+        self.engine.place_all()
 
     def load_config(self):
-        if os.path.isfile(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+        return self.settings_store.load()
 
     def clear_status(self):
+        self.status_log.clear()
         self.status_text.delete(1.0, tk.END)
 
     def save_settings(self):
-        self.save_config(
-            self.config_dir_entry.get(),
-            self.shortcut_dir_entry.get(),
-            max(10, int(self.delay_entry.get())),
-            self.dark_mode_var.get(),
-            {k: v.get() for k, v in self.bard_checkbuttons.items()},
-            self.lightamp_check_var.get(),
-            self.lightamp_entry.get()
-        )
-        self.status_text.insert(tk.END, "Settings saved.\n")
+        self.save_config(**self.current_settings(max(10, int(self.delay_entry.get()))))
+        self.log("Settings saved.")
 
     def load_settings(self):
         self.config_data = self.load_config()
@@ -651,15 +5136,19 @@ class BardLauncherGUI:
             self.shortcut_dir_entry.insert(0, self.config_data.get('shortcut_dir', ''))
             self.delay_entry.delete(0, tk.END)
             self.delay_entry.insert(0, str(self.config_data.get('delay', 10)))
+            self.adaptive_delay_var.set(self.config_data.get('adaptive_delay', False))
             self.dark_mode_var.set(self.config_data.get('dark_mode', False))
+            self.set_section_settings(self.config_data)
+            self.bard_placement = self.config_data.get('bard_placement') or {}
+            self.profiles = self.config_data.get('profiles') or {}
+            self.profile_var.set(self.config_data.get('active_profile', ''))
             self.toggle_dark_mode()  # Set theme based on loaded config
             if 'bard_checkbuttons' in self.config_data:
                 self.populate_shortcuts(self.config_data['bard_checkbuttons'])
             else:
                 self.populate_shortcuts()
-            self.lightamp_check_var.set(self.config_data.get('lightamp_check', False))
-            self.lightamp_entry.insert(0, self.config_data.get('lightamp_location', ''))
-        self.status_text.insert(tk.END, "Settings loaded.\n")
+        self.watch_directories()
+        self.log("Settings loaded.")
 
     def reset_configuration(self):
         if messagebox.askokcancel("Reset Configuration", "Are you sure you want to reset the configuration to default settings?"):
@@ -667,19 +5156,24 @@ class BardLauncherGUI:
             self.shortcut_dir_entry.delete(0, tk.END)
             self.delay_entry.delete(0, tk.END)
             self.delay_entry.insert(0, "10")
+            self.adaptive_delay_var.set(False)
             self.dark_mode_var.set(False)
+            self.set_section_settings({})
+            self.bard_placement = {}
+            self.profiles = {}
+            self.profile_var.set("")
             self.toggle_dark_mode()  # Reset to light theme
-            for widget in self.bard_buttons_frame.winfo_children():
-                widget.destroy()
             self.bard_checkbuttons = {}
-            self.lightamp_check_var.set(False)
-            self.lightamp_entry.delete(0, tk.END)
-            self.status_text.insert(tk.END, "Configuration reset to default.\n")
+            self.bard_buttons_frame.set_records([], force=True)
+            self.watch_directories()
+            self.log("Configuration reset to default.")
 
     def show_context_menu(self, event, bard_name):
         context_menu = Menu(self.root, tearoff=0)
-        context_menu.add_command(label="Launch", command=lambda: self.launch_bard(self.shortcut_dir_entry.get(), bard_name))
+        context_menu.add_command(label="Launch", command=lambda: self.launch_bard(bard_name))
         context_menu.add_command(label="Copy Config", command=lambda: self.copy_config(bard_name))
+        context_menu.add_command(label="Config Backups...", command=lambda: self.show_backups(bard_name))
+        context_menu.add_command(label="CPU Placement...", command=lambda: self.show_placement(bard_name))
         context_menu.add_command(label="Change Icon", command=lambda: self.change_icon(bard_name))
         context_menu.add_command(label="Rename", command=lambda: self.rename_shortcut(bard_name))
         context_menu.tk_popup(event.x_root, event.y_root)
@@ -688,10 +5182,11 @@ class BardLauncherGUI:
         file_path = filedialog.askopenfilename(filetypes=[("PNG files", "*.png"), ("All files", "*.*")])
         if file_path:
             shortcut_path = os.path.join(self.shortcut_dir_entry.get(), f"{bard_name}.lnk")
-            shell = Dispatch('WScript.Shell')
-            shortcut = shell.CreateShortCut(shortcut_path)
-            shortcut.IconLocation = file_path
-            shortcut.save()
+            try:
+                update_shortcut(shortcut_path, icon_location=file_path)
+            except Exception as e:
+                self.log(f"Failed to change the icon for {bard_name}. Error: {e}", "ERROR", bard_name)
+                return
             self.populate_shortcuts()
 
     def rename_shortcut(self, bard_name):
@@ -706,14 +5201,275 @@ class BardLauncherGUI:
             os.rename(old_shortcut_path, new_shortcut_path)
 
             config_dir = self.config_dir_entry.get()
-            old_config_path = os.path.join(config_dir, f"{bard_name}.cfg")
-            new_config_path = os.path.join(config_dir, f"{new_name}.cfg")
-            if os.path.exists(old_config_path):
-                os.rename(old_config_path, new_config_path)
+            configs = BardConfigs(config_dir)
+            for old_config_path, new_config_path in ((configs.full_path(bard_name), configs.full_path(new_name)), (configs.delta_path(bard_name), configs.delta_path(new_name))):
+                if os.path.exists(old_config_path):
+                    os.rename(old_config_path, new_config_path)
 
+            # Carry the selection over to the renamed bard
+            if bard_name in self.bard_checkbuttons:
+                self.bard_checkbuttons[new_name] = self.bard_checkbuttons.pop(bard_name)
+            if bard_name in self.bard_placement:
+                self.bard_placement[new_name] = self.bard_placement.pop(bard_name)
+            for profile in self.profiles.values():
+                profile["bards"] = [new_name if name == bard_name else name for name in profile.get("bards", [])]
+                if bard_name in profile.get("delays", {}):
+                    profile["delays"][new_name] = profile["delays"].pop(bard_name)
+            if not self.settings_sections_built:
+                if self.section_values["placement"]["lead_bard"] == bard_name:
+                    self.section_values["placement"]["lead_bard"] = new_name
+            elif self.lead_bard_var.get() == bard_name:
+                self.lead_bard_var.set(new_name)
             self.populate_shortcuts()
 
-if __name__ == "__main__":
+def load_bench():
+    # The benchmarks live in bench.py next to this script and are only loaded
+    # by the bench commands
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("bench", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.py"))
+    bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bench)
+    bench.bl = sys.modules[__name__]
+    return bench
+
+def run_launch_command(args):
+    settings = read_config_file(args.config)
+    if args.delay is not None:
+        settings["delay"] = args.delay
+    if args.adaptive:
+        settings["adaptive_delay"] = True
+    if args.admission is not None:
+        settings["admission"] = dict(settings.get("admission") or {}, enabled=args.admission)
+    if not settings.get("config_dir") or not settings.get("shortcut_dir"):
+        print(f"Both directories must be set in {args.config}; save them from the GUI first.", file=sys.stderr)
+        return 2
+
+    engine = LaunchEngine(settings)
+    only = [name.strip() for name in args.only.split(",") if name.strip()] if args.only else None
+    if args.resume:
+        run = engine.journal.last_run()
+        bards = run["remaining"] if run is not None else []
+    elif args.profile:
+        plan = engine.launch_plan(args.profile)
+        bards = plan.bards if plan is not None else []
+        if plan is None:
+            engine.log(f"There is no profile named {args.profile}.", "ERROR")
+    else:
+        bards = engine.plan(selected_only=not args.all and only is None, only=only)
+
+    def emit(kind, data):
+        if args.json_progress:
+            print(json.dumps({"event": kind, **data}), flush=True)
+
+    def flush_log():
+        for record in engine.status_log.drain():
+            if args.json_progress:
+                emit("log", record._asdict())
+            else:
+                print(StatusLog.format(record), flush=True)
+
+    if not bards:
+        flush_log()
+        print("No bards to launch.", file=sys.stderr)
+        return 1
+
+    lightamp = False if args.no_lightamp else None
+    if args.resume:
+        scheduler = engine.resume_run(dry_run=args.dry_run, lightamp=lightamp)
+    elif args.profile:
+        scheduler = engine.start_profile(args.profile, dry_run=args.dry_run, lightamp=lightamp)
+    else:
+        scheduler = engine.start_run(bards, dry_run=args.dry_run, lightamp=lightamp)
+    result = None
+    while result is None:
+        try:
+            kind, data = engine.events.get(timeout=0.1)
+        except queue.Empty:
+            flush_log()
+            continue
+        except KeyboardInterrupt:
+            engine.log("Cancelling the launch...", "WARNING")
+            scheduler.cancel()
+            continue
+        if kind == "status":
+            engine.log(data["message"], data.get("level", "INFO"), data.get("bard"))
+        else:
+            emit(kind, data)
+        if kind == "finished":
+            engine.log("Launch cancelled." if data["cancelled"] else "All Done!")
+            result = data
+        flush_log()
+    return 1 if result["cancelled"] else 0
+
+def parse_agent_address(text):
+    host, sep, port = text.strip().rpartition(":")
+    if not sep:
+        return text.strip(), AGENT_PORT
+    return host.strip("[]"), int(port)
+
+def run_agent_command(args):
+    settings = read_config_file(args.config)
+    if not settings.get("config_dir") or not settings.get("shortcut_dir"):
+        print(f"Both directories must be set in {args.config}; save them from the GUI first.", file=sys.stderr)
+        return 2
+    if not args.token and args.host not in ("127.0.0.1", "localhost", "::1"):
+        print("An agent that listens on the network needs a --token.", file=sys.stderr)
+        return 2
+
+    engine = LaunchEngine(settings)
+    try:
+        agent = LaunchAgent(engine, args.host, args.port, args.token, args.name, args.config)
+    except OSError as e:
+        print(f"Could not listen on {args.host}:{args.port}. Error: {e}", file=sys.stderr)
+        return 2
+    agent.on_log = lambda record: print(StatusLog.format(record), flush=True)
+    engine.process_registry.start()
+    agent.start()
+    print(f"Agent {agent.name} listening on {agent.address[0]}:{agent.address[1]}. Press Ctrl+C to stop.", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop()
+        engine.process_registry.stop()
+    return 0
+
+def run_orchestrate_command(args):
+    try:
+        addresses = [parse_agent_address(address) for address in args.agents.split(",") if address.strip()]
+    except ValueError:
+        print(f"Agents must be given as host:port, not {args.agents}.", file=sys.stderr)
+        return 2
+    controller = LaunchController(addresses, args.token, args.gap, args.order)
+
+    def flush():
+        while True:
+            try:
+                kind, data = controller.events.get_nowait()
+            except queue.Empty:
+                return None
+            if args.json_progress:
+                print(json.dumps({"event": kind, **data}), flush=True)
+            elif kind == "status":
+                record = LogRecord(data["timestamp"], data["level"], data["bard"], data["message"])
+                print(f"{data['agent'] or '':<16} {StatusLog.format(record)}", flush=True)
+            if kind == "finished":
+                if not args.json_progress:
+                    print("Launch cancelled." if data["cancelled"] else "All Done!", flush=True)
+                return data
+
+    try:
+        controller.connect()
+    except OSError as e:
+        flush()
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        steps, lightamp_agents = controller.plan(args.profile, args.all)
+        if not steps:
+            flush()
+            print("No bards to launch.", file=sys.stderr)
+            return 1
+        threading.Thread(target=controller.run, args=(steps, [] if args.no_lightamp else lightamp_agents, args.dry_run), name="LaunchController", daemon=True).start()
+        result = None
+        while result is None:
+            try:
+                time.sleep(0.1)
+                result = flush()
+            except KeyboardInterrupt:
+                print("Cancelling the launch...", file=sys.stderr)
+                controller.cancel()
+        return 1 if result["cancelled"] else 0
+    finally:
+        controller.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="Bardlauncher2.071.py", description="Bard Launcher. Starts the GUI when run without a command.")
+    commands = parser.add_subparsers(dest="command")
+    launch_parser = commands.add_parser("launch", help="Launch bards without the GUI, using the settings saved in bard_launcher_config.json")
+    which = launch_parser.add_mutually_exclusive_group()
+    which.add_argument("--all", action="store_true", help="Launch every bard in the shortcut directory (default: the bards selected in the GUI)")
+    which.add_argument("--only", metavar="NAMES", help="Comma separated bard names to launch, in this order")
+    which.add_argument("--resume", action="store_true", help="Launch the bards the last run didn't get to, in the same order")
+    which.add_argument("--profile", metavar="NAME", help="Launch a profile saved in the GUI, with its order, delays and LightAmp setting")
+    launch_parser.add_argument("--delay", type=int, help="Seconds between launches (minimum 10)")
+    launch_parser.add_argument("--adaptive", action="store_true", help="Move on as soon as each game is ready, using the delay as the upper bound")
+    launch_parser.add_argument("--admission", action=argparse.BooleanOptionalAction, help="Turn admission control on or off for this run (default: as saved in the settings)")
+    launch_parser.add_argument("--no-lightamp", action="store_true", help="Don't start LightAmp even if it is enabled in the settings")
+    launch_parser.add_argument("--dry-run", action="store_true", help="Check shortcuts and configs and print what would be launched")
+    launch_parser.add_argument("--json-progress", action="store_true", help="Print progress and status as one JSON object per line")
+    launch_parser.add_argument("--config", default=CONFIG_FILE, help="Settings file to use (default: %(default)s)")
+    agent_parser = commands.add_parser("agent", help="Let a controller on another PC launch this PC's bards")
+    agent_parser.add_argument("--host", default=AGENT_HOST, help="Address to listen on; use 0.0.0.0 for every network (default: %(default)s)")
+    agent_parser.add_argument("--port", type=int, default=AGENT_PORT)
+    agent_parser.add_argument("--token", default=os.environ.get("BARD_LAUNCHER_TOKEN", ""), help="Shared secret the controller has to send (default: $BARD_LAUNCHER_TOKEN)")
+    agent_parser.add_argument("--name", help="Name shown by the controller (default: the computer name)")
+    agent_parser.add_argument("--config", default=CONFIG_FILE, help="Settings file to use (default: %(default)s)")
+    orchestrate_parser = commands.add_parser("orchestrate", help="Launch the bards of several PCs running the agent command, in one order")
+    orchestrate_parser.add_argument("--agents", required=True, metavar="HOST:PORT,...", help="The agents to use, in order")
+    orchestrate_parser.add_argument("--token", default=os.environ.get("BARD_LAUNCHER_TOKEN", ""), help="Shared secret of the agents (default: $BARD_LAUNCHER_TOKEN)")
+    which = orchestrate_parser.add_mutually_exclusive_group()
+    which.add_argument("--profile", metavar="NAME", help="Launch this profile on every agent that has it (default: the bards selected on each PC)")
+    which.add_argument("--all", action="store_true", help="Launch every bard of every agent")
+    orchestrate_parser.add_argument("--order", choices=("round-robin", "sequential"), default="round-robin", help="Take one bard from each agent in turn, or all of one agent's bards before the next (default: %(default)s)")
+    orchestrate_parser.add_argument("--gap", type=float, default=ORCHESTRATE_GAP_SECONDS, help="Seconds between any two launches; each PC also waits its own delay between its launches (default: %(default)s)")
+    orchestrate_parser.add_argument("--no-lightamp", action="store_true", help="Don't start LightAmp on any agent")
+    orchestrate_parser.add_argument("--dry-run", action="store_true", help="Check every agent's shortcuts and configs without launching or waiting")
+    orchestrate_parser.add_argument("--json-progress", action="store_true", help="Print progress and status as one JSON object per line")
+    bench_parser = commands.add_parser("bench", help=f"Time the hot paths against synthetic rosters with a stand-in launcher and append the results to {BENCH_FILE}")
+    bench_parser.add_argument("--sizes", default=",".join(map(str, BENCH_SIZES)), help="Comma separated roster sizes (default: %(default)s)")
+    bench_parser.add_argument("--profile", default="instant", help="How the stand-in clients start up: instant, quick or typical (default: %(default)s)")
+    bench_parser.add_argument("--adaptive", action="store_true", help="Time the launch run with adaptive delay, waiting for each stand-in client to settle")
+    bench_parser.add_argument("--startup-runs", type=int, default=3, help="Cold starts to time; 0 to skip (default: %(default)s)")
+    bench_parser.add_argument("--no-gui", action="store_true", help="Skip the benchmarks that need a display")
+    bench_parser.add_argument("--output", default=BENCH_FILE, help="File to append the results to (default: %(default)s)")
+    commands.add_parser("bench-views", help="Time building and refreshing the bard list and grid")
+    startup_parser = commands.add_parser("bench-startup", help=f"Time a fresh start up to the first paint (target {STARTUP_TARGET_MS} ms) and record it in {STARTUP_BENCH_FILE}")
+    startup_parser.add_argument("--runs", type=int, default=5)
+    startup_parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    monitor_parser = commands.add_parser("bench-monitor", help=f"Measure the client monitor's own CPU use (target {MONITOR_OVERHEAD_TARGET}% of one core with 20 clients)")
+    monitor_parser.add_argument("--clients", type=int, default=20)
+    monitor_parser.add_argument("--seconds", type=float, default=10.0)
+    monitor_parser.add_argument("--interval", type=float, default=MONITOR_DEFAULTS["interval"])
+    args = parser.parse_args(argv)
+
+    if args.command == "launch":
+        return run_launch_command(args)
+    if args.command == "agent":
+        return run_agent_command(args)
+    if args.command == "orchestrate":
+        return run_orchestrate_command(args)
+    if args.command == "bench":
+        bench = load_bench()
+        if args.profile not in bench.FAKE_STARTUP_PROFILES:
+            bench_parser.error(f"--profile must be one of {', '.join(sorted(bench.FAKE_STARTUP_PROFILES))}")
+        try:
+            sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        except ValueError:
+            print(f"Sizes must be numbers, not {args.sizes}.", file=sys.stderr)
+            return 2
+        output = os.path.abspath(args.output)
+        results = bench.run_benchmarks(sizes, args.profile, args.adaptive, args.startup_runs, not args.no_gui)
+        return 1 if bench.write_bench_results(results, output, profile=args.profile, adaptive=args.adaptive) else 0
+    if args.command == "bench-views":
+        load_bench().benchmark_bard_views()
+        return 0
+    if args.command == "bench-monitor":
+        result = load_bench().benchmark_monitor(args.clients, args.seconds, args.interval)
+        return 0 if result["overhead_percent"] <= MONITOR_OVERHEAD_TARGET else 1
+    if args.command == "bench-startup":
+        if args.child:
+            return load_bench().startup_first_paint()
+        result = load_bench().benchmark_startup(args.runs)
+        return 0 if result is not None and result["median_ms"] <= STARTUP_TARGET_MS else 1
+    load_gui_modules()
     root = ThemedTk(theme="clam")
     app = BardLauncherGUI(root)
     root.mainloop()
+    app.settings_store.flush()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+import os
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from datetime import datetime
+
+# Benchmarks for Bard Launcher. Only its bench commands load this, through
+# load_bench in Bardlauncher2.071.py, which sets bl to the launcher module.
+bl = None
+
+BENCH_REGRESSION_PERCENT = 25
+# Stand-in client startup for benchmarks: seconds before the launcher starts the
+# game, seconds the game keeps a core busy, seconds it then stays idle
+FAKE_STARTUP_PROFILES = {"instant": (0.0, 0.0, 0.0), "quick": (0.2, 0.5, 1.0), "typical": (1.0, 3.0, 5.0)}
+
+def benchmark_bard_views(sizes=(10, 100, 500)):
+    # Times building the bard list, renaming one shortcut and a refresh with no
+    # changes, in both views, for synthetic rosters of each size.
+    # Run with: python Bardlauncher2.071.py bench-views
+    bl.load_gui_modules()
+    root = bl.ThemedTk(theme="clam")
+    root.withdraw()
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        previous_cwd = os.getcwd()
+        os.chdir(work_dir)  # Keep the benchmark's config, index and caches out of the real ones
+        try:
+            app = bl.BardLauncherGUI(root)
+            for size in sizes:
+                shortcut_dir = os.path.join(work_dir, f"shortcuts_{size}")
+                os.makedirs(shortcut_dir)
+                for i in range(size):
+                    bl.write_lnk(os.path.join(shortcut_dir, f"Bard{i:04d}.lnk"), bl.XIVLAUNCHER_PATH)
+                app.shortcut_dir_entry.delete(0, tk.END)
+                app.shortcut_dir_entry.insert(0, shortcut_dir)
+                for grid_view in (False, True):
+                    app.view_mode_var.set(grid_view)
+                    timings = {"size": size, "view": "grid" if grid_view else "list"}
+                    for step in ("build", "rename", "refresh"):
+                        if step == "rename":
+                            old_path = os.path.join(shortcut_dir, "Bard0000.lnk")
+                            new_path = os.path.join(shortcut_dir, "Bard0000x.lnk")
+                            if os.path.exists(new_path):
+                                old_path, new_path = new_path, old_path
+                            os.rename(old_path, new_path)
+                        start = time.perf_counter()
+                        app.populate_shortcuts()
+                        root.update_idletasks()
+                        timings[step] = round((time.perf_counter() - start) * 1000, 2)
+                    results.append(timings)
+                    print(f"{size:>5} bards  {timings['view']:<4}  build {timings['build']:>8.2f} ms  rename {timings['rename']:>8.2f} ms  refresh {timings['refresh']:>8.2f} ms")
+        finally:
+            os.chdir(previous_cwd)
+            root.destroy()
+    return results
+
+def startup_first_paint():
+    # Child side of benchmark_startup: build the window, paint it once and
+    # report, without the deferred startup work
+    bl.load_gui_modules()
+    root = bl.ThemedTk(theme="clam")
+    app = bl.BardLauncherGUI(root)
+    root.update_idletasks()
+    print("painted", flush=True)
+    app.watcher.stop()
+    root.destroy()
+    return 0
+
+def time_startup(runs):
+    # Sorted milliseconds from starting a fresh process to the first paint of
+    # the main tab, or None if a run failed
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        child = subprocess.run([sys.executable, os.path.abspath(bl.__file__), "bench-startup", "--child"], capture_output=True, text=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        if child.returncode != 0 or "painted" not in child.stdout:
+            print(f"Startup run failed:\n{child.stderr}", file=sys.stderr)
+            return None
+        timings.append(elapsed)
+    return sorted(timings)
+
+def benchmark_startup(runs=5, history_path=None):
+    # Times a fresh process from start to the first paint of the main tab,
+    # appends the median to history_path (default STARTUP_BENCH_FILE) and
+    # prints the recent history.
+    # Run with: python Bardlauncher2.071.py bench-startup
+    history_path = bl.STARTUP_BENCH_FILE if history_path is None else history_path
+    timings = time_startup(runs)
+    if timings is None:
+        return None
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "runs": runs,
+        "median_ms": round(timings[len(timings) // 2], 1),
+        "min_ms": round(timings[0], 1),
+        "max_ms": round(timings[-1], 1),
+        "target_ms": bl.STARTUP_TARGET_MS
+    }
+    with open(history_path, 'a') as f:
+        f.write(json.dumps(result) + "\n")
+    with open(history_path, 'r') as f:
+        history = [json.loads(line) for line in f if line.strip()]
+    for entry in history[-10:]:
+        print(f"{entry['timestamp']}  median {entry['median_ms']:>7.1f} ms  min {entry['min_ms']:>7.1f} ms  max {entry['max_ms']:>7.1f} ms  {'ok' if entry['median_ms'] <= entry['target_ms'] else 'over target'}")
+    return result
+
+def benchmark_monitor(clients=20, seconds=10.0, interval=None):
+    # Measures the ResourceMonitor's own CPU use while it follows clients
+    # stand-in processes, against MONITOR_OVERHEAD_TARGET.
+    # Run with: python Bardlauncher2.071.py bench-monitor
+    interval = bl.MONITOR_DEFAULTS["interval"] if interval is None else interval
+    psutil = bl.load_psutil()
+    registry = bl.ProcessRegistry(snapshot_path=None)
+    children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(3600)"]) for _ in range(clients)]
+    try:
+        for i, child in enumerate(children):
+            registry.attach(f"Bench{i:02d}", game=psutil.Process(child.pid))
+        monitor = bl.ResourceMonitor(registry, interval=interval)
+        monitor.start()
+        time.sleep(seconds)
+        monitor.stop()
+        overhead = monitor.overhead_percent()
+        passes = len(monitor.series("Bench00"))
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+    print(f"{clients} clients, {passes} passes every {interval}s: sampler used {overhead:.3f}% of one core (target {bl.MONITOR_OVERHEAD_TARGET}%)")
+    return {"clients": clients, "interval": interval, "passes": passes, "overhead_percent": overhead}
+
+def synthetic_config(seed, lines=600):
+    # Roughly the size and shape of a real FFXIV.cfg, different for every seed
+    body = "\n".join(f"Setting{j:03d}\t{(seed * 31 + j) % 97}" for j in range(lines))
+    return f"<FINAL FANTASY XIV Config File>\n\n<Bench Settings>\n{body}\n"
+
+def make_synthetic_roster(root_dir, size, icons=False, launcher_path=None):
+    # Shortcut and config directories for size bards named Bard0000 and up.
+    # With icons (which needs load_gui_modules), every shortcut points at its
+    # own PNG, so the grid can't share thumbnails between bards.
+    launcher_path = launcher_path or bl.XIVLAUNCHER_PATH
+    shortcut_dir = os.path.join(root_dir, f"shortcuts_{size}")
+    config_dir = os.path.join(root_dir, f"configs_{size}")
+    icon_dir = os.path.join(root_dir, f"icons_{size}")
+    for path in (shortcut_dir, config_dir) + ((icon_dir,) if icons else ()):
+        os.makedirs(path, exist_ok=True)
+    for i in range(size):
+        bard_name = f"Bard{i:04d}"
+        icon_location = ""
+        if icons:
+            icon_location = os.path.join(icon_dir, f"{bard_name}.png")
+            bl.Image.new("RGB", (128, 128), ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256)).save(icon_location)
+        bl.write_lnk(os.path.join(shortcut_dir, f"{bard_name}.lnk"), launcher_path, f"--account={bard_name}-False-False", os.path.dirname(launcher_path), icon_location)
+        with open(os.path.join(config_dir, f"{bard_name}.cfg"), 'w') as f:
+            f.write(synthetic_config(i))
+    return shortcut_dir, config_dir
+
+class FakeLauncher:
+    # Stands in for os.startfile when benchmarking. Starting a shortcut spawns a
+    # dummy XIVLauncher.exe that waits, spawns a dummy ffxiv_dx11.exe and exits;
+    # the game keeps a core busy for a while (reading its config) and then
+    # idles, as set by one of FAKE_STARTUP_PROFILES. The dummies are the Python
+    # interpreter linked under those names, so the readiness probe and the
+    # process registry follow them like real clients. Where links can't be
+    # made they run under Python's own name and only the fixed delay applies.
+    def __init__(self, bin_dir, profile="instant"):
+        self.launcher_seconds, self.busy_seconds, self.idle_seconds = FAKE_STARTUP_PROFILES[profile]
+        self.marker = f"--bard-launcher-bench={os.getpid()}"
+        self.launcher_path = os.path.join(bin_dir, bl.LAUNCHER_PROCESS_NAME)
+        self.game_path = os.path.join(bin_dir, bl.GAME_PROCESS_NAMES[0])
+        self.named = True
+        os.makedirs(bin_dir, exist_ok=True)
+        for path in (self.launcher_path, self.game_path):
+            try:
+                if not os.path.lexists(path):
+                    os.symlink(sys.executable, path)
+            except (OSError, NotImplementedError):
+                self.named = False
+        if not self.named:
+            self.launcher_path = self.game_path = sys.executable
+        self.processes = []
+        self.started = []
+
+    def __call__(self, path):
+        game = f"import time\nend = time.monotonic() + {self.busy_seconds}\nwhile time.monotonic() < end: pass\ntime.sleep({self.idle_seconds})"
+        launcher = f"import subprocess, time\ntime.sleep({self.launcher_seconds})\nsubprocess.Popen([{self.game_path!r}, '-c', {game!r}, {self.marker!r}])"
+        self.processes.append(subprocess.Popen([self.launcher_path, "-c", launcher, self.marker]))
+        self.started.append(path)
+
+    def close(self):
+        # The games outlive their launchers, so find them by the marker argument
+        psutil = bl.load_psutil()
+        for proc in psutil.process_iter(['cmdline']):
+            if self.marker in (proc.info['cmdline'] or []):
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+        for process in self.processes:
+            process.wait()
+
+def run_benchmarks(sizes=None, profile="instant", adaptive=False, startup_runs=3, gui=True):
+    # Times the hot paths against synthetic rosters of each size (default
+    # BENCH_SIZES), with a FakeLauncher in place of os.startfile: config swaps,
+    # a whole launch run through the engine (what Start All runs), and with a
+    # display, populate_shortcuts in both views, grid icon loading and a cold
+    # start. Returns {"name", "size", "ms", ...} results; "ms" is per bard where
+    # the name ends in _per_bard. Runs in a temporary directory, so none of the
+    # real settings, journal or caches are touched.
+    # Run with: python Bardlauncher2.071.py bench
+    sizes = bl.BENCH_SIZES if sizes is None else sizes
+    results = []
+
+    def record(name, size, seconds, **extra):
+        results.append(dict(name=name, size=size, ms=round(seconds * 1000, 3), **extra))
+
+    if gui:
+        try:
+            bl.load_gui_modules()
+            root = bl.ThemedTk(theme="clam")
+        except (ImportError, tk.TclError) as e:
+            print(f"Skipping the window benchmarks: {e}", file=sys.stderr)
+            gui = False
+
+    previous_cwd, previous_launcher = os.getcwd(), bl.XIVLAUNCHER_PATH
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        fake = FakeLauncher(os.path.join(work_dir, "bin"), profile)
+        bl.XIVLAUNCHER_PATH = fake.launcher_path
+        try:
+            rosters = {size: make_synthetic_roster(work_dir, size, icons=gui) for size in sizes}
+            for size, (shortcut_dir, config_dir) in rosters.items():
+                print(f"Benchmarking {size} bards...", flush=True)
+                swapper = bl.ConfigSwapper(os.path.join(work_dir, "FFXIV.cfg"))
+                configs = [os.path.join(config_dir, f"Bard{i:04d}.cfg") for i in range(size)]
+                start = time.perf_counter()
+                for config_path in configs:
+                    swapper.swap(config_path)
+                record("config_swap_per_bard", size, (time.perf_counter() - start) / size)
+                start = time.perf_counter()
+                for _ in range(size):
+                    swapper.swap(configs[-1])
+                record("config_swap_unchanged_per_bard", size, (time.perf_counter() - start) / size)
+
+                settings = {"shortcut_dir": shortcut_dir, "config_dir": config_dir, "delay": 0 if not adaptive else 60, "adaptive_delay": adaptive}
+                engine = bl.LaunchEngine(settings, launcher=fake, shortcut_index=bl.ShortcutIndex(os.path.join(work_dir, f"index_{size}.json")))
+                engine.min_delay = 0
+                engine.config_swapper = swapper
+                launched = len(fake.started)
+                start = time.perf_counter()
+                scheduler = engine.start_run(engine.plan())
+                scheduler.join()
+                elapsed = time.perf_counter() - start
+                record("launch_run", size, elapsed, launched=len(fake.started) - launched, profile=profile, adaptive=adaptive, named_processes=fake.named)
+                record("launch_run_per_bard", size, elapsed / size)
+                fake.close()
+
+                configs = bl.BardConfigs(config_dir)
+                bl.write_file_atomic(configs.base_path, synthetic_config(0).encode())
+                bard_names = [f"Bard{i:04d}" for i in range(size)]
+                for name, bulk in (("config_set_key_per_bard", lambda: configs.set_key(bard_names, "Bench Settings", "Setting000", "full")),
+                                   ("config_convert_per_bard", lambda: configs.convert(bard_names)),
+                                   ("config_set_key_delta_per_bard", lambda: configs.set_key(bard_names, "Bench Settings", "Setting000", "delta"))):
+                    start = time.perf_counter()
+                    bulk()
+                    record(name, size, (time.perf_counter() - start) / size)
+
+            if gui:
+                root.withdraw()
+                app = bl.BardLauncherGUI(root)
+                for size, (shortcut_dir, config_dir) in rosters.items():
+                    app.shortcut_dir_entry.delete(0, tk.END)
+                    app.shortcut_dir_entry.insert(0, shortcut_dir)
+                    for grid_view in (False, True):
+                        app.view_mode_var.set(grid_view)
+                        for step in ("build", "refresh"):
+                            start = time.perf_counter()
+                            app.populate_shortcuts()
+                            root.update_idletasks()
+                            record(f"populate_{'grid' if grid_view else 'list'}_{step}", size, time.perf_counter() - start)
+                    app.thumbnail_cache = bl.ThumbnailCache(os.path.join(work_dir, f"thumbnails_{size}"), max_items=size)
+                    icon_paths = [app.get_icon_path(os.path.join(shortcut_dir, f"Bard{i:04d}.lnk")) for i in range(size)]
+                    for step in ("cold", "warm"):
+                        start = time.perf_counter()
+                        for icon_path in icon_paths:
+                            app.load_bard_icon(icon_path)
+                        record(f"grid_icons_{step}_per_bard", size, (time.perf_counter() - start) / size)
+                app.watcher.stop()
+        finally:
+            fake.close()
+            bl.XIVLAUNCHER_PATH = previous_launcher
+            os.chdir(previous_cwd)
+            if gui:
+                root.destroy()
+
+    if gui and startup_runs:
+        timings = time_startup(startup_runs)
+        if timings is not None:
+            record("cold_startup", None, timings[len(timings) // 2] / 1000, runs=startup_runs, target_ms=bl.STARTUP_TARGET_MS)
+    return results
+
+def write_bench_results(results, path=None, **details):
+    # Appends one JSON line for the whole run to path (default BENCH_FILE) and
+    # prints each result next to the last run with the same details, marking
+    # anything more than BENCH_REGRESSION_PERCENT slower. Returns how many
+    # results were.
+    path = bl.BENCH_FILE if path is None else path
+    previous = {}
+    try:
+        with open(path, 'r') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        for last in reversed(entries):
+            if all(last.get(key) == value for key, value in details.items()):
+                previous = {(result["name"], result["size"]): result["ms"] for result in last["results"]}
+                print(f"Compared with {last['version']} on {last['timestamp']}:")
+                break
+    except (OSError, ValueError, KeyError):
+        pass
+    entry = {"version": bl.APP_VERSION, "timestamp": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(), "platform": sys.platform, **details, "results": results}
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + "\n")
+    regressions = 0
+    for result in results:
+        before = previous.get((result["name"], result["size"]))
+        change = ""
+        if before:
+            percent = (result["ms"] - before) / before * 100
+            slower = percent > BENCH_REGRESSION_PERCENT and result["ms"] - before > 0.5
+            regressions += slower
+            change = f"{before:>10.3f} ms  {percent:+6.1f}%{'  slower' if slower else ''}"
+        print(f"{result['name']:<32} {result['size'] if result['size'] is not None else '':>5}  {result['ms']:>10.3f} ms  {change}")
+    print(f"Results appended to {path}")
+    return regressions
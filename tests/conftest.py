@@ -0,0 +1,23 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Source", "Bardlauncher2.071.py")
+
+
+@pytest.fixture(scope="session")
+def bl():
+    # The launcher is a single script whose file name isn't a module name
+    spec = importlib.util.spec_from_file_location("bardlauncher", SOURCE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def bench(bl):
+    # The benchmarks and their stand-in launcher, from Source/bench.py
+    return bl.load_bench()
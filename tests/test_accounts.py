@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+
+LAUNCHER = r"C:\Users\Bard\AppData\Local\XIVLauncher\XIVLauncher.exe"
+
+ACCOUNTS = [
+    {"UserName": "Alto", "UseOtp": False, "UseSteamServiceAccount": False, "SavePassword": True},
+    {"UserName": "Bass", "UseOtp": True, "UseSteamServiceAccount": False, "Note": "has a ] and a , in it"},
+    {"UserName": "Cellø", "UseOtp": False, "UseSteamServiceAccount": True},
+]
+
+
+def write_accounts(path, accounts, indent=2, bom=False):
+    path.write_text(("\ufeff" if bom else "") + json.dumps(accounts, indent=indent, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_iter_accounts_across_chunk_boundaries(bl, tmp_path, chunk_size):
+    path = write_accounts(tmp_path / "accountsList.json", ACCOUNTS, bom=True)
+    assert list(bl.iter_accounts(path, chunk_size)) == ACCOUNTS
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "\n[\n]\n"])
+def test_iter_accounts_empty_list(bl, tmp_path, text):
+    (tmp_path / "accountsList.json").write_text(text)
+    assert list(bl.iter_accounts(str(tmp_path / "accountsList.json"), 2)) == []
+
+
+@pytest.mark.parametrize("text", ['{"UserName": "Alto"}', '[{"UserName": "Alto"}', '[{"UserName": "Al'])
+def test_iter_accounts_rejects_bad_files(bl, tmp_path, text):
+    (tmp_path / "accountsList.json").write_text(text)
+    with pytest.raises(ValueError):
+        list(bl.iter_accounts(str(tmp_path / "accountsList.json"), 4))
+
+
+def test_account_index_skips_duplicates_and_nameless_entries(bl, tmp_path):
+    path = write_accounts(tmp_path / "accountsList.json", ACCOUNTS + [{"UserName": "Alto", "UseOtp": True}, {"UseOtp": True}, "not an account"])
+    index = bl.AccountIndex()
+    assert index.load(path)
+    assert [(record.user_name, record.use_otp, record.use_steam) for record in index.records] == [("Alto", False, False), ("Bass", True, False), ("Cellø", False, True)]
+    assert [record.user_name for record in index.search(" CEL ")] == ["Cellø"]
+    assert len(index.search("")) == 3
+
+
+def test_account_index_reloads_only_when_the_file_changes(bl, tmp_path, monkeypatch):
+    path = write_accounts(tmp_path / "accountsList.json", ACCOUNTS)
+    index = bl.AccountIndex()
+    assert index.load(path)
+    reads = []
+    real_iter = bl.iter_accounts
+    monkeypatch.setattr(bl, "iter_accounts", lambda path: reads.append(path) or real_iter(path))
+    assert not index.load(path)
+    assert reads == []
+
+    # Another size
+    write_accounts(tmp_path / "accountsList.json", ACCOUNTS[:2])
+    assert index.load(path)
+    assert [record.user_name for record in index.records] == ["Alto", "Bass"]
+    # Same size, another mtime
+    stat_result = os.stat(path)
+    write_accounts(tmp_path / "accountsList.json", [dict(ACCOUNTS[0], UserName="Aria"), ACCOUNTS[1]])
+    os.utime(path, ns=(stat_result.st_mtime_ns + 1000000000,) * 2)
+    assert os.stat(path).st_size == stat_result.st_size
+    assert index.load(path)
+    assert [record.user_name for record in index.records] == ["Aria", "Bass"]
+    assert len(reads) == 2
+
+
+def test_a_failed_load_keeps_the_old_records(bl, tmp_path):
+    path = write_accounts(tmp_path / "accountsList.json", ACCOUNTS)
+    index = bl.AccountIndex()
+    index.load(path)
+    (tmp_path / "accountsList.json").write_text('[{"UserName": "Al')
+    with pytest.raises(ValueError):
+        index.load(path)
+    assert len(index.records) == 3
+    # And the broken file is read again next time rather than taken as loaded
+    write_accounts(tmp_path / "accountsList.json", ACCOUNTS[:1])
+    assert index.load(path)
+    assert len(index.records) == 1
+
+
+@pytest.fixture
+def shortcuts(bl, tmp_path):
+    index = bl.AccountIndex()
+    index.load(write_accounts(tmp_path / "accountsList.json", ACCOUNTS))
+    shortcut_dir = tmp_path / "shortcuts"
+    shortcut_dir.mkdir()
+    return [bl.account_shortcut(record, str(shortcut_dir), launcher_path=LAUNCHER) for record in index.records]
+
+
+def test_plan_before_creating_shortcuts(bl, shortcuts):
+    assert bl.plan_shortcuts(shortcuts) == [("create", ["target", "arguments", "working_dir", "icon_location"])] * 3
+    bl.write_shortcuts(shortcuts)
+    assert [action for action, changed in bl.plan_shortcuts(shortcuts)] == ["unchanged"] * 3
+
+
+def test_diff_names_the_changed_fields(bl, shortcuts):
+    bl.write_shortcuts(shortcuts)
+    changed = dict(shortcuts[1], arguments="--account=Bass-False-False --roamingPath=D:\\Roaming")
+    assert bl.diff_shortcut(changed) == ("update", ["arguments"])
+    # A shortcut the reader can't parse is rewritten in full
+    with open(shortcuts[2]["path"], 'wb') as f:
+        f.write(b"garbage")
+    assert bl.diff_shortcut(shortcuts[2]) == ("update", ["target", "arguments", "working_dir", "icon_location"])
+
+
+def test_write_shortcuts_uses_the_plan_it_is_given(bl, shortcuts, monkeypatch):
+    plan = bl.plan_shortcuts(shortcuts)
+    monkeypatch.setattr(bl, "diff_shortcut", lambda item: pytest.fail("the plan was read again"))
+    assert [result for path, result in bl.write_shortcuts(shortcuts, plan)] == ["created"] * 3
+
+
+def test_plan_shortcuts_with_nothing_to_do(bl):
+    assert bl.plan_shortcuts([]) == []
+    assert bl.write_shortcuts([]) == []
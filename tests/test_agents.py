@@ -0,0 +1,163 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("psutil")
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def fleet(bl, bench, tmp_path, monkeypatch):
+    # Two agents on localhost, each with its own bards, directories, journal
+    # and FFXIV.cfg, and one FakeLauncher that records the global launch order
+    monkeypatch.chdir(tmp_path)
+    fake = bench.FakeLauncher(str(tmp_path / "bin"), "quick")
+    monkeypatch.setattr(bl, "XIVLAUNCHER_PATH", fake.launcher_path)
+    launches = []
+
+    def launcher(path):
+        launches.append((os.path.basename(path)[:-len(".lnk")], time.monotonic()))
+        fake(path)
+
+    agents, engines = [], {}
+
+    def start(name, bards, **settings):
+        shortcut_dir, config_dir = tmp_path / name / "shortcuts", tmp_path / name / "configs"
+        shortcut_dir.mkdir(parents=True)
+        config_dir.mkdir()
+        for bard_name in bards:
+            bl.write_lnk(str(shortcut_dir / f"{bard_name}.lnk"), fake.launcher_path, f"--account={bard_name}-False-False")
+            (config_dir / f"{bard_name}.cfg").write_text(bench.synthetic_config(len(bard_name)))
+        settings = dict({"shortcut_dir": str(shortcut_dir), "config_dir": str(config_dir), "delay": 1, "bard_checkbuttons": {bard_name: True for bard_name in bards}}, **settings)
+        engine = bl.LaunchEngine(settings, launcher=launcher, shortcut_index=bl.ShortcutIndex(str(tmp_path / name / "index.json")), process_registry=bl.ProcessRegistry(snapshot_path=None))
+        engine.min_delay = 0
+        engine.journal = bl.LaunchJournal(str(tmp_path / name / "journal.jsonl"))
+        engine.config_swapper.target = str(tmp_path / name / "FFXIV.cfg")
+        agent = bl.LaunchAgent(engine, port=0, token=TOKEN, name=name)
+        agent.start()
+        agents.append(agent)
+        engines[name] = engine
+        return agent
+
+    yield start, launches, engines
+    for agent in agents:
+        agent.stop()
+    fake.close()
+
+
+def drain(controller):
+    events = []
+    while not controller.events.empty():
+        events.append(controller.events.get())
+    return events
+
+
+def test_refuses_a_wrong_token(bl, fleet):
+    start, launches, engines = fleet
+    agent = start("pc1", ["Alto"])
+    with pytest.raises(bl.AgentError):
+        bl.AgentConnection(tuple(agent.address), "wrong")
+
+
+def test_round_robin_across_two_agents(bl, fleet, tmp_path):
+    start, launches, engines = fleet
+    agents = [start("pc1", ["Alto", "Bass", "Cello"]), start("pc2", ["Drum", "Echo"])]
+    controller = bl.LaunchController([tuple(agent.address) for agent in agents], TOKEN, gap=0.2)
+    try:
+        controller.connect()
+        steps, lightamp_agents = controller.plan()
+        assert [(agent.name, bard_name) for agent, bard_name, delay in steps] == [("pc1", "Alto"), ("pc2", "Drum"), ("pc1", "Bass"), ("pc2", "Echo"), ("pc1", "Cello")]
+        assert controller.run(steps)
+    finally:
+        controller.close()
+
+    assert [bard_name for bard_name, at in launches] == ["Alto", "Drum", "Bass", "Echo", "Cello"]
+    at = dict(launches)
+    assert all(later - earlier >= 0.2 for (_, earlier), (_, later) in zip(launches, launches[1:]))
+    assert at["Bass"] - at["Alto"] >= 1 and at["Cello"] - at["Bass"] >= 1 and at["Echo"] - at["Drum"] >= 1
+
+    events = drain(controller)
+    assert [data for kind, data in events if kind == "started"] == [{"total": 5}]
+    assert [data for kind, data in events if kind == "finished"] == [{"cancelled": False}]
+    assert [(data["agent"], data["bard"]) for kind, data in events if kind == "bard"] == [("pc1", "Alto"), ("pc2", "Drum"), ("pc1", "Bass"), ("pc2", "Echo"), ("pc1", "Cello")]
+    assert [data["value"] for kind, data in events if kind == "progress"] == [1, 2, 3, 4, 5]
+    assert {data["agent"] for kind, data in events if kind == "status"} >= {"pc1", "pc2"}
+
+    # Each agent ran its bards as one run: one journal run and one timeline each
+    assert engines["pc1"].journal.last_run()["plan"] == ["Alto", "Bass", "Cello"]
+    assert engines["pc2"].journal.last_run()["plan"] == ["Drum", "Echo"]
+    assert len(os.listdir(tmp_path / bl.TIMELINE_DIR)) == 2
+
+
+def test_agent_paces_on_adaptive_readiness(bl, fleet):
+    # With adaptive delay the agent asks for its next bard as soon as the
+    # client before has settled, well before the 60 second delay
+    start, launches, engines = fleet
+    agents = [start("pc1", ["Alto", "Bass"], delay=60, adaptive_delay=True), start("pc2", ["Drum"])]
+    controller = bl.LaunchController([tuple(agent.address) for agent in agents], TOKEN, gap=0.1)
+    try:
+        controller.connect()
+        started = time.monotonic()
+        assert controller.run(controller.plan()[0])
+        assert time.monotonic() - started < 30
+    finally:
+        controller.close()
+    assert [bard_name for bard_name, at in launches] == ["Alto", "Drum", "Bass"]
+    assert any("Moved on from Alto" in data["message"] for kind, data in drain(controller) if kind == "status")
+
+
+def test_skipped_bards_and_cancel(bl, fleet):
+    start, launches, engines = fleet
+    agents = [start("pc1", ["Alto", "Bass"], delay=60), start("pc2", ["Drum"])]
+    controller = bl.LaunchController([tuple(agent.address) for agent in agents], TOKEN, gap=0.1)
+    try:
+        controller.connect()
+        steps, lightamp_agents = controller.plan()
+        # A bard the agent has no shortcut for is skipped without holding up the rest
+        steps.insert(1, (steps[0][0], "Ghost", 1))
+        runner = threading.Thread(target=controller.run, args=(steps,))
+        runner.start()
+        deadline = time.monotonic() + 20
+        while len(launches) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        controller.cancel()
+        runner.join(10)
+        assert not runner.is_alive()
+    finally:
+        controller.close()
+    assert [bard_name for bard_name, at in launches] == ["Alto", "Drum"]
+    events = drain(controller)
+    assert [data for kind, data in events if kind == "finished"] == [{"cancelled": True}]
+    assert any("skipped Ghost" in data["message"] for kind, data in events if kind == "status")
+    deadline = time.monotonic() + 5
+    while engines["pc1"].is_running() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not engines["pc1"].is_running()
+    assert engines["pc1"].journal.last_run()["remaining"] == ["Bass"]
+
+
+def test_a_controller_that_stops_reading_is_dropped(bl, fleet):
+    start, launches, engines = fleet
+    agent = start("pc1", ["Alto"])
+    agent.send_timeout = 0.5
+    stalled = socket.create_connection(tuple(agent.address))
+    stalled.sendall(b'{"id": 1, "command": "hello", "token": "%s"}\n' % TOKEN.encode())
+    listening = bl.AgentConnection(tuple(agent.address), TOKEN)
+    try:
+        # Fill the stalled connection's buffers until its send times out
+        message = {"event": "log", "message": "x" * 65536}
+        deadline = time.monotonic() + 30
+        while len(agent.clients) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        while len(agent.clients) == 2 and time.monotonic() < deadline:
+            agent._broadcast(message)
+        assert len(agent.clients) == 1
+        # The other controller is still served
+        assert listening.call("status")["running"] is False
+    finally:
+        stalled.close()
+        listening.close()
@@ -0,0 +1,117 @@
+import os
+from datetime import datetime
+
+import pytest
+
+DAY = 86400
+NOW = 1700000000
+
+
+@pytest.fixture
+def store(bl, tmp_path):
+    return bl.BackupStore(str(tmp_path / "backup"))
+
+
+def blobs(store):
+    return sorted(name[:-2] for dir_path, dir_names, file_names in os.walk(store.objects_dir) for name in file_names if name.endswith(".z"))
+
+
+def test_identical_configs_share_one_blob(bl, store):
+    store.add("Alto", b"<Same>\r\n", NOW)
+    store.add("Bass", b"<Same>\r\n", NOW)
+    assert len(store.list()) == 2
+    assert blobs(store) == [store.list("Alto")[0]["hash"]] == [store.list("Bass")[0]["hash"]]
+    assert store.read(blobs(store)[0]) == b"<Same>\r\n"
+
+
+def test_unchanged_config_is_not_backed_up_again(bl, store):
+    assert store.add("Alto", b"<One>\r\n", NOW) is not None
+    assert store.add("Alto", b"<One>\r\n", NOW + 1) is None
+    assert store.add("Alto", b"<Two>\r\n", NOW + 2) is not None
+    # Going back to an older config is a change again
+    assert store.add("Alto", b"<One>\r\n", NOW + 3) is not None
+    assert [store.read(entry["hash"]) for entry in store.list("Alto")] == [b"<One>\r\n", b"<Two>\r\n", b"<One>\r\n"]
+
+
+def test_index_survives_a_reload(bl, store, tmp_path):
+    store.add("Alto", b"<One>\r\n", NOW)
+    assert bl.BackupStore(str(tmp_path / "backup")).list() == store.list()
+
+
+def test_prune_by_count(bl, store):
+    for i in range(5):
+        store.add("Alto", f"<Alto {i}>\r\n".encode(), NOW + i)
+    store.add("Bass", b"<Bass>\r\n", NOW)
+    assert store.prune(keep=2, now=NOW + 10) == 3
+    assert [entry["timestamp"] for entry in store.list("Alto")] == [NOW + 4, NOW + 3]
+    assert len(store.list("Bass")) == 1
+
+
+def test_prune_by_age(bl, store):
+    store.add("Alto", b"<Old>\r\n", NOW - 40 * DAY)
+    store.add("Alto", b"<New>\r\n", NOW - 10 * DAY)
+    assert store.prune(max_age_days=30, now=NOW) == 1
+    assert [store.read(entry["hash"]) for entry in store.list()] == [b"<New>\r\n"]
+    assert store.prune(max_age_days=30, now=NOW) == 0
+
+
+def test_prune_deletes_only_orphaned_blobs(bl, store):
+    store.add("Alto", b"<Shared>\r\n", NOW - 40 * DAY)
+    store.add("Bass", b"<Shared>\r\n", NOW)
+    store.add("Alto", b"<Alto only>\r\n", NOW - 50 * DAY)
+    shared = store.list("Bass")[0]["hash"]
+    assert len(blobs(store)) == 2
+    assert store.prune(max_age_days=30, now=NOW) == 2
+    assert blobs(store) == [shared]
+    assert store.read(shared) == b"<Shared>\r\n"
+
+
+def test_import_legacy_copies(bl, store, tmp_path):
+    backup_dir = tmp_path / "backup"
+    backup_dir.mkdir()
+    (backup_dir / "Alto_20240102_030405.cfg").write_bytes(b"<Alto old>\r\n")
+    (backup_dir / "Alto_20240103_030405.cfg").write_bytes(b"<Alto new>\r\n")
+    (backup_dir / "Bard_With_Underscores_20240102_030405.cfg").write_bytes(b"<Bard>\r\n")
+    (backup_dir / "notes.cfg").write_bytes(b"not a backup")
+    (backup_dir / "Alto_2024_bad.cfg").write_bytes(b"not a backup either")
+    assert store.import_legacy() == 3
+    assert sorted(os.listdir(backup_dir)) == ["Alto_2024_bad.cfg", "index.json", "notes.cfg", "objects"]
+    alto = store.list("Alto")
+    assert [store.read(entry["hash"]) for entry in alto] == [b"<Alto new>\r\n", b"<Alto old>\r\n"]
+    assert alto[1]["timestamp"] == datetime(2024, 1, 2, 3, 4, 5).timestamp()
+    assert [store.read(entry["hash"]) for entry in store.list("Bard_With_Underscores")] == [b"<Bard>\r\n"]
+    # The imported entries were saved before the copies were deleted
+    assert len(bl.BackupStore(str(backup_dir)).list()) == 3
+
+
+def test_import_legacy_without_a_backup_dir(bl, store):
+    assert store.import_legacy() == 0
+
+
+def test_restore_backs_up_the_current_config_first(bl, store, tmp_path):
+    target = tmp_path / "Alto.cfg"
+    old = store.add("Alto", b"<Old>\r\n", NOW)
+    target.write_bytes(b"<Current>\r\n")
+    store.restore("Alto", old["hash"], str(target))
+    assert target.read_bytes() == b"<Old>\r\n"
+    # The replaced config is the newest backup, so the restore can be undone
+    newest = store.list("Alto")[0]
+    assert store.read(newest["hash"]) == b"<Current>\r\n"
+    store.restore("Alto", newest["hash"], str(target))
+    assert target.read_bytes() == b"<Current>\r\n"
+    assert not os.path.exists(f"{target}.tmp")
+
+
+def test_restore_onto_a_missing_config(bl, store, tmp_path):
+    old = store.add("Alto", b"<Old>\r\n", NOW)
+    store.restore("Alto", old["hash"], str(tmp_path / "Alto.cfg"))
+    assert (tmp_path / "Alto.cfg").read_bytes() == b"<Old>\r\n"
+    assert len(store.list("Alto")) == 1
+
+
+def test_diff_against_the_current_config(bl, store, tmp_path):
+    old = store.add("Alto", b"<S>\r\nKey\t0\r\n", NOW)
+    (tmp_path / "Alto.cfg").write_bytes(b"<S>\r\nKey\t1\r\n")
+    diff = store.diff(old["hash"], str(tmp_path / "Alto.cfg"))
+    assert "-Key\t0" in diff and "+Key\t1" in diff
+    assert store.diff(old["hash"], str(tmp_path / "Alto.cfg"), b"<S>\r\nKey\t0\r\n") == ""
@@ -0,0 +1,191 @@
+import json
+
+import pytest
+
+# Shaped like a real FFXIV.cfg: CRLF, a header line, blank lines between
+# sections, tab separated settings and values that are empty or have spaces
+CFG = (
+    "<FINAL FANTASY XIV Config File>\r\n"
+    "\r\n"
+    "<Cutscene Settings>\r\n"
+    "CutsceneMovieVoice\t0\r\n"
+    "CutsceneMovieSubtitle\t1\r\n"
+    "\r\n"
+    "<Display Settings>\r\n"
+    "ScreenLeft\t0\r\n"
+    "ScreenTop\t0\r\n"
+    "ScreenMode\t0\r\n"
+    "FPSInActive\t1\r\n"
+    "\r\n"
+    "<Sound Settings>\r\n"
+    "SoundMaster\t100\r\n"
+    "SoundPlayer\t\r\n"
+    "\r\n"
+    "<Network Settings>\r\n"
+    "UPnP\t1\r\n"
+    "LastLogin0\tBard One\r\n"
+).encode("utf-8")
+
+
+def test_parse_to_bytes_round_trip(bl):
+    cfg = bl.CfgFile.parse(CFG)
+    assert cfg.to_bytes() == CFG
+    assert cfg.get("Display Settings", "ScreenMode") == "0"
+    assert cfg.get("Sound Settings", "SoundPlayer") == ""
+    assert cfg.get("Network Settings", "LastLogin0") == "Bard One"
+    assert list(cfg.settings()) == ["Cutscene Settings", "Display Settings", "Sound Settings", "Network Settings"]
+
+
+@pytest.mark.parametrize("data", [CFG.replace(b"\r\n", b"\n"), CFG[:-2], b"", "<S>\r\nKey\tCaf\xe9\r\n".encode("utf-8"), b"<S>\r\nKey\t\xff\xfe\r\n"])
+def test_round_trip_keeps_bytes(bl, data):
+    assert bl.CfgFile.parse(data).to_bytes() == data
+
+
+def test_set_existing_key(bl):
+    cfg = bl.CfgFile.parse(CFG)
+    assert cfg.set("Display Settings", "ScreenMode", "2")
+    assert not cfg.set("Display Settings", "ScreenMode", "2")
+    assert cfg.to_bytes() == CFG.replace(b"ScreenMode\t0", b"ScreenMode\t2")
+
+
+def test_set_missing_key_goes_to_the_end_of_its_section(bl):
+    cfg = bl.CfgFile.parse(CFG)
+    assert cfg.set("Display Settings", "Gamma", "50")
+    assert cfg.to_bytes() == CFG.replace(b"FPSInActive\t1\r\n", b"FPSInActive\t1\r\nGamma\t50\r\n")
+    assert cfg.set("Network Settings", "LastLogin1", "Bard Two")
+    assert cfg.to_bytes().endswith(b"LastLogin0\tBard One\r\nLastLogin1\tBard Two\r\n")
+
+
+def test_set_missing_section_is_appended(bl):
+    cfg = bl.CfgFile.parse(CFG)
+    assert cfg.set("Graphics Settings", "Vsync", "1")
+    assert cfg.to_bytes() == CFG + b"\r\n<Graphics Settings>\r\nVsync\t1\r\n"
+    assert bl.CfgFile.parse(cfg.to_bytes()).get("Graphics Settings", "Vsync") == "1"
+
+
+def test_remove(bl):
+    cfg = bl.CfgFile.parse(CFG)
+    assert cfg.remove("Display Settings", "ScreenTop")
+    assert not cfg.remove("Display Settings", "ScreenTop")
+    assert cfg.to_bytes() == CFG.replace(b"ScreenTop\t0\r\n", b"")
+
+
+def test_find(bl):
+    cfg = bl.CfgFile.parse(CFG)
+    assert cfg.find("ScreenMode") == ["Display Settings"]
+    assert cfg.find("Missing") == []
+
+
+def test_diff_then_apply_reproduces_the_target(bl):
+    base = bl.CfgFile.parse(CFG)
+    target = bl.CfgFile.parse(CFG)
+    target.set("Display Settings", "ScreenLeft", "1920")
+    target.set("Display Settings", "Gamma", "50")
+    target.set("Graphics Settings", "Vsync", "1")
+    target.remove("Sound Settings", "SoundPlayer")
+    delta = target.diff(base)
+    assert delta == {"set": {"Display Settings": {"ScreenLeft": "1920", "Gamma": "50"}, "Graphics Settings": {"Vsync": "1"}}, "remove": {"Sound Settings": ["SoundPlayer"]}}
+    assert base.apply(delta).to_bytes() == target.to_bytes()
+    assert base.to_bytes() == CFG
+    assert target.diff(target) == {"set": {}, "remove": {}}
+
+
+@pytest.fixture
+def configs(bl, tmp_path):
+    (tmp_path / "default.cfg").write_bytes(CFG)
+    return bl.BardConfigs(str(tmp_path), max_workers=4)
+
+
+def write_delta(configs, bard_name, delta):
+    with open(configs.delta_path(bard_name), 'wb') as f:
+        f.write(configs.encode_delta(delta))
+
+
+def test_read_merges_a_delta_onto_the_base(bl, configs):
+    write_delta(configs, "Alto", {"set": {"Network Settings": {"LastLogin0": "Alto"}}, "remove": {}})
+    path, data = configs.read("Alto")
+    assert path == configs.delta_path("Alto")
+    assert data == CFG.replace(b"Bard One", b"Alto")
+
+
+def test_read_prefers_the_delta_over_a_full_copy(bl, configs, tmp_path):
+    (tmp_path / "Alto.cfg").write_bytes(b"<Old>\r\n")
+    write_delta(configs, "Alto", {"set": {}, "remove": {}})
+    assert configs.read("Alto") == (configs.delta_path("Alto"), CFG)
+
+
+def test_read_full_copy_and_missing(bl, configs, tmp_path):
+    (tmp_path / "Bass.cfg").write_bytes(b"<Bass>\r\n")
+    assert configs.read("Bass") == (str(tmp_path / "Bass.cfg"), b"<Bass>\r\n")
+    with pytest.raises(FileNotFoundError):
+        configs.read("Nobody")
+
+
+def test_read_rejects_a_bad_delta(bl, configs, tmp_path):
+    (tmp_path / "Alto.delta.json").write_text(json.dumps(["not", "a", "delta"]))
+    with pytest.raises(ValueError):
+        configs.read("Alto")
+
+
+def test_base_is_reparsed_when_default_cfg_changes(bl, configs, tmp_path):
+    write_delta(configs, "Alto", {"set": {}, "remove": {}})
+    assert configs.read("Alto")[1] == CFG
+    (tmp_path / "default.cfg").write_bytes(CFG + b"<Extra>\r\n")
+    assert configs.read("Alto")[1] == CFG + b"<Extra>\r\n"
+
+
+def test_save_keeps_a_delta_a_delta(bl, configs, tmp_path):
+    write_delta(configs, "Alto", {"set": {}, "remove": {}})
+    configs.save("Alto", CFG.replace(b"UPnP\t1", b"UPnP\t0"))
+    assert not (tmp_path / "Alto.cfg").exists()
+    assert configs.read_delta("Alto")["set"] == {"Network Settings": {"UPnP": "0"}}
+    configs.save("Bass", CFG)
+    assert (tmp_path / "Bass.cfg").read_bytes() == CFG
+
+
+@pytest.fixture
+def roster(bl, configs, tmp_path):
+    # Alto and Bass have full copies, Cello a delta, and Drum nothing
+    (tmp_path / "Alto.cfg").write_bytes(CFG.replace(b"Bard One", b"Alto"))
+    (tmp_path / "Bass.cfg").write_bytes(CFG.replace(b"Bard One", b"Bass").replace(b"ScreenMode\t0", b"ScreenMode\t2"))
+    write_delta(configs, "Cello", {"set": {"Network Settings": {"LastLogin0": "Cello"}}, "remove": {}})
+    return ["Alto", "Bass", "Cello", "Drum"]
+
+
+def test_convert_full_copies_to_deltas(bl, configs, roster, tmp_path):
+    before = {bard_name: configs.read(bard_name)[1] for bard_name in roster[:3]}
+    store = bl.BackupStore(str(tmp_path / "backup"))
+    assert configs.convert(roster, store) == {"Alto": "converted", "Bass": "converted", "Cello": "already a delta", "Drum": "no config"}
+    assert not (tmp_path / "Alto.cfg").exists() and not (tmp_path / "Bass.cfg").exists()
+    assert configs.read_delta("Bass")["set"] == {"Display Settings": {"ScreenMode": "2"}, "Network Settings": {"LastLogin0": "Bass"}}
+    # Reading a converted bard gives back the same bytes
+    assert {bard_name: configs.read(bard_name)[1] for bard_name in roster[:3]} == before
+    # The full copies were backed up before they were deleted
+    assert {entry["bard"] for entry in store.list()} == {"Alto", "Bass"}
+    assert store.read(store.list("Alto")[0]["hash"]) == before["Alto"]
+
+
+def test_set_key_over_full_copies_and_deltas(bl, configs, roster, tmp_path):
+    store = bl.BackupStore(str(tmp_path / "backup"))
+    results = configs.set_key(roster, "Display Settings", "ScreenMode", "2", store)
+    assert results == {"Alto": "updated", "Bass": "unchanged", "Cello": "updated", "Drum": "no config"}
+    assert bl.CfgFile.parse((tmp_path / "Alto.cfg").read_bytes()).get("Display Settings", "ScreenMode") == "2"
+    assert configs.read_delta("Cello")["set"] == {"Network Settings": {"LastLogin0": "Cello"}, "Display Settings": {"ScreenMode": "2"}}
+    assert not (tmp_path / "Cello.cfg").exists()
+    # Only the bards that changed were backed up
+    assert {entry["bard"] for entry in store.list()} == {"Alto", "Cello"}
+    assert store.read(store.list("Cello")[0]["hash"]) == CFG.replace(b"Bard One", b"Cello")
+
+
+def test_set_key_finds_the_section(bl, configs, roster):
+    assert configs.set_key(roster[:3], None, "UPnP", "0") == {"Alto": "updated", "Bass": "updated", "Cello": "updated"}
+    assert all(bl.CfgFile.parse(configs.read(bard_name)[1]).get("Network Settings", "UPnP") == "0" for bard_name in roster[:3])
+    results = configs.set_key(roster[:1], None, "NoSuchKey", "1")
+    assert results["Alto"].startswith("Error: ")
+
+
+def test_set_key_without_default_cfg(bl, configs, roster, tmp_path):
+    (tmp_path / "default.cfg").unlink()
+    results = configs.set_key(roster, "Display Settings", "ScreenMode", "1")
+    assert results["Alto"] == "updated" and results["Bass"] == "updated" and results["Drum"] == "no config"
+    assert results["Cello"].startswith("Error: Did not find")
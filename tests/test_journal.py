@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def journal(bl, tmp_path):
+    return bl.LaunchJournal(str(tmp_path / "journal.jsonl"))
+
+
+def begin(journal, bards):
+    journal.begin("run1", bards, "fixed", 10)
+
+
+def test_no_journal(bl, journal):
+    assert journal.last_run() is None
+
+
+def test_finished_run(bl, journal):
+    begin(journal, ["Alto", "Bass"])
+    journal.mark("Alto", "start")
+    journal.mark("Alto", "shortcut_started")
+    journal.mark("Bass", "shortcut_started")
+    journal.end(False)
+    run = journal.last_run()
+    assert run["ended"] and not run["cancelled"]
+    assert run["done"] == ["Alto", "Bass"] and run["remaining"] == []
+    assert run["phases"]["Alto"] == ["start", "shortcut_started"]
+
+
+def test_run_without_an_end_record(bl, journal):
+    # What a crash mid-launch leaves behind
+    begin(journal, ["Alto", "Bass", "Cello", "Drum"])
+    journal.mark("Alto", "shortcut_started")
+    journal.mark("Bass", "start")
+    journal.mark("Bass", "config_swapped")
+    run = journal.last_run()
+    assert not run["ended"]
+    assert run["done"] == ["Alto"]
+    assert run["remaining"] == ["Bass", "Cello", "Drum"]
+
+
+def test_truncated_final_line_is_ignored(bl, journal, tmp_path):
+    begin(journal, ["Alto", "Bass"])
+    journal.mark("Alto", "shortcut_started")
+    with open(tmp_path / "journal.jsonl", 'a') as f:
+        f.write(json.dumps({"type": "phase", "run_id": "run1", "time": 0, "bard": "Bass", "phase": "shortcut_started"})[:30])
+    run = journal.last_run()
+    assert run["done"] == ["Alto"] and run["remaining"] == ["Bass"]
+
+
+def test_only_the_last_run_counts(bl, journal, tmp_path):
+    begin(journal, ["Alto"])
+    with open(tmp_path / "journal.jsonl", 'a') as f:
+        f.write(json.dumps({"type": "plan", "run_id": "run2", "time": 0, "bards": ["Bass", "Cello"]}) + "\n")
+        f.write(json.dumps({"type": "phase", "run_id": "run1", "time": 0, "bard": "Bass", "phase": "shortcut_started"}) + "\n")
+    run = journal.last_run()
+    assert run["run_id"] == "run2" and run["remaining"] == ["Bass", "Cello"]
+
+
+@pytest.fixture
+def engine(bl, journal, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = bl.LaunchEngine(shortcut_index=bl.ShortcutIndex(str(tmp_path / "index.json")), process_registry=bl.ProcessRegistry(snapshot_path=None))
+    engine.journal = journal
+    engine.runs = []
+    engine.start_run = lambda bards, dry_run=False, lightamp=None: engine.runs.append(bards) or "scheduler"
+    return engine
+
+
+def test_resume_keeps_the_order_and_skips_done_bards(bl, journal, engine):
+    begin(journal, ["Echo", "Alto", "Drum", "Bass", "Cello"])
+    journal.mark("Echo", "shortcut_started")
+    journal.mark("Drum", "skipped")
+    journal.mark("Alto", "start")
+    journal.mark("Alto", "failed")
+    journal.end(True)
+    assert engine.resume_run() == "scheduler"
+    assert engine.runs == [["Alto", "Bass", "Cello"]]
+
+
+def test_nothing_to_resume(bl, journal, engine):
+    assert engine.resume_run() is None
+    begin(journal, ["Alto"])
+    journal.mark("Alto", "shortcut_started")
+    journal.end(False)
+    assert engine.resume_run() is None
+    assert engine.runs == []
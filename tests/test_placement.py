@@ -0,0 +1,53 @@
+import pytest
+
+# Four physical cores with two hyperthreads each
+CORES = [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+
+def test_reserved_cores_go_to_lightamp_and_the_rest_round_robin(bl):
+    plan = bl.plan_placement(["Alto", "Bass", "Cello"], CORES, reserved_cores=2)
+    assert plan[None] == {"cpus": [0, 1, 2, 3], "priority": "normal"}
+    assert [plan[bard_name]["cpus"] for bard_name in ("Alto", "Bass", "Cello")] == [[4, 5], [6, 7], [4, 5]]
+
+
+def test_lead_bard_shares_the_reserved_cores(bl):
+    plan = bl.plan_placement(["Alto", "Bass", "Cello"], CORES, reserved_cores=1, lead_bard="Bass", priority="above_normal")
+    assert plan["Bass"] == plan[None] == {"cpus": [0, 1], "priority": "above_normal"}
+    # The lead bard doesn't take a turn in the round robin
+    assert plan["Alto"]["cpus"] == [2, 3] and plan["Cello"]["cpus"] == [4, 5]
+    assert plan["Cello"]["priority"] == "above_normal"
+
+
+@pytest.mark.parametrize("reserved_cores, reserved, shared", [
+    (0, [0, 1, 2, 3, 4, 5, 6, 7], [[0, 1], [2, 3], [4, 5], [6, 7]]),
+    (9, [0, 1, 2, 3, 4, 5], [[6, 7]]),  # At least one core is left to share
+    (-1, [0, 1, 2, 3, 4, 5, 6, 7], [[0, 1], [2, 3], [4, 5], [6, 7]]),
+])
+def test_reserved_cores_are_clamped(bl, reserved_cores, reserved, shared):
+    plan = bl.plan_placement(["Alto", "Bass"], CORES, reserved_cores)
+    assert plan[None]["cpus"] == reserved
+    assert [plan[bard_name]["cpus"] for bard_name in ("Alto", "Bass")] == [shared[0], shared[1 % len(shared)]]
+
+
+def test_single_core(bl):
+    plan = bl.plan_placement(["Alto", "Bass"], [[0, 1]], reserved_cores=2)
+    assert plan[None]["cpus"] == [0, 1]
+    assert plan["Alto"]["cpus"] == plan["Bass"]["cpus"] == [0, 1]
+
+
+def test_overrides(bl):
+    overrides = {
+        "Alto": {"cpus": [7], "priority": ""},  # Empty values keep the plan's
+        "Bass": {"cpus": [], "priority": "high"},
+        "Ghost": {"cpus": [1]},  # Not in this plan
+    }
+    plan = bl.plan_placement(["Alto", "Bass"], CORES, reserved_cores=2, overrides=overrides)
+    assert plan["Alto"] == {"cpus": [7], "priority": "normal"}
+    assert plan["Bass"] == {"cpus": [6, 7], "priority": "high"}
+    assert "Ghost" not in plan
+
+
+def test_a_bard_keeps_its_cores_when_others_are_added_after_it(bl):
+    before = bl.plan_placement(["Alto", "Bass"], CORES)
+    after = bl.plan_placement(["Alto", "Bass", "Cello", "Drum"], CORES)
+    assert all(after[bard_name] == before[bard_name] for bard_name in ("Alto", "Bass"))
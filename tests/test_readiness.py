@@ -0,0 +1,116 @@
+import pytest
+
+
+class FakeProcess:
+    # Stands in for a psutil.Process; cpu and reads are consumed one per sample
+    def __init__(self, pid, name, children=(), cpu=(), reads=()):
+        self.pid = pid
+        self._name = name
+        self._children = list(children)
+        self.cpu = list(cpu)
+        self.reads = list(reads)
+        self.gone = False
+
+    def name(self):
+        return self._name
+
+    def children(self, recursive=False):
+        return list(self._children)
+
+    def cpu_percent(self, interval=None):
+        if self.gone:
+            raise self.psutil.NoSuchProcess(self.pid)
+        return self.cpu.pop(0) if self.cpu else 0.0
+
+    def io_counters(self):
+        return type("io", (), {"read_bytes": self.reads.pop(0) if self.reads else 0})
+
+
+@pytest.fixture
+def table(bl):
+    psutil = pytest.importorskip("psutil")
+    FakeProcess.psutil = psutil
+    return []
+
+
+@pytest.fixture
+def probe(bl, table):
+    # A probe over the fake process table, polling on every call
+    def make(**kwargs):
+        class Probe(bl.LaunchReadinessProbe):
+            def _matching_processes(self, names):
+                return [proc for proc in list(table) if proc.name() in names]
+        phases = []
+        kwargs = dict({"poll_interval": 0, "min_game_age": 0, "on_phase": phases.append}, **kwargs)
+        return Probe(**kwargs), phases
+    return make
+
+
+def game_name(bl):
+    return bl.GAME_PROCESS_NAMES[0]
+
+
+def test_ignores_processes_that_were_already_running(bl, table, probe):
+    table.append(FakeProcess(1, bl.LAUNCHER_PROCESS_NAME))
+    table.append(FakeProcess(2, game_name(bl)))
+    ready, phases = probe()
+    assert not ready() and not ready()
+    assert ready.launcher is None and ready.game is None
+    assert phases == []
+
+
+def test_settles_after_quiet_samples(bl, table, probe):
+    ready, phases = probe(settle_samples=3)
+    game = FakeProcess(11, game_name(bl), cpu=[0, 90, 50, 5, 5, 5, 5], reads=[100, 200, 300, 400, 400, 400, 400])
+    table.append(FakeProcess(10, bl.LAUNCHER_PROCESS_NAME, children=[game]))
+    assert not ready()  # Launcher and game seen; the counters are primed
+    assert ready.launcher.pid == 10 and ready.game is game
+    assert phases == ["launcher_seen", "game_seen"]
+    # Busy while the CPU is high, and while the client is still reading from
+    # disk even with its CPU low
+    results = [ready() for i in range(6)]
+    assert results == [False, False, False, False, False, True]
+    assert phases == ["launcher_seen", "game_seen", "ready"]
+    assert ready()
+
+
+def test_a_busy_sample_starts_the_count_again(bl, table, probe):
+    ready, phases = probe(settle_samples=2)
+    game = FakeProcess(11, game_name(bl), cpu=[0, 5, 80, 5, 5])
+    table.append(FakeProcess(10, bl.LAUNCHER_PROCESS_NAME, children=[game]))
+    assert [ready() for i in range(5)] == [False, False, False, False, True]
+
+
+def test_game_that_outlived_its_launcher(bl, table, probe):
+    # The launcher has gone, so any new game client counts
+    ready, phases = probe(settle_samples=1)
+    table.append(FakeProcess(12, game_name(bl), cpu=[0, 1]))
+    assert not ready()
+    assert ready.launcher is None and ready.game.pid == 12
+    assert phases == ["game_seen"]
+    assert ready()
+
+
+def test_waits_for_the_minimum_game_age(bl, table, probe):
+    ready, phases = probe(settle_samples=1, min_game_age=60)
+    table.append(FakeProcess(12, game_name(bl)))
+    assert [ready() for i in range(5)] == [False] * 5
+    assert "ready" not in phases
+
+
+def test_a_client_that_exits_is_ready(bl, table, probe):
+    ready, phases = probe(settle_samples=5)
+    game = FakeProcess(12, game_name(bl))
+    table.append(game)
+    assert not ready()
+    game.gone = True
+    assert ready()
+    assert "ready" not in phases
+
+
+def test_polls_no_more_often_than_the_interval(bl, table, probe):
+    ready, phases = probe(poll_interval=60)
+    assert not ready()
+    table.append(FakeProcess(10, bl.LAUNCHER_PROCESS_NAME))
+    assert not ready()
+    assert ready.launcher is None
@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+
+import pytest
+
+psutil = pytest.importorskip("psutil")
+
+
+@pytest.fixture
+def registry(bl, tmp_path):
+    bl.load_psutil()
+    return bl.ProcessRegistry(snapshot_path=str(tmp_path / "clients.json"))
+
+
+def own_process():
+    # A game client stand-in that is certainly running
+    return psutil.Process(os.getpid())
+
+
+def test_snapshot_keeps_running_foreign_entries(bl, registry, tmp_path):
+    proc = own_process()
+    foreign = {str(proc.pid): {"bard": "Bass", "create_time": proc.create_time()}, "999999999": {"bard": "Gone", "create_time": 1.0}}
+    (tmp_path / "clients.json").write_text(json.dumps(foreign))
+    registry.attach("Alto", game=psutil.Process(os.getppid()))
+    saved = json.loads((tmp_path / "clients.json").read_text())
+    assert saved[str(proc.pid)]["bard"] == "Bass"
+    assert saved[str(os.getppid())]["bard"] == "Alto"
+    assert "999999999" not in saved
+    assert os.listdir(tmp_path) == ["clients.json"]
+
+
+def test_foreign_entries_are_checked_once(bl, registry, tmp_path, monkeypatch):
+    proc = own_process()
+    (tmp_path / "clients.json").write_text(json.dumps({str(proc.pid): {"bard": "Bass", "create_time": proc.create_time()}}))
+    registry.attach("Alto", game=psutil.Process(os.getppid()))
+    checked = []
+    real_process = psutil.Process
+
+    def counting_process(pid=None):
+        checked.append(pid)
+        return real_process(pid)
+    monkeypatch.setattr(psutil, "Process", counting_process)
+    # Alto's client is now another entry to check, but Bass's was checked already
+    registry.mark_stopped("Alto")
+    assert checked == [os.getppid()]
+    assert sorted(json.loads((tmp_path / "clients.json").read_text())) == sorted([str(proc.pid), str(os.getppid())])
+
+
+def test_concurrent_saves_leave_the_latest_list(bl, registry, tmp_path):
+    proc = own_process()
+    barrier = threading.Barrier(8)
+
+    def save(i):
+        barrier.wait()
+        registry.attach(f"Bard{i}", game=proc if i % 2 else psutil.Process(os.getppid()))
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.mark_stopped("Nobody")
+    saved = json.loads((tmp_path / "clients.json").read_text())
+    with registry.lock:
+        expected = {str(pid): bard_name for bard_name, record in registry.records.items() for pid in record["games"]}
+    assert {pid: entry["bard"] for pid, entry in saved.items()} == expected
+    assert os.listdir(tmp_path) == ["clients.json"]
+
+
+def test_known_launcher_is_not_looked_for_in_the_process_table(bl, registry, monkeypatch):
+    scans = []
+    real_iter = psutil.process_iter
+    monkeypatch.setattr(psutil, "process_iter", lambda *args, **kwargs: scans.append(1) or real_iter(*args, **kwargs))
+    registry.mark_launching("Alto")
+    registry.refresh()
+    registry.refresh()
+    # The first refresh scans once to adopt running bards, then the launch is
+    # still waiting for its launcher
+    assert len(scans) == 2
+    registry.attach("Alto", launcher=own_process())
+    registry.refresh()
+    registry.refresh()
+    assert len(scans) == 2
+    assert registry.state("Alto") == "launching"
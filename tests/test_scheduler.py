@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+
+class Steps:
+    # A stand-in launch_step that records when each bard was launched and can
+    # hand back a readiness callable or a value per bard
+    def __init__(self, returns=None):
+        self.returns = dict(returns or {})
+        self.launched = []
+        self.calls = threading.Condition()
+
+    def __call__(self, bard_name):
+        with self.calls:
+            self.launched.append((bard_name, time.monotonic()))
+            self.calls.notify_all()
+        return self.returns.get(bard_name)
+
+    def wait_for(self, count, timeout=5):
+        with self.calls:
+            assert self.calls.wait_for(lambda: len(self.launched) >= count, timeout)
+
+    def names(self):
+        return [bard_name for bard_name, at in self.launched]
+
+
+def run(bl, bards, steps, delay, **kwargs):
+    scheduler = bl.LaunchScheduler(bards, steps, delay, **kwargs)
+    scheduler.start()
+    return scheduler
+
+
+def drain(scheduler):
+    events = []
+    while not scheduler.events.empty():
+        events.append(scheduler.events.get())
+    return events
+
+
+def finish(scheduler, timeout=5):
+    scheduler.join(timeout)
+    assert not scheduler.is_running()
+    return drain(scheduler)
+
+
+def test_events_in_order(bl):
+    steps = Steps()
+    events = finish(run(bl, ["Alto", "Bass", "Cello"], steps, 0))
+    assert events == [
+        ("started", {"total": 3, "bards": ["Alto", "Bass", "Cello"]}),
+        ("bard", {"bard": "Alto", "index": 1}), ("progress", {"value": 1}),
+        ("bard", {"bard": "Bass", "index": 2}), ("progress", {"value": 2}),
+        ("bard", {"bard": "Cello", "index": 3}), ("progress", {"value": 3}),
+        ("finished", {"cancelled": False}),
+    ]
+    assert steps.names() == ["Alto", "Bass", "Cello"]
+
+
+def test_no_delay_after_last_bard(bl):
+    steps = Steps()
+    scheduler = run(bl, ["Alto", "Bass"], steps, 0, delays={"Bass": 60})
+    finish(scheduler)
+    assert steps.names() == ["Alto", "Bass"]
+
+
+def test_waits_the_delay_between_bards(bl):
+    steps = Steps()
+    finish(run(bl, ["Alto", "Bass"], steps, 0.3))
+    (_, first), (_, second) = steps.launched
+    assert second - first >= 0.3
+
+
+def test_pause_and_resume_mid_delay(bl):
+    steps = Steps()
+    scheduler = run(bl, ["Alto", "Bass"], steps, 0.3)
+    steps.wait_for(1)
+    scheduler.pause()
+    assert scheduler.is_paused()
+    time.sleep(0.5)
+    assert steps.names() == ["Alto"]
+    scheduler.resume()
+    events = finish(scheduler)
+    assert steps.names() == ["Alto", "Bass"]
+    # Time spent paused doesn't count towards the delay
+    (_, first), (_, second) = steps.launched
+    assert second - first >= 0.7
+    kinds = [kind for kind, data in events]
+    assert kinds.index("paused") < kinds.index("resumed") < [i for i, (kind, data) in enumerate(events) if kind == "bard"][1]
+
+
+def test_skip_wait(bl):
+    steps = Steps()
+    scheduler = run(bl, ["Alto", "Bass"], steps, 60)
+    steps.wait_for(1)
+    scheduler.skip()
+    events = finish(scheduler)
+    assert steps.names() == ["Alto", "Bass"]
+    assert events[-1] == ("finished", {"cancelled": False})
+
+
+def test_cancel_during_delay(bl):
+    steps = Steps()
+    finished = []
+    scheduler = run(bl, ["Alto", "Bass", "Cello"], steps, 60, on_finished=finished.append)
+    steps.wait_for(1)
+    scheduler.cancel()
+    events = finish(scheduler)
+    assert steps.names() == ["Alto"]
+    assert finished == [True]
+    assert [data["bard"] for kind, data in events if kind == "bard"] == ["Alto"]
+    assert events[-1] == ("finished", {"cancelled": True})
+
+
+def test_cancel_while_paused(bl):
+    steps = Steps()
+    scheduler = run(bl, ["Alto", "Bass"], steps, 60)
+    steps.wait_for(1)
+    scheduler.pause()
+    scheduler.cancel()
+    assert finish(scheduler)[-1] == ("finished", {"cancelled": True})
+    assert steps.names() == ["Alto"]
+
+
+@pytest.mark.parametrize("ready", [lambda: True, False])
+def test_ready_ends_the_delay_early(bl, ready):
+    # A readiness callable ends the delay once it returns True; False means
+    # nothing was launched, so there is nothing to wait for
+    steps = Steps({"Alto": ready})
+    events = finish(run(bl, ["Alto", "Bass"], steps, 60))
+    assert steps.names() == ["Alto", "Bass"]
+    moved_on = [data for kind, data in events if kind == "status" and data["message"].startswith("Moved on from Alto")]
+    assert len(moved_on) == (0 if ready is False else 1)
+
+
+def test_failed_step_is_reported_and_the_run_goes_on(bl):
+    def step(bard_name):
+        if bard_name == "Alto":
+            raise OSError("no such file")
+
+    scheduler = bl.LaunchScheduler(["Alto", "Bass"], step, 0)
+    scheduler.start()
+    events = finish(scheduler)
+    assert [data["value"] for kind, data in events if kind == "progress"] == [1, 2]
+    assert [data["level"] for kind, data in events if kind == "status"] == ["ERROR"]
+
+
+def test_prepare_decides_the_bards(bl):
+    steps = Steps()
+    events = finish(run(bl, ["Alto", "Bass", "Cello"], steps, 0, prepare=lambda bards: [bard_name for bard_name in bards if bard_name != "Bass"]))
+    assert steps.names() == ["Alto", "Cello"]
+    assert events[0] == ("started", {"total": 2, "bards": ["Alto", "Cello"]})
@@ -0,0 +1,90 @@
+import json
+import os
+import time
+
+import pytest
+
+
+def test_migrate_version_1(bl):
+    old = {"delay": 15, "bard_checkbuttons": {"Alto": True}}
+    data = bl.migrate_settings(old)
+    assert data == {"delay": 15, "bard_checkbuttons": {"Alto": True}, "profiles": {}, "active_profile": "", "version": bl.SETTINGS_VERSION}
+    assert "version" not in old
+
+
+def test_migrate_keeps_existing_profiles(bl):
+    data = bl.migrate_settings({"version": 1, "profiles": {"Quartet": {"bards": ["Alto"]}}, "active_profile": "Quartet"})
+    assert data["profiles"] == {"Quartet": {"bards": ["Alto"]}} and data["active_profile"] == "Quartet"
+
+
+def test_migrate_leaves_current_and_newer_files_alone(bl):
+    current = {"version": bl.SETTINGS_VERSION, "delay": 12}
+    assert bl.migrate_settings(current) == current
+    # A file from a newer version keeps its version number
+    assert bl.migrate_settings({"version": bl.SETTINGS_VERSION + 1})["version"] == bl.SETTINGS_VERSION + 1
+
+
+@pytest.mark.parametrize("text, expected", [("not json", {}), ("[1, 2]", {}), ('{"delay": 15}', {"delay": 15, "profiles": {}, "active_profile": ""})])
+def test_read_config_file(bl, tmp_path, text, expected):
+    (tmp_path / "config.json").write_text(text)
+    assert bl.read_config_file(str(tmp_path / "config.json")) == (dict(expected, version=bl.SETTINGS_VERSION) if expected else {})
+    assert bl.read_config_file(str(tmp_path / "missing.json")) == {}
+
+
+@pytest.fixture
+def store(bl, tmp_path):
+    store = bl.SettingsStore(str(tmp_path / "config.json"), delay=0.2)
+    yield store
+    store.flush()
+
+
+def test_a_burst_of_saves_is_written_once(bl, store, tmp_path, monkeypatch):
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(bl.os, "replace", lambda src, dst: writes.append(dst) or real_replace(src, dst))
+    for delay in (10, 11, 12):
+        store.save({"delay": delay})
+    assert not (tmp_path / "config.json").exists()
+    deadline = time.monotonic() + 5
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.3)
+    assert writes == [str(tmp_path / "config.json")]
+    assert json.loads((tmp_path / "config.json").read_text()) == {"delay": 12, "version": bl.SETTINGS_VERSION}
+    assert store.load()["delay"] == 12
+    assert os.listdir(tmp_path) == ["config.json"]
+
+
+def test_flush_writes_at_once_and_cancels_the_timer(bl, store, tmp_path):
+    store.save({"delay": 10})
+    timer = store.timer
+    store.flush()
+    assert json.loads((tmp_path / "config.json").read_text())["delay"] == 10
+    assert store.timer is None and store.pending is None
+    assert not timer.is_alive() or timer.finished.is_set()
+    # Nothing pending: flush does nothing
+    (tmp_path / "config.json").unlink()
+    store.flush()
+    assert not (tmp_path / "config.json").exists()
+
+
+def test_a_save_after_a_flush_schedules_a_new_write(bl, store, tmp_path):
+    store.save({"delay": 10})
+    store.flush()
+    store.save({"delay": 20})
+    assert store.timer is not None
+    store.flush()
+    assert json.loads((tmp_path / "config.json").read_text())["delay"] == 20
+
+
+def test_write_errors(bl, tmp_path):
+    errors = []
+    store = bl.SettingsStore(str(tmp_path / "missing" / "config.json"), delay=60, on_error=errors.append)
+    store.save({"delay": 10})
+    store.flush()
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+    # Without on_error the error goes to the caller
+    store = bl.SettingsStore(str(tmp_path / "missing" / "config.json"), delay=60)
+    store.save({"delay": 10})
+    with pytest.raises(OSError):
+        store.flush()
@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+LAUNCHER = r"C:\Users\Bard\AppData\Local\XIVLauncher\XIVLauncher.exe"
+
+
+@pytest.mark.parametrize("fields", [
+    {"target": LAUNCHER, "arguments": "--account=Bard1-False-False", "working_dir": r"C:\Users\Bard\AppData\Local\XIVLauncher", "icon_location": r"C:\Icons\bard.ico,0"},
+    {"target": LAUNCHER, "arguments": "", "working_dir": "", "icon_location": ",0"},
+    {"target": r"C:\Spiele\Bärde\XIVLauncher.exe", "arguments": "--roamingPath=\"C:\\Roaming\\Élise\"", "working_dir": r"C:\Spiele\Bärde", "icon_location": r"C:\Icons\Élise.png,0"},
+    {"target": r"D:\ゲーム\XIVLauncher.exe", "arguments": "--account=吟遊詩人-True-False", "working_dir": r"D:\ゲーム", "icon_location": r"D:\アイコン\詩人.ico,0"},
+])
+def test_build_parse_round_trip(bl, fields):
+    assert bl.parse_lnk(bl.build_lnk(**fields)) == fields
+
+
+@pytest.mark.parametrize("icon_location, expected", [
+    (r"C:\Icons\bard.ico,3", r"C:\Icons\bard.ico,3"),
+    (r"C:\Icons\bard.ico,-2", r"C:\Icons\bard.ico,-2"),
+    (r"C:\Icons\bard.ico", r"C:\Icons\bard.ico,0"),
+    (r"C:\Icons\a,b.ico", r"C:\Icons\a,b.ico,0"),
+    ("", ",0"),
+])
+def test_icon_index_suffix(bl, icon_location, expected):
+    assert bl.parse_lnk(bl.build_lnk(LAUNCHER, icon_location=icon_location))["icon_location"] == expected
+
+
+def test_write_read_round_trip(bl, tmp_path):
+    path = str(tmp_path / "Bärd.lnk")
+    bl.write_lnk(path, LAUNCHER, "--account=Bärd-False-False", os.path.dirname(LAUNCHER), r"C:\Icons\bärd.ico,1")
+    assert bl.read_lnk(path) == {"target": LAUNCHER, "arguments": "--account=Bärd-False-False", "working_dir": os.path.dirname(LAUNCHER), "icon_location": r"C:\Icons\bärd.ico,1"}
+    assert not os.path.exists(f"{path}.tmp")
+
+
+@pytest.mark.parametrize("data", [b"", b"not a shortcut at all", b"L\0\0\0" + b"\0" * 72])
+def test_parse_rejects_garbage(bl, data):
+    with pytest.raises(bl.LnkError):
+        bl.parse_lnk(data)
+
+
+def test_parse_rejects_truncated(bl):
+    data = bl.build_lnk(LAUNCHER, "--account=Bard1-False-False")
+    with pytest.raises(bl.LnkError):
+        bl.parse_lnk(data[:100])
+
+
+def test_write_shortcuts_skips_unchanged_and_updates_changed(bl, tmp_path):
+    def item(name, **fields):
+        return dict({"path": str(tmp_path / f"{name}.lnk"), "target": LAUNCHER, "arguments": f"--account={name}-False-False", "working_dir": os.path.dirname(LAUNCHER), "icon_location": ""}, **fields)
+
+    shortcuts = [item("Bard1"), item("Bard2"), item("Bard3")]
+    assert [result for path, result in bl.write_shortcuts(shortcuts)] == ["created"] * 3
+
+    for entry in shortcuts:
+        os.utime(entry["path"], ns=(1, 1))
+    shortcuts[1] = item("Bard2", arguments="--account=Bard2-True-False")
+    results = bl.write_shortcuts(shortcuts)
+    assert results == [(shortcuts[0]["path"], "unchanged"), (shortcuts[1]["path"], "updated"), (shortcuts[2]["path"], "unchanged")]
+    assert os.stat(shortcuts[0]["path"]).st_mtime_ns == 1
+    assert os.stat(shortcuts[2]["path"]).st_mtime_ns == 1
+    assert os.stat(shortcuts[1]["path"]).st_mtime_ns != 1
+    assert bl.read_lnk(shortcuts[1]["path"])["arguments"] == "--account=Bard2-True-False"
+
+
+def test_write_shortcuts_rewrites_unreadable(bl, tmp_path):
+    path = tmp_path / "Broken.lnk"
+    path.write_bytes(b"garbage")
+    results = bl.write_shortcuts([{"path": str(path), "target": LAUNCHER}])
+    assert results == [(str(path), "updated")]
+    assert bl.read_lnk(str(path))["target"] == LAUNCHER
+
+
+@pytest.fixture
+def com(bl, monkeypatch):
+    # Records what goes through the COM fallback instead of needing Windows
+    calls = []
+    monkeypatch.setattr(bl, "load_com_dispatch", lambda: object)
+    monkeypatch.setattr(bl, "read_shortcut_com", lambda path: calls.append(("read", path)) or {"target": "from com", "arguments": "", "working_dir": "", "icon_location": ",0"})
+    monkeypatch.setattr(bl, "write_shortcut_com", lambda path, **fields: calls.append(("write", path, fields)))
+    return calls
+
+
+def test_com_fallback_not_used_for_parsable_shortcut(bl, tmp_path, com):
+    path = str(tmp_path / "Bard1.lnk")
+    bl.write_lnk(path, LAUNCHER, "--account=Bard1-False-False")
+    assert bl.read_shortcut(path)["target"] == LAUNCHER
+    bl.update_shortcut(path, arguments="--account=Bard1-True-False")
+    assert bl.read_lnk(path)["arguments"] == "--account=Bard1-True-False"
+    assert com == []
+
+
+def test_com_fallback_used_when_parsing_fails(bl, tmp_path, com):
+    path = tmp_path / "Odd.lnk"
+    path.write_bytes(b"not a shortcut the native reader understands")
+    assert bl.read_shortcut(str(path))["target"] == "from com"
+    bl.update_shortcut(str(path), arguments="--account=Odd-False-False")
+    assert com == [("read", str(path)), ("read", str(path)), ("write", str(path), {"target": "from com", "arguments": "--account=Odd-False-False", "working_dir": "", "icon_location": ",0"})]
+    assert path.read_bytes() == b"not a shortcut the native reader understands"
+
+
+def test_parse_error_without_com(bl, tmp_path, monkeypatch):
+    monkeypatch.setattr(bl, "load_com_dispatch", lambda: None)
+    path = tmp_path / "Odd.lnk"
+    path.write_bytes(b"garbage")
+    with pytest.raises(bl.LnkError):
+        bl.read_shortcut(str(path))
+
+
+def test_shortcut_index_save_failure(bl, tmp_path, monkeypatch):
+    index = bl.ShortcutIndex(str(tmp_path / "index.json"), read_shortcut=lambda path: {"target": LAUNCHER})
+    (tmp_path / "Bard1.lnk").write_bytes(b"")
+    index.get(str(tmp_path / "Bard1.lnk"))
+
+    def failing_replace(src, dst):
+        raise PermissionError("in use")
+    monkeypatch.setattr(bl.os, "replace", failing_replace)
+    index.save()
+    # The temp file is gone and the entries are still to be saved
+    assert sorted(os.listdir(tmp_path)) == ["Bard1.lnk"]
+    assert index.dirty
+    monkeypatch.undo()
+    index.save()
+    assert not index.dirty
+    assert list(bl.ShortcutIndex(str(tmp_path / "index.json")).entries) == list(index.entries)
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def swapper(bl, tmp_path):
+    return bl.ConfigSwapper(str(tmp_path / "FFXIV.cfg"))
+
+
+def write(path, data, mtime_ns=None):
+    path.write_bytes(data)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_swap_then_unchanged(bl, swapper, tmp_path):
+    source = write(tmp_path / "Alto.cfg", b"<Alto>\r\n")
+    assert swapper.swap(source) == "swapped"
+    assert (tmp_path / "FFXIV.cfg").read_bytes() == b"<Alto>\r\n"
+    assert swapper.swap(source) == "unchanged"
+    # The temp file was replaced into place, not left behind
+    assert sorted(os.listdir(tmp_path)) == ["Alto.cfg", "FFXIV.cfg"]
+
+
+def test_cached_digest_skips_reading(bl, swapper, tmp_path, monkeypatch):
+    source = write(tmp_path / "Alto.cfg", b"<Alto>\r\n")
+    swapper.swap(source)
+    real_open = open
+    opened = []
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+    monkeypatch.setattr("builtins.open", counting_open)
+    assert swapper.swap(source, b"<Alto>\r\n") == "unchanged"
+    assert opened == []
+
+
+def test_changed_size_or_mtime_invalidates_the_digest(bl, swapper, tmp_path):
+    target = tmp_path / "FFXIV.cfg"
+    source = write(tmp_path / "Alto.cfg", b"<Alto>\r\n")
+    swapper.swap(source)
+    stat_result = os.stat(target)
+    # Same size, other bytes and another mtime: the game rewrote the file
+    write(target, b"<Bass>\r\n", stat_result.st_mtime_ns + 1000000000)
+    assert swapper.digest(str(target)) != swapper.digest(source)
+    assert swapper.swap(source) == "swapped"
+    assert target.read_bytes() == b"<Alto>\r\n"
+    # Same mtime, another size
+    stat_result = os.stat(target)
+    write(target, b"<Alto>\r\nExtra\t1\r\n", stat_result.st_mtime_ns)
+    assert swapper.swap(source) == "swapped"
+    assert target.read_bytes() == b"<Alto>\r\n"
+
+
+def test_data_without_a_source_file(bl, swapper, tmp_path):
+    assert swapper.swap(None, b"<Merged>\r\n") == "swapped"
+    assert swapper.swap(None, b"<Merged>\r\n") == "unchanged"
+    assert (tmp_path / "FFXIV.cfg").read_bytes() == b"<Merged>\r\n"
+
+
+def test_read_back_mismatch_raises(bl, swapper, tmp_path, monkeypatch):
+    source = write(tmp_path / "Alto.cfg", b"<Alto>\r\n")
+    real_replace = os.replace
+
+    def corrupting_replace(src, dst):
+        real_replace(src, dst)
+        with open(dst, 'wb') as f:
+            f.write(b"<Torn")
+    monkeypatch.setattr(bl.os, "replace", corrupting_replace)
+    with pytest.raises(OSError, match="doesn't match"):
+        swapper.swap(source)
+    monkeypatch.undo()
+    # Nothing was remembered for the bad copy, so the next swap writes again
+    assert swapper.swap(source) == "swapped"
+
+
+def test_failed_replace_removes_the_temp_file(bl, swapper, tmp_path, monkeypatch):
+    source = write(tmp_path / "Alto.cfg", b"<Alto>\r\n")
+
+    def failing_replace(src, dst):
+        raise PermissionError("in use")
+    monkeypatch.setattr(bl.os, "replace", failing_replace)
+    with pytest.raises(PermissionError):
+        swapper.swap(source)
+    assert sorted(os.listdir(tmp_path)) == ["Alto.cfg"]
+
+
+def test_a_bard_whose_swap_fails_is_skipped(bl, tmp_path, monkeypatch):
+    pytest.importorskip("psutil")
+    monkeypatch.chdir(tmp_path)
+    launcher_path = tmp_path / "XIVLauncher.exe"
+    launcher_path.write_bytes(b"")
+    monkeypatch.setattr(bl, "XIVLAUNCHER_PATH", str(launcher_path))
+    shortcut_dir, config_dir = tmp_path / "shortcuts", tmp_path / "configs"
+    shortcut_dir.mkdir()
+    config_dir.mkdir()
+    for bard_name in ("Alto", "Bass"):
+        bl.write_lnk(str(shortcut_dir / f"{bard_name}.lnk"), str(launcher_path))
+        (config_dir / f"{bard_name}.cfg").write_bytes(f"<{bard_name}>\r\n".encode())
+    launched = []
+    engine = bl.LaunchEngine({"shortcut_dir": str(shortcut_dir), "config_dir": str(config_dir), "delay": 0}, launcher=lambda path: launched.append(os.path.basename(path)), shortcut_index=bl.ShortcutIndex(str(tmp_path / "index.json")), process_registry=bl.ProcessRegistry(snapshot_path=None))
+    engine.min_delay = 0
+    engine.journal = bl.LaunchJournal(str(tmp_path / "journal.jsonl"))
+    engine.config_swapper.target = str(tmp_path / "FFXIV.cfg")
+    real_swap = engine.config_swapper.swap
+
+    def swap(source, data=None, target=None):
+        if data == b"<Alto>\r\n":
+            raise PermissionError("FFXIV.cfg is locked")
+        return real_swap(source, data, target)
+    monkeypatch.setattr(engine.config_swapper, "swap", swap)
+
+    scheduler = engine.start_run(["Alto", "Bass"])
+    scheduler.join(10)
+    assert not scheduler.is_running()
+    assert launched == ["Bass.lnk"]
+    assert (tmp_path / "FFXIV.cfg").read_bytes() == b"<Bass>\r\n"
+    assert any("Failed to copy the config for Alto" in record.message for record in engine.status_log.drain())
+    run = engine.journal.last_run()
+    assert run["phases"]["Alto"][-1] == "failed"
+    assert run["remaining"] == ["Alto"]
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def cache(bl, tmp_path, monkeypatch):
+    monkeypatch.setattr(bl, "Image", Image)
+    return bl.ThumbnailCache(str(tmp_path / "thumbnails"), max_bytes=1)
+
+
+def test_creating_the_cache_touches_nothing(bl, cache, tmp_path):
+    assert not (tmp_path / "thumbnails").exists()
+
+
+def test_first_write_creates_and_trims_the_directory(bl, cache, tmp_path):
+    cache_dir = tmp_path / "thumbnails"
+    cache_dir.mkdir()
+    stale = cache_dir / "stale.png"
+    stale.write_bytes(b"x" * 100)
+    os.utime(stale, (1, 1))
+    icon = tmp_path / "icon.png"
+    Image.new("RGBA", (128, 128), (200, 0, 0, 255)).save(icon)
+
+    thumbnail = cache._load_thumbnail(str(icon), os.stat(icon), (64, 64))
+    assert thumbnail.size == (64, 64)
+    assert not stale.exists()
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".png")] == [os.path.basename(cache._disk_path(str(icon), os.stat(icon), (64, 64)))]
+    assert cache.trimmed
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+
+def record(bl, file_name, icon="icon.png"):
+    return bl.BardRecord(file_name.split(".")[0], os.path.join("shortcuts", file_name), icon)
+
+
+@pytest.fixture
+def roster(bl):
+    return [record(bl, "Alto.lnk"), record(bl, "Bass.lnk"), record(bl, "Cello.lnk")]
+
+
+def changes(added=(), removed=(), modified=(), renamed=()):
+    return {"added": list(added), "removed": list(removed), "modified": list(modified), "renamed": list(renamed)}
+
+
+def update(bl, roster, change, loaded=None, **kwargs):
+    loaded = [] if loaded is None else loaded
+
+    def load_record(file_name):
+        loaded.append(file_name)
+        return record(bl, file_name, "new.png")
+    return bl.update_bard_records(roster, change, load_record, **kwargs)
+
+
+def test_only_changed_files_are_read(bl, roster):
+    loaded = []
+    records = update(bl, roster, changes(added=["Drum.lnk"], removed=["Bass.lnk"], modified=["Alto.lnk"], renamed=[("Cello.lnk", "Viola.lnk")]), loaded)
+    assert [(r.name, r.icon_path) for r in records] == [("Alto", "new.png"), ("Viola", "new.png"), ("Drum", "new.png")]
+    assert sorted(loaded) == ["Alto.lnk", "Drum.lnk", "Viola.lnk"]
+    assert [r.name for r in roster] == ["Alto", "Bass", "Cello"]
+
+
+def test_a_file_that_is_gone_again_is_dropped(bl, roster):
+    records = bl.update_bard_records(roster, changes(modified=["Bass.lnk"]), lambda file_name: None)
+    assert [r.name for r in records] == ["Alto", "Cello"]
+
+
+@pytest.mark.parametrize("change", [
+    changes(added=["Alto.url"]),  # Another file with a bard's name
+    changes(added=["Drum.lnk", "Drum.url"]),
+    changes(renamed=[("Alto.lnk", "Bass.url")]),
+    changes(modified=["Alto.url"]),
+    dict(changes(), overflow=True),  # A kind of change it doesn't know
+])
+def test_falls_back_to_a_full_scan(bl, roster, change):
+    assert update(bl, roster, change) is None
+
+
+def test_falls_back_to_a_full_scan_for_many_changes(bl, roster):
+    many = changes(added=[f"Bard{i}.lnk" for i in range(6)])
+    assert update(bl, roster, many, limit=5) is None
+    assert len(update(bl, roster, many, limit=6)) == 9
+
+
+def test_matches_a_full_scan(bl, tmp_path):
+    # Applying the watcher's diff gives the same bards as scanning again
+    for name in ("Alto", "Bass", "Cello"):
+        (tmp_path / f"{name}.lnk").write_bytes(name.encode())
+    before = bl.snapshot_directory(str(tmp_path))
+    roster = [bl.BardRecord(name[:-4], str(tmp_path / name), "") for name in sorted(before)]
+    (tmp_path / "Bass.lnk").rename(tmp_path / "Banjo.lnk")
+    (tmp_path / "Drum.lnk").write_bytes(b"Drum")
+    (tmp_path / "Cello.lnk").unlink()
+    change = bl.diff_snapshots(before, bl.snapshot_directory(str(tmp_path)))
+    assert change["renamed"] == [("Bass.lnk", "Banjo.lnk")]
+    records = bl.update_bard_records(roster, change, lambda file_name: bl.BardRecord(file_name[:-4], str(tmp_path / file_name), ""))
+    assert sorted(r.name for r in records) == sorted(name[:-4] for name in os.listdir(tmp_path))
+
+
+def test_shortcut_index_forget(bl, tmp_path):
+    index = bl.ShortcutIndex(str(tmp_path / "index.json"), read_shortcut=lambda path: {"target": "x"})
+    path = tmp_path / "Alto.lnk"
+    path.write_bytes(b"")
+    index.get(str(path))
+    index.forget([str(path), str(tmp_path / "Unknown.lnk")])
+    assert index.entries == {}
+    assert bl.ShortcutIndex(str(tmp_path / "index.json")).entries == {}